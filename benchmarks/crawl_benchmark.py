@@ -0,0 +1,142 @@
+# benchmarks/crawl_benchmark.py
+"""
+离线端到端基准测试：用本地替身站点（benchmarks.stand_ins）驱动 PaperCrawler.download_many，
+不访问任何真实网站。对每个批次大小报告吞吐量（篇/秒）、单篇论文耗时的 p50/p99、峰值内存和 CPU 占用，
+用于发现性能回退。在仓库根目录运行：
+
+    python -m benchmarks.crawl_benchmark [--sizes 10 100 1000] [--latency 0.02] [--error-rate 0.0]
+                                         [--bandwidth 0] [--concurrency 32] [--output results.json]
+
+替身站点不限速：基准测试关注爬虫自身的开销，而不是各来源的请求配额。
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import httpx
+
+from benchmarks.stand_ins import STAND_IN_HOSTS, StandInSites, SyntheticCorpus
+from paper_crawler import PaperCrawler
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """最近秩法计算分位数。"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+def _max_rss_mb() -> float | None:
+    """
+    进程启动以来的峰值常驻内存（MB），多个批次依次运行时反映的是到目前为止最大的一次。
+    Linux 上 ru_maxrss 单位为 KB，macOS 上为字节。
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if os.uname().sysname == 'Darwin' else max_rss / 1024
+
+
+def run_batch(size: int, args) -> dict:
+    """用一个全新的爬虫和临时保存目录下载 size 篇合成论文，返回测量结果。"""
+    corpus = SyntheticCorpus(size, seed=args.seed)
+    sites = StandInSites(
+        corpus, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        bandwidth=args.bandwidth, pdf_size=args.pdf_size, seed=args.seed,
+    )
+    save_dir = tempfile.mkdtemp(prefix="crawl-benchmark-")
+    crawler = PaperCrawler(
+        save_dir,
+        core_api_key="benchmark",
+        request_delay=0,
+        rate_limits={host: (1e6, 1_000_000) for host in STAND_IN_HOSTS},
+        parse_workers=args.parse_workers,
+        transport=httpx.MockTransport(sites.handle),
+    )
+    papers = corpus.requests()
+    devnull = open(os.devnull, 'w')
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull)
+    try:
+        gc.collect()
+        if args.tracemalloc:
+            tracemalloc.start()
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        with output:
+            results = crawler.download_many(papers, max_concurrency=args.concurrency)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        traced_peak = None
+        if args.tracemalloc:
+            traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+    finally:
+        with contextlib.redirect_stdout(devnull):
+            crawler.close()
+        devnull.close()
+        shutil.rmtree(save_dir, ignore_errors=True)
+
+    latencies = [record['elapsed'] for record in results]
+    downloaded = sum(1 for record in results if record['filepath'])
+    return {
+        'papers': size,
+        'downloaded': downloaded,
+        'failed': size - downloaded,
+        'seconds': wall,
+        'papers_per_second': size / wall if wall > 0 else 0.0,
+        'p50_seconds': _percentile(latencies, 0.50),
+        'p99_seconds': _percentile(latencies, 0.99),
+        'cpu_seconds': cpu,
+        'cpu_percent': 100 * cpu / wall if wall > 0 else 0.0,
+        'traced_peak_mb': traced_peak,
+        'max_rss_mb': _max_rss_mb(),
+        'requests': sum(sites.requests.values()),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="批次大小（篇），可为 10–10000")
+    arg_parser.add_argument("--latency", type=float, default=0.02, help="替身站点的平均响应延迟（秒）")
+    arg_parser.add_argument("--jitter", type=float, default=0.5, help="延迟的随机浮动比例")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="请求返回 503 的概率")
+    arg_parser.add_argument("--bandwidth", type=float, default=0.0, help="PDF 单连接带宽（字节/秒），0 表示不限速")
+    arg_parser.add_argument("--pdf-size", type=int, default=32 * 1024, help="合成 PDF 的大小（字节）")
+    arg_parser.add_argument("--concurrency", type=int, default=32, help="download_many 的 max_concurrency")
+    arg_parser.add_argument("--parse-workers", type=int, default=0, help="爬虫的解析进程数")
+    arg_parser.add_argument("--seed", type=int, default=0, help="合成数据和延迟的随机种子")
+    arg_parser.add_argument("--tracemalloc", action="store_true", help="用 tracemalloc 统计 Python 对象的峰值内存（明显变慢）")
+    arg_parser.add_argument("--output", help="把结果写入 JSON 文件，便于与之前的结果比较")
+    arg_parser.add_argument("--verbose", action="store_true", help="保留爬虫的输出")
+    args = arg_parser.parse_args()
+
+    print(f"{'papers':>8}{'ok':>8}{'seconds':>10}{'papers/s':>10}{'p50':>9}{'p99':>9}"
+          f"{'cpu%':>7}{'traced':>10}{'max rss':>10}{'requests':>10}")
+    rows = []
+    for size in args.sizes:
+        row = run_batch(size, args)
+        rows.append(row)
+        traced = f"{row['traced_peak_mb']:.1f}MB" if row['traced_peak_mb'] is not None else "-"
+        max_rss = f"{row['max_rss_mb']:.0f}MB" if row['max_rss_mb'] is not None else "-"
+        print(f"{row['papers']:>8}{row['downloaded']:>8}{row['seconds']:>10.2f}{row['papers_per_second']:>10.1f}"
+              f"{row['p50_seconds']:>8.2f}s{row['p99_seconds']:>8.2f}s{row['cpu_percent']:>6.0f}%"
+              f"{traced:>10}{max_rss:>10}{row['requests']:>10}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': rows}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/parse_benchmark.py
+"""
+比较各 HTML 解析后端以及 arXiv Atom 解析方式的单页耗时。
+
+页面为合成数据，结构与各站点的搜索/摘要页一致，并带有与真实页面相近的导航、脚本等无关内容。
+在仓库根目录运行：
+
+    python -m benchmarks.parse_benchmark [--iterations 200] [--results 50]
+"""
+import argparse
+import time
+import xml.etree.ElementTree as ET
+
+from strategies.html_parsing import PARSER_BACKENDS, get_parser
+from strategies.implementations import ARXIV_NAMESPACES, ArxivFeedParser
+
+
+def _page_chrome(body: str) -> str:
+    """给页面主体加上导航栏、脚本和页脚等与提取无关的内容。"""
+    navigation = "".join(f'<li class="nav-item"><a href="/section/{i}">Section {i}</a></li>' for i in range(60))
+    scripts = "".join(f"<script>var config{i} = {{'key': 'value{i}', 'list': [1, 2, 3]}};</script>" for i in range(20))
+    footer = "".join(f"<p class='footer'>Footer paragraph {i} with some <b>bold</b> text.</p>" for i in range(40))
+    return (f"<html><head><title>Search</title>{scripts}</head><body>"
+            f"<nav><ul class='nav'>{navigation}</ul></nav>{body}<footer>{footer}</footer></body></html>")
+
+
+def cvf_search_page(results: int) -> str:
+    entries = "".join(
+        f'<dt class="ptitle"><br><a href="/content/CVPR2023/html/Paper_{i}_CVPR_2023_paper.html">'
+        f'A Study of Visual Representation Number {i}</a></dt><dd>Author {i}, Author {i + 1}</dd>'
+        for i in range(results)
+    )
+    return _page_chrome(f'<div class="content"><div><dl>{entries}</dl></div></div>')
+
+
+def neurips_search_page(results: int) -> str:
+    entries = "".join(
+        f'<li><a href="/paper_files/paper/2023/hash/{i:032x}-Abstract-Conference.html">'
+        f'Learning Neural Thing Number {i}</a> <i>Author {i}</i></li>'
+        for i in range(results)
+    )
+    return _page_chrome(f'<div class="container-fluid"><ul class="paper-list">{entries}</ul></div>')
+
+
+def aaai_search_page(results: int) -> str:
+    entries = "".join(
+        f'<div class="obj_article_summary"><h3 class="title"><a href="https://ojs.aaai.org/index.php/AAAI/article/view/{i}">'
+        f'Reasoning About Problem Number {i}</a></h3><div class="authors">Author {i}</div></div>'
+        for i in range(results)
+    )
+    return _page_chrome(f'<div class="search_results">{entries}</div>')
+
+
+def arxiv_feed(results: int) -> bytes:
+    entries = "".join(
+        f"<entry><id>http://arxiv.org/abs/2301.{i:05d}v1</id><title>An Arxiv Paper Number {i}</title>"
+        f"<summary>{'Abstract text. ' * 80}</summary>"
+        f"<author><name>Author {i}</name></author>"
+        f'<link href="http://arxiv.org/abs/2301.{i:05d}v1" rel="alternate" type="text/html"/>'
+        f'<link title="pdf" href="http://arxiv.org/pdf/2301.{i:05d}v1" rel="related" type="application/pdf"/>'
+        f"</entry>"
+        for i in range(results)
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="{ARXIV_NAMESPACES["atom"]}" '
+            f'xmlns:opensearch="{ARXIV_NAMESPACES["opensearch"]}">'
+            f"<opensearch:totalResults>{results}</opensearch:totalResults>{entries}</feed>").encode()
+
+
+# 与各策略中相同的 (选择器, parse_only) 组合
+HTML_CASES = {
+    "CVF search": (cvf_search_page, 'dl dt a', 'dl'),
+    "NeurIPS search": (neurips_search_page, 'ul li a', 'ul'),
+    "AAAI search": (aaai_search_page, 'h3.title a, h4.title a', ['h3', 'h4']),
+}
+
+
+def _time_per_call(func, iterations: int) -> float:
+    func()  # 预热
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def _arxiv_full_tree(feed: bytes) -> list[tuple[str, str]]:
+    """旧的解析方式：构建整棵树后再查找。"""
+    root = ET.fromstring(feed)
+    candidates = []
+    for entry in root.findall('atom:entry', ARXIV_NAMESPACES):
+        link = entry.find("atom:link[@title='pdf']", ARXIV_NAMESPACES)
+        if link is not None:
+            candidates.append((entry.findtext('atom:title', '', ARXIV_NAMESPACES), link.get('href')))
+    return candidates
+
+
+def _arxiv_incremental(feed: bytes, chunk_size: int = 16 * 1024) -> list[tuple[str, str]]:
+    parser = ArxivFeedParser()
+    for offset in range(0, len(feed), chunk_size):
+        parser.feed(feed[offset:offset + chunk_size])
+    return parser.close().candidates
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=200, help="每个组合的重复次数")
+    arg_parser.add_argument("--results", type=int, default=50, help="每个页面中的搜索结果数")
+    args = arg_parser.parse_args()
+
+    backends = [name for name, backend in PARSER_BACKENDS.items() if backend.is_available()]
+    print(f"Available backends: {', '.join(backends)}")
+    print(f"{'page':<16}{'size':>10}" + "".join(f"{name:>14}" for name in backends))
+    for case, (build_page, selector, parse_only) in HTML_CASES.items():
+        page = build_page(args.results).encode()
+        expected = len(get_parser("bs4").select_links(page, selector))
+        timings = []
+        for name in backends:
+            parser = get_parser(name)
+            found = len(parser.select_links(page, selector, parse_only=parse_only))
+            if found != expected:
+                print(f"   [Warning] Backend '{name}' found {found} links on {case}, expected {expected}.")
+            timings.append(_time_per_call(lambda: parser.select_links(page, selector, parse_only=parse_only),
+                                          args.iterations))
+        print(f"{case:<16}{len(page) // 1024:>8}KB" + "".join(f"{ms:>12.3f}ms" for ms in timings))
+
+    feed = arxiv_feed(args.results)
+    assert _arxiv_full_tree(feed) == _arxiv_incremental(feed)
+    print(f"\narXiv Atom feed ({len(feed) // 1024}KB, {args.results} entries)")
+    print(f"   ET.fromstring + findall : {_time_per_call(lambda: _arxiv_full_tree(feed), args.iterations):.3f}ms")
+    print(f"   XMLPullParser (chunked) : {_time_per_call(lambda: _arxiv_incremental(feed), args.iterations):.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
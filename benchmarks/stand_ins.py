@@ -0,0 +1,420 @@
+# benchmarks/stand_ins.py
+"""
+离线基准测试使用的本地替身站点。
+
+SyntheticCorpus 生成一批合成论文并分配到各个来源，StandInSites 以 httpx.MockTransport 处理函数的形式
+模拟 arXiv API、CORE API、CVF、NeurIPS 和 AAAI 的搜索页/摘要页以及 PDF 文件，
+响应结构与各策略解析的真实页面一致，并可配置延迟、错误率和带宽。
+LocalRedis 是进程内的 Redis 替身，用于在本地测试共享任务队列。
+"""
+import asyncio
+import fnmatch
+import json
+import random
+import re
+import threading
+
+import httpx
+
+from benchmarks.parse_benchmark import _page_chrome
+from strategies.implementations import ARXIV_NAMESPACES
+from strategies.title_matching import normalize_title
+
+# 各替身站点的主机名，与策略中使用的一致
+STAND_IN_HOSTS = (
+    'export.arxiv.org', 'arxiv.org', 'api.core.ac.uk', 'core.ac.uk',
+    'openaccess.thecvf.com', 'proceedings.neurips.cc', 'ojs.aaai.org',
+)
+
+# 合成论文的来源 -> 传给爬虫的会议（None 表示不指定会议，走 CORE -> arXiv 后备策略）
+VENUE_CONFERENCES = {
+    'cvpr': 'CVPR',
+    'neurips': 'NeurIPS',
+    'aaai': 'AAAI',
+    'core': None,
+    'arxiv': None,
+}
+
+_WORDS = (
+    "adaptive attention bayesian contrastive diffusion efficient federated graph hierarchical implicit "
+    "latent multimodal neural optimal probabilistic robust scalable sparse structured temporal "
+    "transformer unsupervised variational learning inference representation retrieval segmentation "
+    "detection generation reasoning planning control estimation networks models fields policies "
+    "embeddings objects scenes language vision speech agents"
+).split()
+
+
+class SyntheticCorpus:
+    """按来源轮流分配的合成论文集合，标题由随机词加编号组成，保证互不相同。"""
+
+    def __init__(self, size: int, seed: int = 0):
+        rng = random.Random(seed)
+        venues = list(VENUE_CONFERENCES)
+        self.papers = []
+        for i in range(size):
+            words = rng.sample(_WORDS, rng.randint(5, 9))
+            self.papers.append({
+                'id': i,
+                'title': f"{' '.join(words).capitalize()} {i}",
+                'venue': venues[i % len(venues)],
+            })
+        # 来源 -> {标准化标题: 论文}
+        self.by_venue: dict[str, dict[str, dict]] = {venue: {} for venue in venues}
+        for paper in self.papers:
+            self.by_venue[paper['venue']][normalize_title(paper['title'])] = paper
+
+    def requests(self) -> list[dict]:
+        """传给 download_many 的论文列表。"""
+        return [{'title': paper['title'], 'conference': VENUE_CONFERENCES[paper['venue']]} for paper in self.papers]
+
+
+class ThrottledStream(httpx.AsyncByteStream):
+    """按给定带宽（字节/秒）分块发送的响应体，带宽为 0 时不限速。"""
+
+    def __init__(self, body: bytes, bandwidth: float, chunk_size: int = 16 * 1024):
+        self.body = body
+        self.bandwidth = bandwidth
+        self.chunk_size = chunk_size
+
+    async def __aiter__(self):
+        for offset in range(0, len(self.body), self.chunk_size):
+            chunk = self.body[offset:offset + self.chunk_size]
+            if self.bandwidth > 0:
+                await asyncio.sleep(len(chunk) / self.bandwidth)
+            yield chunk
+
+
+class StandInSites:
+    """
+    所有替身站点的请求处理函数，用法：httpx.MockTransport(StandInSites(corpus).handle)。
+    """
+
+    def __init__(self, corpus: SyntheticCorpus, latency: float = 0.02, jitter: float = 0.5,
+                 error_rate: float = 0.0, bandwidth: float = 0.0, pdf_size: int = 32 * 1024,
+                 distractors: int = 4, seed: int = 0):
+        """
+        Args:
+            corpus (SyntheticCorpus): 各站点收录的论文。
+            latency (float): 每个请求的平均响应延迟（秒）。
+            jitter (float): 延迟的随机浮动比例，实际延迟在 latency × (1 ± jitter) 之间均匀分布。
+            error_rate (float): 请求返回 503 的概率。
+            bandwidth (float): PDF 响应体的单连接带宽（字节/秒），0 表示不限速。
+            pdf_size (int): 合成 PDF 的大小（字节）。
+            distractors (int): 搜索结果中附带的无关论文数量，用于覆盖标题打分。
+        """
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.bandwidth = bandwidth
+        self.distractors = distractors
+        self._rng = random.Random(seed)
+        self.pdf_size = pdf_size
+        self._papers = {str(paper['id']): paper for paper in corpus.papers}
+        self._pools = {venue: list(papers.values()) for venue, papers in corpus.by_venue.items()}
+        # 每个主机收到的请求数
+        self.requests: dict[str, int] = {}
+        self._routes = {
+            'export.arxiv.org': self._arxiv,
+            'api.core.ac.uk': self._core,
+            'openaccess.thecvf.com': self._cvf,
+            'proceedings.neurips.cc': self._neurips,
+            'ojs.aaai.org': self._aaai,
+        }
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.requests[host] = self.requests.get(host, 0) + 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency * self._rng.uniform(1 - self.jitter, 1 + self.jitter))
+        if self.error_rate > 0 and self._rng.random() < self.error_rate:
+            return httpx.Response(503, text="Service Unavailable")
+        if request.url.path.endswith('.pdf') or '/download/' in request.url.path:
+            return self._pdf_response(request)
+        route = self._routes.get(host)
+        if route is None:
+            return httpx.Response(404)
+        return route(request)
+
+    # --- 辅助函数 ---
+
+    def _pdf_response(self, request: httpx.Request) -> httpx.Response:
+        # 每个文件的内容都不同，否则爬虫会按内容哈希把它们当作同一篇论文去重
+        header = f"%PDF-1.4\n% {request.url}\n".encode()
+        body = header + b"0" * max(0, self.pdf_size - len(header) - 7) + b"\n%%EOF\n"
+        return httpx.Response(
+            200,
+            headers={'Content-Type': 'application/pdf', 'Content-Length': str(len(body))},
+            stream=ThrottledStream(body, self.bandwidth),
+        )
+
+    def _search(self, venue: str, query: str) -> list[dict]:
+        """返回与查询标题相同的论文（如果收录）以及若干无关论文。"""
+        results = []
+        match = self.corpus.by_venue[venue].get(normalize_title(query))
+        if match is not None:
+            results.append(match)
+        pool = self._pools[venue]
+        if pool:
+            start = self._rng.randrange(len(pool))
+            results.extend(paper for paper in pool[start:start + self.distractors] if paper is not match)
+        return results
+
+    def _paper(self, request: httpx.Request, pattern: str) -> dict | None:
+        found = re.search(pattern, request.url.path)
+        return self._papers.get(found.group(1)) if found else None
+
+    @staticmethod
+    def _html(body: str) -> httpx.Response:
+        return httpx.Response(200, headers={'Content-Type': 'text/html; charset=utf-8'}, text=_page_chrome(body))
+
+    # --- 各站点 ---
+
+    def _arxiv(self, request: httpx.Request) -> httpx.Response:
+        query = request.url.params.get('search_query', '')
+        start = int(request.url.params.get('start', 0))
+        max_results = int(request.url.params.get('max_results', 10))
+        titles = re.findall(r'ti:"([^"]*)"', query)
+        papers = self.corpus.by_venue['arxiv']
+        matches = [papers[title] for title in titles if title in papers]
+        if len(titles) == 1:
+            matches.extend(paper for paper in self._search('arxiv', titles[0]) if paper not in matches)
+        entries = "".join(
+            f"<entry><id>http://arxiv.org/abs/2301.{paper['id']:05d}v1</id><title>{paper['title']}</title>"
+            f"<summary>Synthetic abstract.</summary><author><name>Author {paper['id']}</name></author>"
+            f'<link title="pdf" href="https://arxiv.org/pdf/2301.{paper["id"]:05d}v1.pdf" rel="related" '
+            f'type="application/pdf"/></entry>'
+            for paper in matches[start:start + max_results]
+        )
+        feed = (f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="{ARXIV_NAMESPACES["atom"]}" '
+                f'xmlns:opensearch="{ARXIV_NAMESPACES["opensearch"]}">'
+                f"<opensearch:totalResults>{len(matches)}</opensearch:totalResults>{entries}</feed>")
+        return httpx.Response(200, headers={'Content-Type': 'application/atom+xml'}, text=feed)
+
+    def _core(self, request: httpx.Request) -> httpx.Response:
+        data = json.loads(request.content or b'{}')
+        titles = re.findall(r'title:\("([^"]*)"\)', data.get('q', ''))
+        offset, limit = data.get('offset', 0), data.get('limit', 10)
+        papers = self.corpus.by_venue['core']
+        matches = [papers[title] for title in titles if title in papers]
+        if len(titles) == 1:
+            matches.extend(paper for paper in self._search('core', titles[0]) if paper not in matches)
+        results = [
+            {'id': paper['id'], 'title': paper['title'], 'doi': f"10.5555/core.{paper['id']}",
+             'downloadUrl': f"https://core.ac.uk/download/{paper['id']}.pdf"}
+            for paper in matches[offset:offset + limit]
+        ]
+        return httpx.Response(200, json={'totalHits': len(matches), 'results': results})
+
+    def _cvf(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/search_result':
+            entries = "".join(
+                f'<dt class="ptitle"><br><a href="/content/CVPR2023/html/Paper_{paper["id"]}_CVPR_2023_paper.html">'
+                f'{paper["title"]}</a></dt><dd>Author {paper["id"]}</dd>'
+                for paper in self._search('cvpr', request.url.params.get('q', ''))
+            )
+            return self._html(f'<div class="content"><dl>{entries}</dl></div>')
+        paper = self._paper(request, r'/html/Paper_(\d+)_')
+        if paper is None:
+            return httpx.Response(404)
+        return self._html(f'<div id="papertitle">{paper["title"]}</div>'
+                          f'<a href="/content/CVPR2023/papers/Paper_{paper["id"]}_CVPR_2023_paper.pdf">pdf</a>')
+
+    def _neurips(self, request: httpx.Request) -> httpx.Response:
+        entries = "".join(
+            f'<li><a href="/paper_files/paper/2023/hash/{paper["id"]:032x}-Abstract-Conference.html">'
+            f'{paper["title"]}</a> <i>Author {paper["id"]}</i></li>'
+            for paper in self._search('neurips', request.url.params.get('q', ''))
+        )
+        return self._html(f'<ul class="paper-list">{entries}</ul>')
+
+    def _aaai(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith('/search/search'):
+            entries = "".join(
+                f'<div class="obj_article_summary"><h3 class="title">'
+                f'<a href="https://ojs.aaai.org/index.php/AAAI/article/view/{paper["id"]}">{paper["title"]}</a>'
+                f'</h3></div>'
+                for paper in self._search('aaai', request.url.params.get('query', ''))
+            )
+            return self._html(f'<div class="search_results">{entries}</div>')
+        paper = self._paper(request, r'/article/view/(\d+)$')
+        if paper is None:
+            return httpx.Response(404)
+        return self._html(f'<a class="obj_galley_link pdf" '
+                          f'href="https://ojs.aaai.org/index.php/AAAI/article/view/{paper["id"]}/{paper["id"]}">PDF</a>')
+
+
+
+class WatchError(Exception):
+    """被 WATCH 的键在 EXEC 之前被修改，对应 redis.exceptions.WatchError。"""
+
+
+class LocalRedis:
+    """
+    进程内的 Redis 替身，只实现 job_store.RedisJobStore 用到的命令（行为与 decode_responses=True 的 redis.Redis 一致），
+    用于在没有 Redis 服务的环境中测试分布式任务队列；同一进程中的多个线程可以共享一个实例。
+    支持 WATCH/MULTI/EXEC 乐观事务：每个键有一个版本号，写命令使其递增，EXEC 时被监视的键版本变化则抛出 WatchError。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._hashes: dict[str, dict[str, str]] = {}
+        self._zsets: dict[str, dict[str, float]] = {}
+        self._versions: dict[str, int] = {}
+
+    def _touch(self, name: str):
+        self._versions[name] = self._versions.get(name, 0) + 1
+
+    # --- 哈希表 ---
+
+    def hsetnx(self, name: str, key: str, value) -> int:
+        with self._lock:
+            fields = self._hashes.setdefault(name, {})
+            if key in fields:
+                return 0
+            fields[key] = str(value)
+            self._touch(name)
+            return 1
+
+    def hset(self, name: str, key: str | None = None, value=None, mapping: dict | None = None) -> int:
+        with self._lock:
+            fields = self._hashes.setdefault(name, {})
+            updates = dict(mapping or {})
+            if key is not None:
+                updates[key] = value
+            added = sum(1 for field in updates if field not in fields)
+            fields.update({field: str(v) for field, v in updates.items()})
+            self._touch(name)
+            return added
+
+    def hget(self, name: str, key: str) -> str | None:
+        with self._lock:
+            return self._hashes.get(name, {}).get(key)
+
+    def hgetall(self, name: str) -> dict[str, str]:
+        with self._lock:
+            return dict(self._hashes.get(name, {}))
+
+    def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        with self._lock:
+            fields = self._hashes.setdefault(name, {})
+            fields[key] = str(int(fields.get(key, 0)) + amount)
+            self._touch(name)
+            return int(fields[key])
+
+    # --- 有序集合 ---
+
+    def zadd(self, name: str, mapping: dict[str, float], xx: bool = False) -> int:
+        with self._lock:
+            zset = self._zsets.setdefault(name, {})
+            added = 0
+            for member, score in mapping.items():
+                if xx and member not in zset:
+                    continue
+                added += member not in zset
+                zset[member] = float(score)
+                self._touch(name)
+            return added
+
+    def zrem(self, name: str, *members: str) -> int:
+        with self._lock:
+            zset = self._zsets.get(name, {})
+            removed = sum(1 for member in members if zset.pop(member, None) is not None)
+            if removed:
+                self._touch(name)
+            return removed
+
+    def zscore(self, name: str, member: str) -> float | None:
+        with self._lock:
+            return self._zsets.get(name, {}).get(member)
+
+    def _sorted(self, name: str) -> list[tuple[str, float]]:
+        return sorted(self._zsets.get(name, {}).items(), key=lambda item: (item[1], item[0]))
+
+    def zpopmin(self, name: str, count: int = 1) -> list[tuple[str, float]]:
+        with self._lock:
+            popped = self._sorted(name)[:count]
+            for member, _ in popped:
+                del self._zsets[name][member]
+            if popped:
+                self._touch(name)
+            return popped
+
+    def zrange(self, name: str, start: int, end: int, withscores: bool = False):
+        with self._lock:
+            items = self._sorted(name)
+            items = items[start:] if end == -1 else items[start:end + 1]
+            return items if withscores else [member for member, _ in items]
+
+    def zrangebyscore(self, name: str, min, max, start: int | None = None, num: int | None = None) -> list[str]:
+        low, high = float(min), float(max)
+        with self._lock:
+            members = [member for member, score in self._sorted(name) if low <= score <= high]
+        if start is not None and num is not None:
+            members = members[start:start + num]
+        return members
+
+    # --- 其他 ---
+
+    def scan_iter(self, match: str | None = None, count: int | None = None):
+        with self._lock:
+            keys = list(self._hashes) + list(self._zsets)
+        return iter([key for key in keys if match is None or fnmatch.fnmatchcase(key, match)])
+
+    def pipeline(self, transaction: bool = True) -> "LocalPipeline":
+        return LocalPipeline(self)
+
+    def transaction(self, func, *watches: str, value_from_callable: bool = False):
+        """与 redis.Redis.transaction 相同：WATCH 键后调用 func(pipe) 并 EXEC，被监视的键被修改时重试。"""
+        while True:
+            pipe = self.pipeline()
+            try:
+                pipe.watch(*watches)
+                value = func(pipe)
+                result = pipe.execute()
+                return value if value_from_callable else result
+            except WatchError:
+                continue
+
+    def close(self):
+        pass
+
+
+class LocalPipeline:
+    """
+    LocalRedis 的管道：记录命令，execute 时在锁内依次执行并返回各命令的结果。
+    watch 之后、multi 之前命令立即执行（与 redis-py 相同），execute 时被监视的键已被修改则不执行任何命令。
+    """
+
+    def __init__(self, client: LocalRedis):
+        self._client = client
+        self._commands = []
+        self._watched: dict[str, int] = {}
+        self._immediate = False
+
+    def __getattr__(self, name: str):
+        command = getattr(self._client, name)
+        if self._immediate:
+            return command
+
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+        return queue
+
+    def watch(self, *names: str):
+        with self._client._lock:
+            for name in names:
+                self._watched.setdefault(name, self._client._versions.get(name, 0))
+        self._immediate = True
+
+    def multi(self):
+        self._immediate = False
+
+    def execute(self) -> list:
+        commands, self._commands = self._commands, []
+        watched, self._watched, self._immediate = self._watched, {}, False
+        with self._client._lock:
+            if any(self._client._versions.get(name, 0) != version for name, version in watched.items()):
+                raise WatchError("Watched variable changed.")
+            return [command(*args, **kwargs) for command, args, kwargs in commands]
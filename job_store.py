@@ -0,0 +1,581 @@
+# job_store.py
+import hashlib
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+from urllib.parse import parse_qs, urlparse
+
+from strategies.title_matching import normalize_title
+
+try:
+    import redis
+except ImportError:  # redis 是可选依赖，只有使用 Redis 任务队列时才需要
+    redis = None
+
+# 任务状态
+PENDING = 'pending'
+RESOLVING = 'resolving'
+DOWNLOADING = 'downloading'
+DONE = 'done'
+FAILED = 'failed'
+JOB_STATES = (PENDING, RESOLVING, DOWNLOADING, DONE, FAILED)
+# 正在处理中的状态：进程退出时仍处于这些状态的任务需要重新排队
+IN_PROGRESS_STATES = (RESOLVING, DOWNLOADING)
+
+LEASE_EXPIRED_REASON = 'Lease expired (worker lost)'
+
+
+def default_worker_id() -> str:
+    """分布式模式下默认的工作进程标识：主机名:进程号。"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobStore:
+    """
+    持久化的下载任务队列（SQLite）。
+    每篇论文一条记录，状态依次为 pending -> resolving -> downloading -> done / failed，
+    并记录尝试次数和失败原因。每次状态变化都立即提交，进程崩溃或被中断后重新启动时，
+    从中断的位置继续：处理中的任务重新排队，已完成的任务不再处理。
+    失败的任务按指数退避（带随机抖动）重新排队，达到 max_attempts 次后不再重试。
+
+    多个工作进程可以共享同一个数据库文件：领取任务时写入工作进程标识和租约到期时间，
+    工作进程定期续租；租约过期（工作进程已退出）的任务可以被其他工作进程重新领取。
+    """
+
+    _COLUMNS = ('id', 'title', 'conference', 'state', 'attempts', 'reason', 'filepath', 'strategy',
+                'not_before', 'worker', 'size', 'sha256')
+    _SELECT = f"SELECT {', '.join(_COLUMNS)} FROM jobs"
+    _IN_PROGRESS = f"state IN ({', '.join(repr(state) for state in IN_PROGRESS_STATES)})"
+
+    def __init__(self, path: str, max_attempts: int = 3, backoff_base: float = 60.0, backoff_max: float = 3600.0,
+                 journal_mode: str = 'WAL'):
+        """
+        Args:
+            path (str): SQLite 数据库文件路径，传入 ':memory:' 时仅在本进程内保存。
+            max_attempts (int): 每篇论文最多尝试的次数。
+            backoff_base (float): 第一次失败后的重试等待时间（秒），之后每次失败翻倍。
+            backoff_max (float): 重试等待时间的上限（秒）。
+            journal_mode (str): SQLite 日志模式。同一主机上的多个进程使用默认的 WAL；
+                多台主机通过网络文件系统共享数据库时需使用 'DELETE'，WAL 依赖本机的共享内存。
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        # 自动提交模式，事务由 _transaction 显式控制；timeout 用于等待其他进程释放写锁
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        with self._lock:
+            if path != ':memory:':
+                self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    normalized_title TEXT NOT NULL UNIQUE,
+                    conference TEXT,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    reason TEXT,
+                    filepath TEXT,
+                    strategy TEXT,
+                    not_before REAL NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            # 旧版本的数据库没有租约和结果列，按需补上
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in (('worker', 'TEXT'), ('lease_expires', 'REAL'),
+                                        ('size', 'INTEGER'), ('sha256', 'TEXT')):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, not_before)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (lease_expires)")
+
+    @contextmanager
+    def _transaction(self):
+        """立即获取写锁的事务，保证领取任务时的查询和更新是原子的。"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _row_to_job(self, row) -> dict:
+        return dict(zip(self._COLUMNS, row))
+
+    def add(self, papers: Iterable[dict], chunk_size: int = 1000) -> int:
+        """
+        把论文加入队列，已在队列中的标题（按标准化标题判断）被忽略。
+        papers 可以是生成器，按 chunk_size 分批写入，内存占用与输入长度无关。
+
+        Returns:
+            int: 新加入的任务数量。
+        """
+        added = 0
+        chunk = []
+        for paper in papers:
+            title = (paper.get('title') or '').strip()
+            if title:
+                chunk.append((title, normalize_title(title), paper.get('conference'), PENDING, time.time()))
+            if len(chunk) >= chunk_size:
+                added += self._insert(chunk)
+                chunk = []
+        if chunk:
+            added += self._insert(chunk)
+        return added
+
+    def _insert(self, rows: list[tuple]) -> int:
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (title, normalized_title, conference, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            return conn.total_changes - before
+
+    def recover(self, worker: str | None = None) -> int:
+        """
+        把中断时仍在处理中的任务重新排队，返回数量。
+        单进程模式（worker 为 None）下重新排队所有处理中的任务；分布式模式下只处理本工作进程领取的任务，
+        其他工作进程的任务等租约过期后再被重新领取。
+        """
+        with self._transaction() as conn:
+            return conn.execute(
+                f"UPDATE jobs SET state = ?, worker = NULL, lease_expires = NULL, updated_at = ? "
+                f"WHERE {self._IN_PROGRESS} AND (? IS NULL OR worker = ?)",
+                (PENDING, time.time(), worker, worker),
+            ).rowcount
+
+    def claim(self, limit: int = 1, worker: str | None = None, lease_seconds: float | None = None) -> list[dict]:
+        """
+        领取最多 limit 个可处理的任务，将其标记为 resolving 并增加尝试次数。
+        可处理的任务包括：待处理的任务、退避时间已过且未达到尝试上限的失败任务，以及租约已过期的处理中任务。
+
+        Args:
+            worker (str): 工作进程标识，分布式模式下用于续租和结果校验。
+            lease_seconds (float): 租约时长（秒）；为 None 时租约不过期（单进程模式）。
+        """
+        now = time.time()
+        lease_expires = now + lease_seconds if lease_seconds is not None else None
+        with self._transaction() as conn:
+            # 租约过期且已达到尝试上限的任务（例如每次都让工作进程崩溃的论文）不再重试
+            conn.execute(
+                f"UPDATE jobs SET state = ?, reason = ?, worker = NULL, lease_expires = NULL, updated_at = ? "
+                f"WHERE {self._IN_PROGRESS} AND lease_expires < ? AND attempts >= ?",
+                (FAILED, LEASE_EXPIRED_REASON, now, now, self.max_attempts),
+            )
+            # 分三次查询，每次都能使用索引：租约过期的任务、待处理的任务、退避结束的失败任务
+            rows = conn.execute(
+                f"{self._SELECT} WHERE lease_expires < ? AND {self._IN_PROGRESS} ORDER BY lease_expires LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            for state, condition in ((PENDING, ""), (FAILED, f" AND attempts < {int(self.max_attempts)}")):
+                if len(rows) < limit:
+                    rows += conn.execute(
+                        f"{self._SELECT} WHERE state = ? AND not_before <= ?{condition} "
+                        f"ORDER BY not_before, id LIMIT ?",
+                        (state, now, limit - len(rows)),
+                    ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, worker = ?, lease_expires = ?, updated_at = ? "
+                "WHERE id = ?",
+                [(RESOLVING, worker, lease_expires, now, row[0]) for row in rows],
+            )
+        jobs = [self._row_to_job(row) for row in rows]
+        for job in jobs:
+            job.update(state=RESOLVING, attempts=job['attempts'] + 1, worker=worker)
+        return jobs
+
+    def renew(self, job_ids: list, worker: str, lease_seconds: float) -> int:
+        """为本工作进程仍持有的任务续租，返回续租成功的数量。"""
+        if not job_ids:
+            return 0
+        with self._transaction() as conn:
+            return conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE worker = ? AND {self._IN_PROGRESS} "
+                f"AND id IN ({', '.join('?' * len(job_ids))})",
+                (time.time() + lease_seconds, worker, *job_ids),
+            ).rowcount
+
+    def mark(self, job_id: int, state: str, worker: str | None = None):
+        """更新处理中任务的状态（例如找到PDF链接后进入 downloading）。"""
+        with self._transaction() as conn:
+            conn.execute(
+                f"UPDATE jobs SET state = ?, updated_at = ? WHERE id = ? AND {self._IN_PROGRESS} AND worker IS ?",
+                (state, time.time(), job_id, worker),
+            )
+
+    def complete(self, job_id: int, filepath: str, strategy: str | None = None, size: int | None = None,
+                 sha256: str | None = None, worker: str | None = None):
+        """记录下载结果。即使租约已被其他工作进程接手，已下载的文件仍然有效，因此不校验 worker。"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, filepath = ?, strategy = ?, size = ?, sha256 = ?, worker = ?, "
+                "reason = NULL, lease_expires = NULL, updated_at = ? WHERE id = ?",
+                (DONE, filepath, strategy, size, sha256, worker, time.time(), job_id),
+            )
+
+    def backoff(self, attempts: int) -> float:
+        """第 attempts 次失败后的重试等待时间：指数增长，并在 [50%, 100%] 之间随机抖动，避免大量任务同时重试。"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** max(0, attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def fail(self, job_id: int, reason: str, worker: str | None = None) -> bool:
+        """
+        记录失败原因，并按退避时间重新排队。任务已被其他工作进程接手时（租约过期）不做修改。
+
+        Returns:
+            bool: 是否还会重试（未达到尝试上限）。
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                f"SELECT attempts FROM jobs WHERE id = ? AND {self._IN_PROGRESS} AND worker IS ?", (job_id, worker),
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute(
+                "UPDATE jobs SET state = ?, reason = ?, not_before = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (FAILED, reason, now + self.backoff(row[0]), now, job_id),
+            )
+        return row[0] < self.max_attempts
+
+    def next_retry_at(self) -> float | None:
+        """
+        最早可以再领取任务的时间：可重试失败任务的退避结束时间，或其他工作进程租约的到期时间。
+        没有任何可能再被领取的任务时返回 None。
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT MIN(CASE WHEN state = ? THEN not_before ELSE lease_expires END) FROM jobs "
+                f"WHERE (state = ? AND attempts < ?) OR ({self._IN_PROGRESS} AND lease_expires IS NOT NULL)",
+                (FAILED, FAILED, self.max_attempts),
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, normalized_title: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(f"{self._SELECT} WHERE normalized_title = ?", (normalized_title,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def finished(self) -> Iterator[dict]:
+        """逐条返回已完成和最终失败的任务，协调者据此汇总各工作进程上报的结果。"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"{self._SELECT} WHERE id > ? AND (state = ? OR (state = ? AND attempts >= ?)) "
+                    f"ORDER BY id LIMIT 1000",
+                    (last_id, DONE, FAILED, self.max_attempts),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_job(row)
+            last_id = rows[-1][0]
+
+    def counts(self) -> dict[str, int]:
+        """各状态的任务数量。"""
+        with self._lock:
+            rows = dict(self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return {state: rows.get(state, 0) for state in JOB_STATES}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisJobStore:
+    """
+    基于 Redis（或兼容协议的服务，如 KeyDB、Valkey）的共享任务队列，接口与 JobStore 相同，供多台主机上的工作进程使用。
+
+    键结构（均以 prefix 开头）：
+        job:<id>   每个任务的哈希表（字段与 JobStore 的列相同），id 为标准化标题的 SHA-1 前缀
+        ready      可领取任务的有序集合，分数为最早可领取的时间（入队时间或退避结束时间）
+        leases     处理中任务的有序集合，分数为租约到期时间（单进程模式下为 +inf）
+        counts     各状态任务数量的哈希表
+    每次状态转换（入队、领取、续租、完成、失败、恢复）都是一个 WATCH/MULTI/EXEC 事务：多个工作进程同时领取时
+    每个任务只会被一个进程拿到，进程在转换中途崩溃时任务和 counts 保持转换前的状态。
+    """
+
+    def __init__(self, client, prefix: str = "papercrawler", max_attempts: int = 3,
+                 backoff_base: float = 60.0, backoff_max: float = 3600.0):
+        """
+        Args:
+            client: redis.Redis 客户端（需 decode_responses=True），或 benchmarks.stand_ins.LocalRedis。
+            prefix (str): 键前缀，不同的爬取任务使用不同的前缀即可共用一个 Redis。
+        """
+        self.client = client
+        self.prefix = prefix
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    backoff = JobStore.backoff
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisJobStore":
+        if redis is None:
+            raise RuntimeError("The 'redis' package is required for a Redis job queue (pip install redis).")
+        return cls(redis.Redis.from_url(url, decode_responses=True), **kwargs)
+
+    def _key(self, *parts: str) -> str:
+        return ':'.join((self.prefix, *parts))
+
+    @staticmethod
+    def job_id(normalized_title: str) -> str:
+        return hashlib.sha1(normalized_title.encode('utf-8')).hexdigest()[:20]
+
+    @staticmethod
+    def _parse(job_id: str, data: dict) -> dict | None:
+        if not data:
+            return None
+        job = {key: data.get(key) or None for key in JobStore._COLUMNS}
+        job.update(id=job_id, attempts=int(data.get('attempts', 0)), not_before=float(data.get('not_before', 0)))
+        if job['size'] is not None:
+            job['size'] = int(job['size'])
+        return job
+
+    def _job(self, job_id: str) -> dict | None:
+        return self._parse(job_id, self.client.hgetall(self._key('job', job_id)))
+
+    def _jobs(self, job_ids: list) -> list[dict | None]:
+        """一次往返读取多个任务。"""
+        pipe = self.client.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hgetall(self._key('job', job_id))
+        return [self._parse(job_id, data) for job_id, data in zip(job_ids, pipe.execute())]
+
+    def _transaction(self, transition, *keys: str):
+        """
+        以 WATCH/MULTI/EXEC 乐观事务执行一次状态转换：transition(pipe) 先读取（可以再 WATCH 读到的任务键），
+        然后调用 pipe.multi() 排入写命令；EXEC 前被监视的键被其他工作进程修改时整体重试。
+        写命令要么全部生效要么都不生效，工作进程在中途崩溃既不会丢失任务，也不会使 counts 失准。
+        """
+        return self.client.transaction(transition, *keys, value_from_callable=True)
+
+    def _set_state(self, pipe, job_id: str, old_state: str | None, state: str, **fields):
+        """在事务中排入状态更新及对应的 counts 增减。"""
+        pipe.hset(self._key('job', job_id), mapping={'state': state, **{k: '' if v is None else v
+                                                                       for k, v in fields.items()}})
+        if old_state:
+            pipe.hincrby(self._key('counts'), old_state, -1)
+        pipe.hincrby(self._key('counts'), state, 1)
+
+    def add(self, papers: Iterable[dict], chunk_size: int = 1000) -> int:
+        """把论文加入队列，已在队列中的标题被忽略；按 chunk_size 分批，每批一个事务。"""
+        added = 0
+        chunk = []
+        for paper in papers:
+            title = (paper.get('title') or '').strip()
+            if title:
+                chunk.append((title, paper.get('conference')))
+            if len(chunk) >= chunk_size:
+                added += self._insert(chunk)
+                chunk = []
+        if chunk:
+            added += self._insert(chunk)
+        return added
+
+    def _insert(self, papers: list[tuple[str, str | None]]) -> int:
+        papers = list({self.job_id(normalize_title(title)): (title, conference)
+                       for title, conference in papers}.items())
+        keys = [self._key('job', job_id) for job_id, _ in papers]
+
+        def transition(pipe):
+            reader = self.client.pipeline(transaction=False)
+            for key in keys:
+                reader.hget(key, 'state')
+            states = reader.execute()
+            now = time.time()
+            pipe.multi()
+            new = 0
+            for (job_id, (title, conference)), state in zip(papers, states):
+                if state is not None:
+                    continue
+                new += 1
+                pipe.hset(self._key('job', job_id), mapping={
+                    'title': title, 'conference': conference or '', 'state': PENDING, 'attempts': 0,
+                    'not_before': now,
+                })
+                pipe.zadd(self._key('ready'), {job_id: now})
+            if new:
+                pipe.hincrby(self._key('counts'), PENDING, new)
+            return new
+
+        return self._transaction(transition, *keys)
+
+    def recover(self, worker: str | None = None) -> int:
+        def transition(pipe):
+            job_ids = pipe.zrange(self._key('leases'), 0, -1)
+            if not job_ids:
+                return 0
+            pipe.watch(*(self._key('job', job_id) for job_id in job_ids))
+            jobs = self._jobs(job_ids)
+            now = time.time()
+            pipe.multi()
+            recovered = 0
+            for job_id, job in zip(job_ids, jobs):
+                if job is None or (worker is not None and job['worker'] != worker):
+                    continue
+                pipe.zrem(self._key('leases'), job_id)
+                pipe.zadd(self._key('ready'), {job_id: now})
+                self._set_state(pipe, job_id, job['state'], PENDING, worker=None)
+                recovered += 1
+            return recovered
+
+        return self._transaction(transition, self._key('leases'))
+
+    def claim(self, limit: int = 1, worker: str | None = None, lease_seconds: float | None = None) -> list[dict]:
+        def transition(pipe):
+            now = time.time()
+            # 租约过期的处理中任务优先，其次是可领取队列中时间已到的任务（分数不超过当前时间，退避中的不领取）
+            expired = pipe.zrangebyscore(self._key('leases'), '-inf', now, start=0, num=limit)
+            ready = pipe.zrangebyscore(self._key('ready'), '-inf', now, start=0, num=limit)
+            candidates = [(job_id, 'leases') for job_id in expired] + [(job_id, 'ready') for job_id in ready]
+            if not candidates:
+                return []
+            pipe.watch(*(self._key('job', job_id) for job_id, _ in candidates))
+            loaded = self._jobs([job_id for job_id, _ in candidates])
+            expires = now + lease_seconds if lease_seconds is not None else float('inf')
+            pipe.multi()
+            jobs = []
+            for (job_id, source), job in zip(candidates, loaded):
+                if len(jobs) >= limit:
+                    break
+                if job is None:
+                    # 没有任务数据的残留成员，直接清理
+                    pipe.zrem(self._key(source), job_id)
+                    continue
+                if source == 'leases' and job['attempts'] >= self.max_attempts:
+                    # 租约过期且已达到尝试上限的任务（例如每次都让工作进程崩溃的论文）不再重试
+                    pipe.zrem(self._key('leases'), job_id)
+                    self._set_state(pipe, job_id, job['state'], FAILED, reason=LEASE_EXPIRED_REASON, worker=None)
+                    continue
+                pipe.zrem(self._key(source), job_id)
+                pipe.zadd(self._key('leases'), {job_id: expires})
+                self._set_state(pipe, job_id, job['state'], RESOLVING, worker=worker, attempts=job['attempts'] + 1)
+                job.update(state=RESOLVING, attempts=job['attempts'] + 1, worker=worker)
+                jobs.append(job)
+            return jobs
+
+        return self._transaction(transition, self._key('leases'), self._key('ready'))
+
+    def _owned(self, job: dict | None, worker: str | None) -> bool:
+        return job is not None and job['state'] in IN_PROGRESS_STATES and job['worker'] == worker
+
+    def renew(self, job_ids: list, worker: str, lease_seconds: float) -> int:
+        if not job_ids:
+            return 0
+        keys = [self._key('job', job_id) for job_id in job_ids]
+
+        def transition(pipe):
+            jobs = self._jobs(job_ids)
+            expires = time.time() + lease_seconds
+            pipe.multi()
+            renewed = 0
+            for job_id, job in zip(job_ids, jobs):
+                if self._owned(job, worker):
+                    pipe.zadd(self._key('leases'), {job_id: expires}, xx=True)
+                    renewed += 1
+            return renewed
+
+        return self._transaction(transition, *keys)
+
+    def mark(self, job_id: str, state: str, worker: str | None = None):
+        def transition(pipe):
+            job = self._job(job_id)
+            pipe.multi()
+            if self._owned(job, worker):
+                self._set_state(pipe, job_id, job['state'], state)
+
+        self._transaction(transition, self._key('job', job_id))
+
+    def complete(self, job_id: str, filepath: str, strategy: str | None = None, size: int | None = None,
+                 sha256: str | None = None, worker: str | None = None):
+        def transition(pipe):
+            job = self._job(job_id)
+            pipe.multi()
+            if job is None:
+                return
+            pipe.zrem(self._key('leases'), job_id)
+            pipe.zrem(self._key('ready'), job_id)
+            self._set_state(pipe, job_id, job['state'], DONE, filepath=filepath, strategy=strategy, size=size,
+                            sha256=sha256, worker=worker, reason=None)
+
+        self._transaction(transition, self._key('job', job_id))
+
+    def fail(self, job_id: str, reason: str, worker: str | None = None) -> bool:
+        def transition(pipe):
+            job = self._job(job_id)
+            leased = pipe.zscore(self._key('leases'), job_id) is not None
+            pipe.multi()
+            if not self._owned(job, worker) or not leased:
+                return False
+            not_before = time.time() + self.backoff(job['attempts'])
+            pipe.zrem(self._key('leases'), job_id)
+            self._set_state(pipe, job_id, job['state'], FAILED, reason=reason, not_before=not_before)
+            retry = job['attempts'] < self.max_attempts
+            if retry:
+                pipe.zadd(self._key('ready'), {job_id: not_before})
+            return retry
+
+        return self._transaction(transition, self._key('job', job_id), self._key('leases'))
+
+    def next_retry_at(self) -> float | None:
+        times = []
+        for key in ('ready', 'leases'):
+            first = self.client.zrange(self._key(key), 0, 0, withscores=True)
+            if first and first[0][1] != float('inf'):
+                times.append(first[0][1])
+        return min(times) if times else None
+
+    def get(self, normalized_title: str) -> dict | None:
+        return self._job(self.job_id(normalized_title))
+
+    def finished(self) -> Iterator[dict]:
+        for key in self.client.scan_iter(match=self._key('job', '*'), count=1000):
+            job = self._job(key.rsplit(':', 1)[1])
+            if job and (job['state'] == DONE or (job['state'] == FAILED and job['attempts'] >= self.max_attempts)):
+                yield job
+
+    def counts(self) -> dict[str, int]:
+        counts = self.client.hgetall(self._key('counts'))
+        return {state: int(counts.get(state, 0)) for state in JOB_STATES}
+
+    def close(self):
+        self.client.close()
+
+
+def open_job_store(url: str, **kwargs):
+    """
+    按 URL 打开共享任务队列：
+        redis://host:6379/0?prefix=name   Redis 或兼容服务（rediss:// 和 unix:// 同样支持）
+        sqlite:///path/to/jobs.sqlite3?journal_mode=DELETE   SQLite 文件；也可以直接传文件路径
+    其余关键字参数（max_attempts、backoff_base 等）传给任务队列。
+    """
+    parsed = urlparse(url)
+    options = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+    if parsed.scheme in ('redis', 'rediss', 'unix'):
+        if 'prefix' in options:
+            kwargs['prefix'] = options['prefix']
+        return RedisJobStore.from_url(url.split('?', 1)[0], **kwargs)
+    if parsed.scheme == 'sqlite':
+        if 'journal_mode' in options:
+            kwargs['journal_mode'] = options['journal_mode']
+        # 与 SQLAlchemy 相同：sqlite:///相对路径，sqlite:////绝对路径
+        return JobStore(parsed.path[1:], **kwargs)
+    return JobStore(url, **kwargs)
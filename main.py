@@ -45,15 +45,14 @@ def main():
     # 1. 在所有任务开始前，手动启动浏览器
     crawler.setup_driver()
 
-    # 2. 循环处理每一篇论文
-    for paper in papers_to_download:
-        crawler.download_paper(
-            title=paper["title"],
-            conference=paper.get("conference")
-        )
-
-    # 3. 所有任务结束后，手动关闭浏览器
-    crawler.teardown_driver()
+    # 2. 在同一个事件循环中并发处理所有论文
+    results = crawler.download_many(papers_to_download, max_concurrency=4)
+    for result in results:
+        status = "✅" if result["filepath"] else "❌"
+        print(f"{status} {result['title']} ({result['elapsed']:.1f}s)")
+
+    # 3. 所有任务结束后，关闭浏览器和共享的 httpx 客户端
+    crawler.close()
 
     print("\n================= All Done =================")
 
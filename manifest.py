@@ -0,0 +1,150 @@
+# manifest.py
+import hashlib
+import json
+import os
+import threading
+import time
+
+PDF_MAGIC = b'%PDF-'
+PDF_TRAILER = b'%%EOF'
+
+
+def is_pdf_file(path: str, tail_size: int = 2048) -> bool:
+    """
+    检查文件是否为完整的PDF：以 %PDF- 开头，且末尾附近包含 %%EOF 结束标记。
+    用于识别失败后残留的截断文件或被误存为PDF的HTML页面。
+    """
+    try:
+        size = os.path.getsize(path)
+        if size < len(PDF_MAGIC) + len(PDF_TRAILER):
+            return False
+        with open(path, 'rb') as f:
+            if f.read(len(PDF_MAGIC)) != PDF_MAGIC:
+                return False
+            f.seek(max(0, size - tail_size))
+            return PDF_TRAILER in f.read()
+    except OSError:
+        return False
+
+
+def sha256_file(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadManifest:
+    """
+    下载清单：记录每篇已下载论文的标准化标题、DOI、文件路径、大小、SHA-256、来源和时间。
+
+    清单以 JSONL 格式追加写入，每条记录一次性写入并 fsync，崩溃时最多丢失最后一条未写完的记录；
+    启动时一次性加载进内存并建立 标题/DOI/哈希 索引，之后的跳过与去重判断都是 O(1) 的字典查询。
+    同一标题的多条记录以最后一条为准，文件明显膨胀时在加载后原子地重写压缩。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._by_title: dict[str, dict] = {}
+        self._by_doi: dict[str, dict] = {}
+        self._by_hash: dict[str, dict] = {}
+        self._load()
+
+    def _index(self, entry: dict):
+        self._by_title[entry['title']] = entry
+        if entry.get('doi'):
+            self._by_doi[entry['doi'].lower()] = entry
+        if entry.get('sha256'):
+            self._by_hash.setdefault(entry['sha256'], entry)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        line_count = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line_count += 1
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 崩溃时残留的半条记录，直接忽略
+                    continue
+                self._index(entry)
+        if line_count > 2 * len(self._by_title) + 100:
+            self._compact()
+
+    def _compact(self):
+        """把内存中的最新记录原子地重写为新的清单文件。"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self._by_title.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _append(self, entry: dict):
+        data = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def __len__(self) -> int:
+        return len(self._by_title)
+
+    def get(self, normalized_title: str) -> dict | None:
+        return self._by_title.get(normalized_title)
+
+    def find_by_doi(self, doi: str) -> dict | None:
+        return self._by_doi.get(doi.lower())
+
+    def find_by_hash(self, sha256: str) -> dict | None:
+        return self._by_hash.get(sha256)
+
+    def is_complete(self, entry: dict | None) -> bool:
+        """清单记录对应的文件仍然存在且大小一致时视为已完成（只做一次 stat，不读取内容）。"""
+        if not entry:
+            return False
+        try:
+            return os.path.getsize(entry['path']) == entry['size']
+        except OSError:
+            return False
+
+    def add(self, entry: dict):
+        """原子地追加一条记录并更新内存索引。"""
+        with self._lock:
+            self._append(entry)
+            self._index(entry)
+
+    def record(self, normalized_title: str, filepath: str, source: str, doi: str | None = None) -> dict:
+        """
+        为刚下载完成的文件计算大小和 SHA-256 并写入清单。
+        如果相同内容已经以其他文件保存，则删除新文件，让该标题指向已有文件，避免重复存储。
+
+        Returns:
+            dict: 写入的清单记录，其中 path 是最终保存内容的文件路径。
+        """
+        sha256 = sha256_file(filepath)
+        path = filepath
+        duplicate = self.find_by_hash(sha256)
+        if duplicate and os.path.abspath(duplicate['path']) != os.path.abspath(filepath) \
+                and self.is_complete(duplicate):
+            print(f"   [Manifest] Same content already stored as {duplicate['path']}, removing duplicate file.")
+            os.remove(filepath)
+            path = duplicate['path']
+        entry = {
+            'title': normalized_title,
+            'doi': doi,
+            'path': path,
+            'size': os.path.getsize(path),
+            'sha256': sha256,
+            'source': source,
+            'timestamp': time.time(),
+        }
+        self.add(entry)
+        return entry
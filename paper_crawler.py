@@ -1,7 +1,11 @@
 # paper_crawler.py (Stealth & Reordered)
 import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import os
 import re
+import time
+from typing import AsyncIterator, Iterable
 import httpx
 
 # --- Selenium Imports ---
@@ -10,16 +14,35 @@ from selenium.webdriver import DesiredCapabilities
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
+from job_store import DONE, DOWNLOADING, FAILED, JobStore
+from manifest import DownloadManifest, is_pdf_file
+
 # --- httpx-based Downloaders ---
 from strategies.implementations import (
     ArxivDownloader,
+    BrowserSessionDownloader,
     CoreDownloader,
+    browser_cookie_jar,
     AaaiOjsDownloader,
     NeuripsDownloader,
     CvfDownloader
 )
 
+from strategies.batch_resolver import BatchResolver
+from strategies.download_strategy import DEFAULT_MAX_PDF_SIZE, OFFLINE_LOOKUP_OUTCOMES, extract_doi, normalize_title
+from strategies.metrics import (
+    PAPER_SECONDS, PAPERS_SKIPPED_TOTAL, PAPERS_TOTAL, SELENIUM_CALLS_TOTAL, SELENIUM_SECONDS,
+    STRATEGY_SUCCESSES_TOTAL, MetricsRegistry, MetricsTransport
+)
+from strategies.parse_pool import ParsePool
+from strategies.proceedings_index import ProceedingsIndex, index_aaai, index_cvf, index_neurips
+from strategies.rate_limiter import HostRateLimiter, RateLimitedTransport
+from strategies.resilience import HostCircuitBreakers, ResilientTransport, RetryPolicy
+from strategies.resolution_cache import ResolutionCache, DEFAULT_POSITIVE_TTL, DEFAULT_NEGATIVE_TTL
+from strategies.strategy_stats import StrategyStats
+
 # --- Selenium-based Downloaders ---
+from strategies.driver_pool import DriverPool
 from strategies.selenium_implementations import (
     AcmDlSeleniumDownloader,
     IeeeSeleniumDownloader
@@ -42,164 +65,975 @@ CONFERENCE_TO_SOURCE_MAP = {
     'iccv': 'iccv',
 }
 
+# 各来源主机的限速配置：host -> (每秒请求数, 突发容量)
+# 键同样匹配子域名；未列出的主机使用由 request_delay 推导出的默认速率
+SOURCE_RATE_LIMITS = {
+    'export.arxiv.org': (1 / 3, 1),  # arXiv API 文档要求每 3 秒最多 1 个请求
+    'arxiv.org': (1.0, 4),
+    'api.core.ac.uk': (0.5, 5),  # CORE 免费配额：每 10 秒 5 次单条请求
+    'openaccess.thecvf.com': (2.0, 4),
+    'proceedings.neurips.cc': (2.0, 4),
+    'ojs.aaai.org': (1.0, 2),
+}
+
+# 可建立本地索引的会议：会议 -> 索引中的 venue
+PROCEEDINGS_INDEX_VENUES = {
+    'cvpr': 'cvf',
+    'iccv': 'cvf',
+    'wacv': 'cvf',
+    'neurips': 'neurips',
+    'aaai': 'aaai',
+}
+
 class PaperCrawler:
-    def __init__(self, save_dir: str, core_api_key: str = CORE_API_KEY, request_delay: int = 2):
+    def __init__(self, save_dir: str, core_api_key: str = CORE_API_KEY, request_delay: int = 2,
+                 max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0, http2: bool = False, compression: bool = True,
+                 rate_limits: dict[str, tuple[float, int]] | None = None,
+                 parallel_lookup: bool = False, hedge_delay: float = 0.0,
+                 resolution_cache_path: str | None = ".resolution_cache.sqlite3",
+                 cache_ttl: float = DEFAULT_POSITIVE_TTL, negative_cache_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 manifest_path: str = ".manifest.jsonl", num_drivers: int = 1,
+                 selenium_timeout: float = 600.0, browser_handoff: bool = True,
+                 proceedings_index_path: str | None = ".proceedings_index.sqlite3",
+                 max_pdf_size: int = DEFAULT_MAX_PDF_SIZE, parser_backend: str | dict[str, str] = "auto",
+                 parse_workers: int = 0, metrics_path: str | None = None,
+                 prometheus_path: str | None = None, metrics_port: int | None = None,
+                 strategy_stats_path: str | None = ".strategy_stats.sqlite3", adaptive_ordering: bool = True,
+                 adaptive_min_samples: int = 20, transport: httpx.AsyncBaseTransport | None = None,
+                 job_store_path: str | None = ".jobs.sqlite3", job_max_attempts: int = 3,
+                 job_retry_backoff: float = 60.0, job_store=None, worker_id: str | None = None,
+                 lease_seconds: float = 300.0, max_retries: int = 3, retry_backoff: float = 1.0,
+                 circuit_failure_threshold: int = 5, circuit_cooldown: float = 60.0):
         self.save_directory = os.path.abspath(save_dir)
         self.core_api_key = core_api_key
         self.request_delay = request_delay
         self.timeout_config = httpx.Timeout(20.0, read=60.0)
+        # 所有论文和策略共享的连接池配置
+        self.pool_limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.compression = compression
+        # 替换最底层的网络传输（例如基准测试中的 httpx.MockTransport），限速和指标层仍包在其外
+        self.transport = transport
+        # 按主机限速：每个来源独立排队，request_delay 作为未配置主机的默认请求间隔
+        self.rate_limiter = HostRateLimiter(
+            {**SOURCE_RATE_LIMITS, **(rate_limits or {})},
+            default_rate=1 / request_delay if request_delay > 0 else 1000.0,
+        )
+        # 容错：暂时性错误（超时、连接失败、429/5xx）最多重试 max_retries 次，从 retry_backoff 秒开始带抖动地指数退避；
+        # 某个主机连续失败 circuit_failure_threshold 次后熔断 circuit_cooldown 秒，期间直接跳过依赖该主机的策略
+        self.retry_policy = RetryPolicy(max_retries=max_retries, base_delay=retry_backoff)
+        self.circuit_breakers = HostCircuitBreakers(circuit_failure_threshold, circuit_cooldown)
+        # 并行查找模式：相邻的 httpx 策略同时查找，hedge_delay 为依次追加启动的间隔（秒）
+        self.parallel_lookup = parallel_lookup
+        self.hedge_delay = hedge_delay
         os.makedirs(self.save_directory, exist_ok=True)
-        self.driver = None
+        # 持久化的 标题->PDF链接 解析缓存；相对路径基于保存目录，传入 None 关闭缓存
+        self.resolution_cache = None
+        if resolution_cache_path:
+            if resolution_cache_path != ':memory:':
+                resolution_cache_path = os.path.join(self.save_directory, resolution_cache_path)
+            self.resolution_cache = ResolutionCache(
+                resolution_cache_path,
+                positive_ttl=cache_ttl,
+                negative_ttl=negative_cache_ttl,
+            )
+        # 本地论文集索引：由 index_proceedings 填充，CVF/NeurIPS/AAAI 策略查找时优先查询；传入 None 关闭
+        self.proceedings_index = None
+        if proceedings_index_path:
+            if proceedings_index_path != ':memory:':
+                proceedings_index_path = os.path.join(self.save_directory, proceedings_index_path)
+            self.proceedings_index = ProceedingsIndex(proceedings_index_path)
+        # 策略统计：按 (会议, 策略) 记录成功率和耗时，adaptive_ordering 开启时据此调整策略顺序；
+        # 某个会议累计 adaptive_min_samples 次尝试之前保持默认顺序。传入 None 关闭统计
+        self.strategy_stats = None
+        if strategy_stats_path:
+            if strategy_stats_path != ':memory:':
+                strategy_stats_path = os.path.join(self.save_directory, strategy_stats_path)
+            self.strategy_stats = StrategyStats(strategy_stats_path, min_samples=adaptive_min_samples)
+        self.adaptive_ordering = adaptive_ordering
+        # 持久化任务队列：enqueue 加入的论文由 run_jobs 领取处理，中断后重新运行时从中断处继续；
+        # 失败的任务从 job_retry_backoff 秒开始指数退避重试，最多尝试 job_max_attempts 次。传入 None 关闭。
+        # 队列文件在第一次使用任务队列（enqueue/aiter_jobs/run_jobs）时才创建，只调用 download_many 等不会产生队列文件。
+        # 也可以直接传入多个工作进程共享的任务队列 job_store（见 job_store.open_job_store），此时由调用方负责关闭
+        self.job_store = job_store
+        self._owns_job_store = job_store is None
+        if job_store_path and job_store_path != ':memory:':
+            job_store_path = os.path.join(self.save_directory, job_store_path)
+        self.job_store_path = job_store_path
+        self._job_store_options = {'max_attempts': job_max_attempts, 'backoff_base': job_retry_backoff}
+        # 分布式模式：worker_id 不为 None 时，领取的任务带有 lease_seconds 秒的租约并定期续租，
+        # 工作进程退出后租约过期的任务由其他工作进程重新领取
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        # 任务队列每次领取新任务的最长间隔（秒）
+        self.job_poll_interval = 5.0
+        # 正在处理的任务：标准化标题 -> 任务 ID（SQLite 队列为整数，Redis 队列为字符串）
+        self._job_ids: dict[str, int | str] = {}
+        # 下载清单：一次性加载进内存，跳过和去重检查都基于它完成
+        self.manifest = DownloadManifest(os.path.join(self.save_directory, manifest_path))
+        # 正在处理中的标题，避免同一批次中重复的标题并发写同一个文件
+        self._inflight: dict[str, asyncio.Future] = {}
+        # 批量模式下合并各篇论文查询的解析器：策略键 -> BatchResolver
+        self._batch_resolvers: dict[str, BatchResolver] = {}
+        # Selenium 浏览器池（setup_driver 时创建），num_drivers 为浏览器数量
+        self.num_drivers = num_drivers
+        self.driver_pool = None
+        # Selenium 策略在专用线程池中执行，避免阻塞事件循环；selenium_timeout 为单次调用的截止时间（秒）
+        self.selenium_timeout = selenium_timeout
+        # 混合模式：浏览器只用于通过登录/验证并找到PDF链接，传输由 httpx 完成
+        self.browser_handoff = browser_handoff
+        # 单个PDF的大小上限（字节），超出时立即中止传输
+        self.max_pdf_size = max_pdf_size
+        # HTML 解析后端：字符串作用于所有策略，字典按策略键（如 'cvpr'、'aaai'）分别指定，未列出的策略使用 'auto'
+        self.parser_backend = parser_backend
+        # 可选的解析进程池：parse_workers > 0 时，大页面的解析和大量候选的打分在工作进程中执行
+        self.parse_pool = ParsePool(parse_workers) if parse_workers > 0 else None
+        # 指标：按策略/主机记录延迟、字节数、状态码和失败原因。
+        # metrics_path 为每个批次结束时写入的 JSON 摘要，prometheus_path 为定期刷新的 Prometheus 文本文件，
+        # metrics_port 为 /metrics 端点的端口；相对路径基于保存目录
+        self.metrics = MetricsRegistry()
+        self.metrics_path = os.path.join(self.save_directory, metrics_path) if metrics_path else None
+        self.prometheus_path = os.path.join(self.save_directory, prometheus_path) if prometheus_path else None
+        self.metrics_flush_interval = 10.0
+        self._metrics_flushed_at = 0.0
+        self._metrics_server = self.metrics.serve(metrics_port) if metrics_port is not None else None
+        self._selenium_executor = None
+        self.session = None
+        self._session_loop = None
+        self._session_transport = None
+        self._loop = None
+
+    def _create_driver(self, download_path: str):
+        """
+        创建并配置一个带有反检测功能的 Chrome 实例，PDF 下载到 download_path。
+        """
+        chrome_options = Options()
+        # --- 其他常规配置 ---
+        chrome_options.add_argument("--start-maximized")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument('--disable-infobars')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+
+        # --- PDF下载设置 ---
+        # 使用undetected_chromedriver支持的方式设置首选项
+        chrome_options.add_argument(f"--download.default_directory={download_path}")
+        chrome_options.add_argument("--download.prompt_for_download=false")
+        chrome_options.add_argument("--plugins.always_open_pdf_externally=true")
+
+        # 使用undetected_chromedriver来更好地处理SSL和反检测
+        driver = webdriver.Chrome(service=Service('./undetected_chromedriver.exe'),options=chrome_options,driver_executable_path="./chromedriver.exe")
+
+        # 初始化后立即设置下载行为
+        driver.execute_cdp_cmd('Page.setDownloadBehavior', {
+            'behavior': 'allow',
+            'downloadPath': download_path
+        })
+        # 设置页面加载策略，忽略SSL错误
+        driver.set_page_load_timeout(30)
+        driver.execute_cdp_cmd('Security.setIgnoreCertificateErrors', {'ignore': True})
+        return driver
 
     def setup_driver(self):
         """
-        [核心升级] 初始化并配置带有反检测功能的 Selenium WebDriver。
-        """
-        if self.driver is None:
-            print("🔧 Setting up Stealth Selenium WebDriver...")
-            chrome_options = Options()
-            # --- 其他常规配置 ---
-            chrome_options.add_argument("--start-maximized")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument('--disable-infobars')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            
-            # --- PDF下载设置 ---
-            # 使用undetected_chromedriver支持的方式设置首选项
-            download_path = os.path.abspath(self.save_directory)
-            chrome_options.add_argument(f"--download.default_directory={download_path}")
-            chrome_options.add_argument("--download.prompt_for_download=false")
-            chrome_options.add_argument("--plugins.always_open_pdf_externally=true")
-            
-            try:
-                # 使用undetected_chromedriver来更好地处理SSL和反检测
-                self.driver = webdriver.Chrome(service=Service('./undetected_chromedriver.exe'),options=chrome_options,driver_executable_path="./chromedriver.exe")
-                
-                # 初始化后立即设置下载行为
-                self.driver.execute_cdp_cmd('Page.setDownloadBehavior', {
-                    'behavior': 'allow',
-                    'downloadPath': download_path
-                })
-                
+        [核心升级] 初始化带有反检测功能的 Selenium 浏览器池。
+        池中有 num_drivers 个 Chrome 实例，每个实例使用独立的下载目录，ACM/IEEE 下载可以并行。
+        """
+        if self.driver_pool is None:
+            print(f"🔧 Setting up {self.num_drivers} Stealth Selenium WebDriver(s)...")
+            pool = DriverPool(
+                self._create_driver,
+                self.num_drivers,
+                os.path.join(self.save_directory, ".selenium_downloads"),
+            )
+            started = pool.start()
+            if started:
+                self.driver_pool = pool
+                self._selenium_executor = ThreadPoolExecutor(max_workers=started, thread_name_prefix="selenium")
                 print(
-                    "✅ Stealth Selenium WebDriver is ready. Please complete any necessary logins in the browser window.")
-            except Exception as e:
-                print(f"❌ Failed to set up Selenium WebDriver: {e}")
-                self.driver = None
+                    f"✅ {started} Stealth Selenium WebDriver(s) ready. Please complete any necessary logins in each browser window.")
+            else:
+                print("❌ Failed to set up Selenium WebDriver.")
 
     def teardown_driver(self):
         """
-        [公开方法] 关闭Selenium WebDriver。
+        [公开方法] 关闭浏览器池中的所有 Selenium WebDriver。
+        """
+        if self.driver_pool:
+            print("👋 Shutting down Selenium WebDriver(s).")
+            self.driver_pool.close()
+            self.driver_pool = None
+        if self._selenium_executor is not None:
+            self._selenium_executor.shutdown(wait=False, cancel_futures=True)
+            self._selenium_executor = None
+
+    def _get_session(self) -> httpx.AsyncClient:
+        """
+        返回爬虫持有的长连接 httpx 客户端，必要时在当前事件循环中创建。
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is not None and not self.session.is_closed and self._session_loop is loop:
+            return self.session
+
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("   [Warning] HTTP/2 requested but the 'h2' package is not installed; falling back to HTTP/1.1.")
+                http2 = False
+        # httpx 默认会声明 gzip/deflate（以及已安装的 br/zstd）压缩；关闭压缩时显式要求原始内容
+        headers = {} if self.compression else {'Accept-Encoding': 'identity'}
+        network = self.transport
+        if network is None:
+            network = httpx.AsyncHTTPTransport(limits=self.pool_limits, http2=http2)
+        # 指标传输层位于限速层之内，记录的延迟不包含令牌桶的排队时间；
+        # 容错层位于限速层之外，每次重试都重新排队取令牌
+        transport = ResilientTransport(
+            RateLimitedTransport(MetricsTransport(network, self.metrics), self.rate_limiter),
+            self.retry_policy, self.circuit_breakers, self.metrics,
+        )
+        self._session_transport = transport
+        self.session = httpx.AsyncClient(
+            timeout=self.timeout_config,
+            transport=transport,
+            headers=headers,
+            follow_redirects=True,
+        )
+        self._session_loop = loop
+        return self.session
+
+    def _handoff_session(self, cookies: list[dict]) -> httpx.AsyncClient:
+        """
+        为一次浏览器交接创建专用客户端：与共享客户端使用同一个传输层（连接池、限速、重试、熔断、指标），
+        但 cookie 罐独立，浏览器 cookies 在重定向链上按域名携带，出版商的 Set-Cookie 随该客户端一起丢弃。
+        用完后不要关闭它，关闭会连带关闭共享的传输层。
+        """
+        session = self._get_session()
+        return httpx.AsyncClient(
+            timeout=session.timeout,
+            transport=self._session_transport,
+            headers=session.headers,
+            cookies=browser_cookie_jar(cookies),
+            follow_redirects=True,
+        )
+
+    async def aclose(self):
+        """
+        [公开方法] 关闭共享的 httpx 客户端及其连接池。
+        """
+        if self.session is not None and not self.session.is_closed:
+            await self.session.aclose()
+        self.session = None
+        self._session_loop = None
+
+    def run_coroutine(self, coro):
+        """
+        [公开方法] 在爬虫自有的事件循环中运行协程并返回其结果，使共享客户端在多次同步调用之间保持连接。
+        同步代码需要驱动 aiter_downloads / aiter_jobs 等异步接口时使用；事件循环由 close() 关闭。
+        """
+        if self._loop is None or self._loop.is_closed():
+            if os.name == 'nt':
+                asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def close(self):
+        """
+        [公开方法] 关闭 Selenium 驱动、共享 httpx 客户端以及爬虫自有的事件循环。
         """
-        if self.driver:
-            print("👋 Shutting down Selenium WebDriver.")
-            self.driver.quit()
-            self.driver = None
+        self.teardown_driver()
+        if self.resolution_cache is not None:
+            self.resolution_cache.close()
+            self.resolution_cache = None
+        if self.proceedings_index is not None:
+            self.proceedings_index.close()
+            self.proceedings_index = None
+        if self.strategy_stats is not None:
+            self.strategy_stats.close()
+            self.strategy_stats = None
+        if self.job_store is not None:
+            if self._owns_job_store:
+                self.job_store.close()
+            self.job_store = None
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+            self.parse_pool = None
+        self.export_metrics()
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
+            self._metrics_server = None
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.aclose())
+            self._loop.close()
+        self._loop = None
+
+    def metrics_summary(self) -> dict:
+        """
+        [公开方法] 返回指标的 JSON 摘要：吞吐量，以及按策略、主机和会议分组的延迟、字节数、状态码和结果统计。
+        """
+        return self.metrics.summary()
+
+    def export_metrics(self):
+        """
+        [公开方法] 把指标写入配置的 JSON 摘要文件和 Prometheus 文本文件。
+        """
+        try:
+            if self.metrics_path:
+                self.metrics.write_json(self.metrics_path)
+            if self.prometheus_path:
+                self.metrics.write_prometheus(self.prometheus_path)
+        except OSError as e:
+            print(f"   [Warning] Failed to write metrics: {e}")
+        self._metrics_flushed_at = time.monotonic()
+
+    async def aindex_proceedings(self, conference: str, years: list[int], refresh: bool = False) -> int:
+        """
+        [公开方法] 下载会议论文集的列表页，为 CVF (CVPR/ICCV/WACV)、NeurIPS 和 AAAI 建立本地的
+        标题 -> PDF链接 索引。之后这些会议的论文查找直接命中索引，不再逐篇搜索站点。
+
+        Args:
+            conference (str): 会议名称，例如 "CVPR"。
+            years (list[int]): 需要索引的年份。
+            refresh (bool): 是否重新下载已经索引过的年份。
+
+        Returns:
+            int: 本次新写入索引的论文数量。
+        """
+        conf_key = conference.lower()
+        venue = PROCEEDINGS_INDEX_VENUES.get(conf_key)
+        if venue is None:
+            print(f"   [Warning] No proceedings listing available for conference '{conference}'.")
+            return 0
+        if self.proceedings_index is None:
+            print("   [Warning] Proceedings index is disabled, nothing to build.")
+            return 0
+        session = self._get_session()
+        total = 0
+        for year in years:
+            listing = f"{conference.upper()}{year}"
+            if not refresh and self.proceedings_index.is_indexed(listing):
+                print(f"   [Index] {listing} already indexed, skipping.")
+                continue
+            print(f"   [Index] Fetching proceedings listing for {listing}...")
+            try:
+                if venue == 'cvf':
+                    entries = await index_cvf(session, conf_key, year)
+                elif venue == 'neurips':
+                    entries = await index_neurips(session, year)
+                else:
+                    entries = await index_aaai(session, year)
+            except Exception as e:
+                print(f"   [Index] ❌ Failed to index {listing}: {e}")
+                continue
+            if not entries:
+                print(f"   [Index] 🟡 No papers found for {listing}.")
+                continue
+            await asyncio.to_thread(self.proceedings_index.add_listing, venue, listing, entries)
+            print(f"   [Index] ✅ Indexed {len(entries)} papers for {listing}.")
+            total += len(entries)
+        return total
+
+    def index_proceedings(self, conference: str, years: list[int], refresh: bool = False) -> int:
+        """
+        [公开方法] aindex_proceedings 的同步版本。
+        """
+        return self.run_coroutine(self.aindex_proceedings(conference, years, refresh=refresh))
+
+    def _parser_backend_for(self, strategy_key: str) -> str:
+        if isinstance(self.parser_backend, dict):
+            return self.parser_backend.get(strategy_key, "auto")
+        return self.parser_backend
 
     def _normalize_title(self, title: str) -> str:
-        return re.sub(r'\s+', ' ', re.sub(r'[^\w\s-]', ' ', title.lower())).strip()
+        return normalize_title(title)
 
     def _sanitize_filename(self, title: str) -> str:
-        return re.sub(r'[\\/*?:"<>|]', "_", title.strip())[:150] + ".pdf"
+        name = re.sub(r'[\\/*?:"<>|]', "_", title.strip())
+        if len(name) > 150:
+            # 截断后追加标题哈希，避免前150个字符相同的不同标题落到同一个文件
+            name = name[:141] + "_" + hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+        return name + ".pdf"
 
-    async def _process_single_paper(self, title: str, conference: str | None = None) -> str | None:
+    async def _process_single_paper(self, title: str, conference: str | None = None,
+                                    doi: str | None = None) -> str | None:
         if not title.strip(): return None
         original_title = title.strip()
         normalized_title = self._normalize_title(original_title)
+
+        # 1. 清单查询：同一标题的不同写法标准化后命中同一条记录；输入带 DOI 时，以其他标题下载过的同一论文也会命中
+        entry = self.manifest.get(normalized_title)
+        if self.manifest.is_complete(entry):
+            print(f"🟢 Already in manifest, skipping: {entry['path']}")
+            self.metrics.inc(PAPERS_SKIPPED_TOTAL)
+            return entry['path']
+        reused = await asyncio.to_thread(self._reuse_by_doi, normalized_title, doi)
+        if reused:
+            return reused
+
+        # 2. 同一标题正在被其他任务处理时，等待其结果
+        inflight = self._inflight.get(normalized_title)
+        if inflight is not None:
+            print(f"🟢 Already in progress, waiting: '{original_title}'")
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[normalized_title] = future
+        try:
+            result = await self._download_with_strategies(original_title, normalized_title, conference)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 等待者会收到同样的异常；这里标记为已读取，避免无人等待时告警
+            future.exception()
+            raise
+        finally:
+            del self._inflight[normalized_title]
+
+    def _reuse_by_doi(self, normalized_title: str, doi: str | None) -> str | None:
+        """
+        同一 DOI 的论文已经以其他标题下载且文件完整时，为当前标题追加一条指向该文件的清单记录并返回其路径；
+        否则返回 None。doi 可以是 DOI 本身或包含 DOI 的链接。
+        """
+        doi = extract_doi(doi) if doi else None
+        entry = self.manifest.find_by_doi(doi) if doi else None
+        if not self.manifest.is_complete(entry):
+            return None
+        print(f"🟢 DOI {doi} already downloaded as '{entry['title']}', skipping: {entry['path']}")
+        self.manifest.add({**entry, 'title': normalized_title, 'timestamp': time.time()})
+        self.metrics.inc(PAPERS_SKIPPED_TOTAL)
+        return entry['path']
+
+    async def _download_resolved(self, strategy, normalized_title: str, pdf_url: str, filepath: str,
+                                 conference: str | None) -> str | None:
+        """
+        下载阶段：查找得到的元数据带有已下载过的 DOI 时直接复用已有文件，否则下载并写入清单。
+        返回最终的文件路径，下载失败时返回 None。
+        """
+        reused = await asyncio.to_thread(self._reuse_by_doi, normalized_title, strategy.doi_for(pdf_url))
+        if reused:
+            return reused
+        await self._job_progress(normalized_title, DOWNLOADING)
+        if await strategy.download_resolved(normalized_title, pdf_url, filepath):
+            return await self._finalize_download(normalized_title, filepath, strategy, conference)
+        return None
+
+    async def _finalize_download(self, normalized_title: str, filepath: str, strategy, conference: str | None) -> str:
+        """下载成功后写入清单；内容与已有文件重复时返回已有文件的路径。"""
+        print(f"✅ [SUCCESS] Downloaded via strategy: {strategy.__class__.__name__}.")
+        self.metrics.inc(STRATEGY_SUCCESSES_TOTAL, conference=(conference or 'unspecified').lower(), strategy=strategy.name)
+        entry = await asyncio.to_thread(
+            self.manifest.record, normalized_title, filepath, strategy.name, getattr(strategy, 'last_doi', None),
+        )
+        return entry['path']
+
+    async def _download_with_strategies(self, original_title: str, normalized_title: str,
+                                        conference: str | None) -> str | None:
         filepath = os.path.join(self.save_directory, self._sanitize_filename(original_title))
-        print(filepath)
         if os.path.exists(filepath):
-            print(f"🟢 File already exists, skipping: {filepath}")
-            return filepath
+            # 清单之外的已有文件（例如旧版本下载的）：只有完整的PDF才视为已完成
+            if await asyncio.to_thread(is_pdf_file, filepath):
+                print(f"🟢 File already exists, adding to manifest and skipping: {filepath}")
+                entry = await asyncio.to_thread(self.manifest.record, normalized_title, filepath, 'existing')
+                return entry['path']
+            print(f"   [Warning] Existing file is not a complete PDF, downloading again: {filepath}")
 
         print(f"\n🚀 Starting download for: '{original_title}' (Conference: {conference or 'Unspecified'})")
 
         # --- 更健壮的策略调度逻辑 ---
-        async with httpx.AsyncClient(timeout=self.timeout_config, follow_redirects=True) as session:
-            
-            # 1. 构建所有可用的策略实例
-            httpx_strategies = {
-                'aaai': AaaiOjsDownloader(session, self.save_directory),
-                'neurips': NeuripsDownloader(session, self.save_directory),
-                'cvpr': CvfDownloader(session, self.save_directory),
-                'iccv': CvfDownloader(session, self.save_directory),
-                'arxiv': ArxivDownloader(session, self.save_directory),
-                'core': CoreDownloader(session, self.save_directory, self.core_api_key),
-            }
-            selenium_strategies = {}
-            if self.driver:
-                selenium_strategies['acm'] = AcmDlSeleniumDownloader(self.driver, self.save_directory)
-                selenium_strategies['ieee'] = IeeeSeleniumDownloader(self.driver, self.save_directory)
-            else:
-                 print("   [Warning] Selenium driver not available, skipping platform-specific strategies (ACM, IEEE).")
-
-            # 2. 定义包含所有通用后备策略的有序列表
-            all_fallback_strategies = []
-            all_fallback_strategies.extend([httpx_strategies['core']])
-            if 'acm' in selenium_strategies: all_fallback_strategies.append(selenium_strategies['acm'])
-            if 'ieee' in selenium_strategies: all_fallback_strategies.append(selenium_strategies['ieee'])
-            all_fallback_strategies.extend([httpx_strategies['arxiv']])
+        session = self._get_session()
+        
+        # 1. 构建所有可用的策略实例
+        httpx_strategies = {
+            'aaai': AaaiOjsDownloader(session, self.save_directory),
+            'neurips': NeuripsDownloader(session, self.save_directory),
+            'cvpr': CvfDownloader(session, self.save_directory),
+            'iccv': CvfDownloader(session, self.save_directory),
+            'arxiv': ArxivDownloader(session, self.save_directory),
+            'core': CoreDownloader(session, self.save_directory, self.core_api_key),
+        }
+        for key, strategy in httpx_strategies.items():
+            strategy.parser_backend = self._parser_backend_for(key)
+            strategy.resolution_cache = self.resolution_cache
+            strategy.proceedings_index = self.proceedings_index
+            strategy.parse_pool = self.parse_pool
+            strategy.metrics = self.metrics
+            strategy.max_pdf_size = self.max_pdf_size
+        for key, resolver in self._batch_resolvers.items():
+            httpx_strategies[key].batch_resolver = resolver
+        selenium_strategies = {}
+        if self.driver_pool:
+            selenium_strategies['acm'] = AcmDlSeleniumDownloader(self.driver_pool, self.save_directory)
+            selenium_strategies['ieee'] = IeeeSeleniumDownloader(self.driver_pool, self.save_directory)
+        else:
+             print("   [Warning] Selenium driver not available, skipping platform-specific strategies (ACM, IEEE).")
+
+        # 2. 定义包含所有通用后备策略的有序列表
+        all_fallback_strategies = []
+        all_fallback_strategies.extend([httpx_strategies['core']])
+        if 'acm' in selenium_strategies: all_fallback_strategies.append(selenium_strategies['acm'])
+        if 'ieee' in selenium_strategies: all_fallback_strategies.append(selenium_strategies['ieee'])
+        all_fallback_strategies.extend([httpx_strategies['arxiv']])
+        
+        # 3. 根据 conference 构建最终的策略队列
+        strategy_queue = []
+        primary_strategy = None
+        if conference:
+            conf_key = conference.lower()
+            source = CONFERENCE_TO_SOURCE_MAP.get(conf_key)
+            print(f"   [Info] Conference '{conference}' mapped to source: {source or 'Generic'}")
             
-            # 3. 根据 conference 构建最终的策略队列
-            strategy_queue = []
-            primary_strategy = None
-            if conference:
-                conf_key = conference.lower()
-                source = CONFERENCE_TO_SOURCE_MAP.get(conf_key)
-                print(f"   [Info] Conference '{conference}' mapped to source: {source or 'Generic'}")
-                
-                # 确定主要策略
-                if source == 'ieee' and 'ieee' in selenium_strategies:
-                    primary_strategy = selenium_strategies['ieee']
-                elif source == 'acm' and 'acm' in selenium_strategies:
-                    primary_strategy = selenium_strategies['acm']
-                elif source in httpx_strategies:
-                    primary_strategy = httpx_strategies[source]
-                
-                # 将主要策略放在首位
-                if primary_strategy:
-                    strategy_queue.append(primary_strategy)
-
-                # 添加所有不重复的后备策略
-                for fallback in all_fallback_strategies:
-                    if fallback is not primary_strategy:
-                        strategy_queue.append(fallback)
-            else:
-                # 如果没有指定会议，则使用完整的后备策略列表
-                print("   [Info] No conference specified. Trying all major platforms.")
-                strategy_queue = all_fallback_strategies
-
-            # 4. 按顺序执行策略队列
-            for strategy in strategy_queue:
-                print(f"   -> Trying strategy: {strategy.__class__.__name__}")
-                try:
-                    success = False
-                    # 判断策略是同步还是异步
-                    if asyncio.iscoroutinefunction(strategy.download):
-                        # 异步策略
-                        await asyncio.sleep(self.request_delay)
-                        if await strategy.download(normalized_title, filepath):
-                             success = True
-                    else:
-                        # 同步策略 (Selenium)
-                        if strategy.download(original_title, filepath):
-                            success = True
-                    
-                    if success:
-                        print(f"✅ [SUCCESS] Downloaded via strategy: {strategy.__class__.__name__}.")
-                        return filepath
-                except Exception as e:
-                    print(f"   [Error] Strategy {strategy.__class__.__name__} failed with error: {e}")
+            # 确定主要策略
+            if source == 'ieee' and 'ieee' in selenium_strategies:
+                primary_strategy = selenium_strategies['ieee']
+            elif source == 'acm' and 'acm' in selenium_strategies:
+                primary_strategy = selenium_strategies['acm']
+            elif source in httpx_strategies:
+                primary_strategy = httpx_strategies[source]
             
+            # 将主要策略放在首位
+            if primary_strategy:
+                strategy_queue.append(primary_strategy)
+
+            # 添加所有不重复的后备策略
+            for fallback in all_fallback_strategies:
+                if fallback is not primary_strategy:
+                    strategy_queue.append(fallback)
+        else:
+            # 如果没有指定会议，则使用完整的后备策略列表
+            print("   [Info] No conference specified. Trying all major platforms.")
+            strategy_queue = all_fallback_strategies
+
+        # 按历史统计调整顺序：期望成本最低（耗时短且成功率高）的策略先尝试
+        stats_key = conference.lower() if conference else ''
+        if self.adaptive_ordering and self.strategy_stats is not None:
+            strategy_queue = await self._rank_strategies(stats_key, strategy_queue, primary_strategy)
+        strategy_queue = self._skip_open_circuits(strategy_queue)
+
+        # 4. 执行策略队列：默认按顺序逐个尝试；开启 parallel_lookup 时，
+        #    相邻的 httpx 策略组成一组并行执行查找阶段，Selenium 策略仍按其优先级位置依次执行
+        index = 0
+        while index < len(strategy_queue):
+            strategy = strategy_queue[index]
+            if self.parallel_lookup and asyncio.iscoroutinefunction(strategy.download):
+                group = []
+                while index < len(strategy_queue) and asyncio.iscoroutinefunction(strategy_queue[index].download):
+                    group.append(strategy_queue[index])
+                    index += 1
+                path = await self._run_hedged(group, normalized_title, filepath, stats_key, conference)
+                if path:
+                    return path
+                continue
+
+            index += 1
+            print(f"   -> Trying strategy: {strategy.__class__.__name__}")
+            start = time.perf_counter()
+            path = None
+            try:
+                # 判断策略是同步还是异步
+                if asyncio.iscoroutinefunction(strategy.download):
+                    # 异步策略（限速由共享客户端的传输层按主机处理）
+                    pdf_url = await strategy.lookup(normalized_title)
+                    if pdf_url:
+                        path = await self._download_resolved(strategy, normalized_title, pdf_url, filepath, conference)
+                else:
+                    # 同步策略 (Selenium)，在线程池中执行
+                    path = await self._run_selenium_strategy(strategy, original_title, filepath, conference)
+            except Exception as e:
+                print(f"   [Error] Strategy {strategy.__class__.__name__} failed with error: {e}")
+            await self._record_attempt(stats_key, strategy, path is not None, time.perf_counter() - start)
+            if path:
+                return path
+        
         print(f"❌ [FAILURE] All strategies failed for: '{original_title}'")
         return None
 
-    def download_paper(self, title: str, conference: str | None = None) -> str | None:
-        if os.name == 'nt':
-            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    async def _job_progress(self, normalized_title: str, state: str):
+        """论文来自任务队列时，更新其任务状态。"""
+        job_id = self._job_ids.get(normalized_title)
+        if job_id is not None and self.job_store is not None:
+            await asyncio.to_thread(self.job_store.mark, job_id, state, self.worker_id)
+
+    def _skip_open_circuits(self, strategy_queue: list) -> list:
+        """去掉所访问主机正处于熔断中的策略，这些跳过不计入策略统计。"""
+        available = []
+        for strategy in strategy_queue:
+            open_hosts = [host for host in getattr(strategy, 'hosts', ()) if self.circuit_breakers.is_open(host)]
+            if open_hosts:
+                print(f"   -> [Strategy: {strategy.name}] 🟡 Skipped: circuit open for {', '.join(open_hosts)}.")
+                continue
+            available.append(strategy)
+        return available
+
+    async def _rank_strategies(self, stats_key: str, strategy_queue: list, primary_strategy) -> list:
+        """按策略统计中的期望成本重新排列策略队列，顺序有变化时打印新顺序。"""
+        kinds = [(strategy.name, 'httpx' if asyncio.iscoroutinefunction(strategy.download) else 'selenium')
+                 for strategy in strategy_queue]
+        primary = primary_strategy.name if primary_strategy else None
+        ranked = await asyncio.to_thread(self.strategy_stats.rank, stats_key, kinds, primary)
+        by_name = {strategy.name: strategy for strategy in strategy_queue}
+        reordered = [by_name[name] for name in ranked]
+        if reordered != strategy_queue:
+            print(f"   [Info] Adaptive strategy order: {' -> '.join(ranked)}")
+        return reordered
+
+    async def _record_attempt(self, stats_key: str, strategy, success: bool, seconds: float):
+        """
+        把一次策略尝试的结果写入策略统计。没有实际访问来源就失败的尝试（策略不可用、负缓存命中、
+        查找或下载时主机熔断中）耗时接近 0，会让失败的策略显得很便宜，因此不计入统计。
+        """
+        if self.strategy_stats is None:
+            return
+        transfer = getattr(strategy, 'last_transfer', None) or {}
+        if not success and (getattr(strategy, 'last_lookup', None) in OFFLINE_LOOKUP_OUTCOMES
+                            or transfer.get('outcome') == 'circuit_open'):
+            return
+        await asyncio.to_thread(self.strategy_stats.record, stats_key, strategy.name, success, seconds)
+
+    async def _call_selenium(self, strategy, method, *args):
+        """
+        在 Selenium 专用线程池中执行阻塞的浏览器操作，事件循环在此期间继续处理其他论文的 httpx 请求。
+        超过 selenium_timeout 或任务被取消时，通知策略在下一个等待点停止。
+        """
+        loop = asyncio.get_running_loop()
+        strategy.deadline = time.monotonic() + self.selenium_timeout
+        start = time.perf_counter()
+        future = loop.run_in_executor(self._selenium_executor, method, *args)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout=self.selenium_timeout)
+            self.metrics.inc(SELENIUM_CALLS_TOTAL, strategy=strategy.name, outcome='found' if result else 'not_found')
+            return result
+        except asyncio.TimeoutError:
+            print(f"   [Error] Strategy {strategy.__class__.__name__} exceeded {self.selenium_timeout:.0f}s, cancelling.")
+            strategy.cancel()
+            self.metrics.inc(SELENIUM_CALLS_TOTAL, strategy=strategy.name, outcome='timeout')
+            return None
+        except asyncio.CancelledError:
+            strategy.cancel()
+            raise
+        finally:
+            self.metrics.observe(SELENIUM_SECONDS, time.perf_counter() - start, strategy=strategy.name)
+
+    async def _run_selenium_strategy(self, strategy, original_title: str, filepath: str,
+                                     conference: str | None = None) -> str | None:
+        """
+        执行 Selenium 策略，返回最终的文件路径，失败时返回 None。混合模式下浏览器只负责查找PDF链接，
+        随后把 cookies 和 User-Agent 交给共享的 httpx 客户端完成传输；否则整个下载都在浏览器中完成。
+        """
+        normalized_title = self._normalize_title(original_title)
+        if not self.browser_handoff:
+            if await self._call_selenium(strategy, strategy.download, original_title, filepath):
+                return await self._finalize_download(normalized_title, filepath, strategy, conference)
+            return None
+
+        handoff = await self._call_selenium(strategy, strategy.resolve, original_title)
+        if not handoff:
+            return None
+        print(f"   -> [Strategy: {strategy.name}] Handing browser session off to httpx: {handoff.pdf_url}")
+        downloader = BrowserSessionDownloader(
+            self._handoff_session(handoff.cookies), self.save_directory, strategy.name,
+            handoff.pdf_url, handoff.user_agent, handoff.referer,
+        )
+        downloader.max_pdf_size = self.max_pdf_size
+        downloader.metrics = self.metrics
+        if handoff.doi:
+            downloader.resolved_dois[handoff.pdf_url] = handoff.doi
+        return await self._download_resolved(downloader, normalized_title, handoff.pdf_url, filepath, conference)
+
+    async def _run_hedged(self, strategies: list, normalized_title: str, filepath: str, stats_key: str = '',
+                          conference: str | None = None) -> str | None:
+        """
+        并行执行一组 httpx 策略的查找阶段，返回最终的文件路径，全部失败时返回 None。
+
+        查找按队列优先级依次启动：每隔 hedge_delay 秒追加启动下一个（为 0 时全部同时启动），
+        某个查找失败时立即启动下一个。首个解析出 PDF 链接的策略进入下载阶段，
+        同一时刻完成的多个查找按优先级处理；下载成功后取消其余仍在进行的查找，
+        下载失败则继续等待其他查找结果。被取消的查找不计入策略统计。
+        """
+        waiting = list(strategies)
+        running = {}
+        started_at = {}
+
+        def launch_next():
+            strategy = waiting.pop(0)
+            print(f"   -> Trying strategy: {strategy.__class__.__name__} (parallel lookup)")
+            running[asyncio.ensure_future(strategy.lookup(normalized_title))] = strategy
+            started_at[strategy] = time.perf_counter()
+
+        try:
+            launch_next()
+            while waiting and self.hedge_delay <= 0:
+                launch_next()
+            while running:
+                timeout = self.hedge_delay if waiting else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # 在 hedge_delay 内没有查找完成，追加启动下一个策略
+                    launch_next()
+                    continue
+                for task in sorted(done, key=lambda t: strategies.index(running[t])):
+                    strategy = running.pop(task)
+                    pdf_url = task.result()
+                    path = None
+                    if pdf_url:
+                        path = await self._download_resolved(strategy, normalized_title, pdf_url, filepath, conference)
+                    await self._record_attempt(stats_key, strategy, path is not None,
+                                               time.perf_counter() - started_at[strategy])
+                    if path:
+                        return path
+                    if waiting:
+                        launch_next()
+            return None
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def download_paper(self, title: str, conference: str | None = None, doi: str | None = None) -> str | None:
         try:
-            return asyncio.run(self._process_single_paper(title, conference))
+            return self.run_coroutine(self._process_single_paper(title, conference, doi))
         except Exception as e:
             print(f"An unexpected error occurred in the event loop for '{title}': {e}")
             return None
+
+    async def _download_one(self, paper: dict, semaphore: asyncio.Semaphore) -> dict:
+        """
+        在信号量限制下处理单篇论文，并返回该论文的结果记录。
+        """
+        title = paper["title"]
+        conference = paper.get("conference")
+        async with semaphore:
+            start = time.perf_counter()
+            filepath, error = None, None
+            try:
+                filepath = await self._process_single_paper(title, conference, paper.get("doi"))
+            except Exception as e:
+                error = repr(e)
+                print(f"An unexpected error occurred while processing '{title}': {e}")
+            elapsed = time.perf_counter() - start
+            self.metrics.observe(PAPER_SECONDS, elapsed)
+            self.metrics.inc(PAPERS_TOTAL, outcome='error' if error else 'downloaded' if filepath else 'failed')
+            if time.monotonic() - self._metrics_flushed_at >= self.metrics_flush_interval:
+                await asyncio.to_thread(self.export_metrics)
+            # 来源策略和文件大小取自清单记录（跳过的论文为首次下载时的来源）
+            entry = self.manifest.get(self._normalize_title(title)) if filepath else None
+            return {
+                "title": title,
+                "conference": conference,
+                "filepath": filepath,
+                "strategy": entry['source'] if entry else None,
+                "bytes": entry['size'] if entry else None,
+                "elapsed": elapsed,
+                "error": error,
+            }
+
+    def _open_batch_resolvers(self):
+        """批量模式下，并发论文对 arXiv 和 CORE 的查询被合并为少量 OR 组合查询。"""
+        if self._batch_resolvers:
+            return
+        session = self._get_session()
+        batch_downloaders = {'arxiv': ArxivDownloader(session, self.save_directory)}
+        if self.core_api_key:
+            batch_downloaders['core'] = CoreDownloader(session, self.save_directory, self.core_api_key)
+        for key, downloader in batch_downloaders.items():
+            downloader.parse_pool = self.parse_pool
+            self._batch_resolvers[key] = BatchResolver(downloader)
+
+    async def _close_batch_resolvers(self):
+        resolvers, self._batch_resolvers = self._batch_resolvers, {}
+        for resolver in resolvers.values():
+            await resolver.aclose()
+
+    async def adownload_many(self, papers: list[dict], max_concurrency: int = 8) -> list[dict]:
+        """
+        [公开方法] 在同一个事件循环中并发下载多篇论文。
+
+        Args:
+            papers (list[dict]): 论文列表，每项包含 "title" 和可选的 "conference"。
+            max_concurrency (int): 同时处理的论文数量上限。
+
+        Returns:
+            list[dict]: 与输入顺序一致的结果记录，包含 title、conference、filepath、strategy、bytes、elapsed 和 error。
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        if len(papers) > 1:
+            self._open_batch_resolvers()
+        try:
+            return await asyncio.gather(*(self._download_one(paper, semaphore) for paper in papers))
+        finally:
+            await self._close_batch_resolvers()
+            await asyncio.to_thread(self.export_metrics)
+
+    async def aiter_downloads(self, papers: Iterable[dict], max_concurrency: int = 8) -> AsyncIterator[dict]:
+        """
+        [公开方法] adownload_many 的流式版本：按需从 papers 中读取论文，每篇论文处理完成后立即产出其结果记录。
+        同一时刻只持有 max_concurrency 篇论文，内存占用与输入长度无关，papers 可以是逐行读取文件的生成器。
+        读取输入在线程中进行，输入来自管道且暂时没有数据时，已在处理的论文不受影响。
+
+        Yields:
+            dict: 与 adownload_many 相同的结果记录，按完成顺序产出。
+        """
+        limit = max(1, max_concurrency)
+        semaphore = asyncio.Semaphore(limit)
+        iterator = iter(papers)
+        end = object()
+        running: set[asyncio.Future] = set()
+        reader = None
+        exhausted = False
+        if limit > 1:
+            self._open_batch_resolvers()
+        try:
+            while True:
+                if reader is None and not exhausted and len(running) < limit:
+                    reader = asyncio.ensure_future(asyncio.to_thread(next, iterator, end))
+                waiting = running | {reader} if reader is not None else running
+                if not waiting:
+                    break
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if reader in done:
+                    paper, reader = reader.result(), None
+                    if paper is end:
+                        exhausted = True
+                    else:
+                        running.add(asyncio.ensure_future(self._download_one(paper, semaphore)))
+                for task in done & running:
+                    running.discard(task)
+                    yield task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            await self._close_batch_resolvers()
+            await asyncio.to_thread(self.export_metrics)
+
+    async def _renew_leases(self, running: dict[asyncio.Future, dict]):
+        """分布式模式下的心跳：每隔租约时长的三分之一为正在处理的任务续租。"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            job_ids = [job['id'] for job in running.values()]
+            try:
+                renewed = await asyncio.to_thread(self.job_store.renew, job_ids, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                print(f"   [Jobs] ⚠️ Failed to renew leases: {e}")
+                continue
+            if renewed < len(job_ids):
+                print(f"   [Jobs] 🟡 {len(job_ids) - renewed} lease(s) were taken over by other workers.")
+
+    def _require_job_store(self) -> JobStore:
+        """返回任务队列，第一次使用时才打开 job_store_path。"""
+        if self.job_store is None:
+            if not self.job_store_path:
+                raise RuntimeError("Job store is disabled (job_store_path=None).")
+            self.job_store = JobStore(self.job_store_path, **self._job_store_options)
+        return self.job_store
+
+    def enqueue(self, papers: Iterable[dict]) -> int:
+        """
+        [公开方法] 把论文加入持久化任务队列，已在队列中的标题被忽略。papers 可以是任意长的迭代器。
+
+        Returns:
+            int: 新加入的任务数量。
+        """
+        added = self._require_job_store().add(papers)
+        print(f"   [Jobs] ✅ Queued {added} new paper(s).")
+        return added
+
+    async def aiter_jobs(self, max_concurrency: int = 8, wait_for_retries: bool = False) -> AsyncIterator[dict]:
+        """
+        [公开方法] 从任务队列中领取论文并发处理，每篇论文处理完成后产出其结果记录。
+        开始时先把上次运行中断时仍在处理中的任务重新排队；成功的任务标记为 done，
+        失败的任务记录原因并按退避时间重新排队。
+        设置了 worker_id 时，多个工作进程（可以在不同主机上）共享同一个任务队列：
+        领取的任务带租约，由心跳定期续租；只重新排队本工作进程中断的任务，其他工作进程的任务等租约过期后再领取。
+
+        Args:
+            max_concurrency (int): 同时处理的论文数量上限。
+            wait_for_retries (bool): 队列中只剩等待退避的失败任务（或其他工作进程持有租约的任务）时，
+                是否等待它们重试或租约过期；否则直接结束。
+
+        Yields:
+            dict: adownload_many 的结果记录，另含任务的 state（done/failed）、attempts 和 will_retry。
+        """
+        job_store = self._require_job_store()
+        worker = self.worker_id
+        lease_seconds = self.lease_seconds if worker is not None else None
+        recovered = await asyncio.to_thread(job_store.recover, worker)
+        if recovered:
+            print(f"   [Jobs] 🟡 Resuming {recovered} paper(s) interrupted in the previous run.")
+        limit = max(1, max_concurrency)
+        semaphore = asyncio.Semaphore(limit)
+        running: dict[asyncio.Future, dict] = {}
+        heartbeat = asyncio.ensure_future(self._renew_leases(running)) if worker is not None else None
+        if limit > 1:
+            self._open_batch_resolvers()
+        try:
+            while True:
+                if len(running) < limit:
+                    claimed = await asyncio.to_thread(job_store.claim, limit - len(running), worker, lease_seconds)
+                    for job in claimed:
+                        self._job_ids[self._normalize_title(job['title'])] = job['id']
+                        running[asyncio.ensure_future(self._download_one(job, semaphore))] = job
+                if not running:
+                    retry_at = await asyncio.to_thread(job_store.next_retry_at)
+                    if retry_at is None or not wait_for_retries:
+                        break
+                    await asyncio.sleep(min(self.job_poll_interval, max(0.0, retry_at - time.time())))
+                    continue
+                # 有空闲名额时定期醒来，领取退避结束的任务
+                timeout = self.job_poll_interval if len(running) < limit else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    job = running.pop(task)
+                    self._job_ids.pop(self._normalize_title(job['title']), None)
+                    result = task.result()
+                    if result['filepath']:
+                        entry = self.manifest.get(self._normalize_title(job['title'])) or {}
+                        await asyncio.to_thread(
+                            job_store.complete, job['id'], result['filepath'], result['strategy'],
+                            result['bytes'], entry.get('sha256'), worker,
+                        )
+                        state, retry = DONE, False
+                    else:
+                        reason = result['error'] or 'All strategies failed'
+                        state, retry = FAILED, await asyncio.to_thread(job_store.fail, job['id'], reason, worker)
+                    yield {**result, 'state': state, 'attempts': job['attempts'], 'will_retry': retry}
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            for task, job in running.items():
+                task.cancel()
+                self._job_ids.pop(self._normalize_title(job['title']), None)
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+                if worker is not None:
+                    # 主动释放未完成任务的租约，其他工作进程无需等待租约过期
+                    await asyncio.to_thread(job_store.recover, worker)
+            await self._close_batch_resolvers()
+            await asyncio.to_thread(self.export_metrics)
+
+    def run_jobs(self, max_concurrency: int = 8, wait_for_retries: bool = False) -> dict[str, int]:
+        """
+        [公开方法] aiter_jobs 的同步版本：处理任务队列直到没有可领取的任务，返回各状态的任务数量。
+        """
+        async def drain():
+            async for _ in self.aiter_jobs(max_concurrency=max_concurrency, wait_for_retries=wait_for_retries):
+                pass
+        self.run_coroutine(drain())
+        return self.job_store.counts()
+
+    def download_many(self, papers: list[dict], max_concurrency: int = 8) -> list[dict]:
+        """
+        [公开方法] adownload_many 的同步版本，在爬虫自有的事件循环中运行整个批次。
+        """
+        return self.run_coroutine(self.adownload_many(papers, max_concurrency=max_concurrency))
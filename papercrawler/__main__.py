@@ -0,0 +1,203 @@
+# papercrawler/__main__.py
+"""
+命令行入口：从 CSV、JSONL 或 BibTeX 文件（或标准输入）流式读取论文，并发下载，
+每篇论文完成后立即向标准输出写一行 JSONL 结果：
+
+    {"title": ..., "conference": ..., "path": ..., "strategy": ..., "bytes": ..., "elapsed": ..., "error": ...}
+
+爬虫的进度日志写到标准错误，因此结果可以直接通过管道交给其他工具。
+使用 --queue 时，输入先写入保存目录下的持久化任务队列再处理，中断后重新运行即从中断处继续。示例：
+
+    python -m papercrawler papers.bib -d downloaded_papers -j 16 > results.jsonl
+    cat titles.jsonl | python -m papercrawler --quiet | jq 'select(.path == null)'
+    python -m papercrawler --queue huge.bib     # 中断后：python -m papercrawler --queue
+
+使用 --queue-url 时，多个工作进程（可以在不同主机上）共享同一个任务队列（Redis 或共享的 SQLite 文件）。
+每个工作进程领取的论文带租约并定期续租，工作进程退出后其论文在租约过期后由其他工作进程接手：
+
+    python -m papercrawler --queue-url redis://queue-host:6379/0 --enqueue-only huge.bib   # 协调者入队
+    python -m papercrawler --queue-url redis://queue-host:6379/0 -j 16 > worker-1.jsonl    # 每台主机一个或多个
+    python -m papercrawler --queue-url redis://queue-host:6379/0 --status                  # 查看进度
+    python -m papercrawler --queue-url redis://queue-host:6379/0 --export > results.jsonl  # 汇总结果
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+# paper_crawler、job_store 和 strategies 是仓库根目录下的模块，不随 papercrawler 包安装：
+# 把仓库根目录加入模块搜索路径，python -m papercrawler（PYTHONPATH 指向仓库根目录）
+# 或 python /path/to/PaperCrawler/papercrawler 在任意工作目录下都能运行
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from job_store import default_worker_id, open_job_store
+from paper_crawler import CORE_API_KEY, PaperCrawler
+from papercrawler.inputs import INPUT_FORMATS, read_papers
+
+
+def result_record(result: dict) -> dict:
+    """把 PaperCrawler 的结果记录转换为命令行输出的 JSONL 记录，来自任务队列的结果另含 attempts 和 will_retry。"""
+    record = {
+        "title": result["title"],
+        "conference": result["conference"],
+        "path": result["filepath"],
+        "strategy": result["strategy"],
+        "bytes": result["bytes"],
+        "elapsed": round(result["elapsed"], 3),
+        "error": result["error"],
+    }
+    if "attempts" in result:
+        record["attempts"] = result["attempts"]
+        record["will_retry"] = result["will_retry"]
+    return record
+
+
+def job_record(job: dict) -> dict:
+    """把任务队列中已结束的任务转换为 --export 输出的 JSONL 记录。"""
+    return {
+        "title": job["title"],
+        "conference": job["conference"],
+        "path": job["filepath"],
+        "strategy": job["strategy"],
+        "bytes": job["size"],
+        "sha256": job["sha256"],
+        "worker": job["worker"],
+        "attempts": job["attempts"],
+        "error": job["reason"] if job["state"] != "done" else None,
+    }
+
+
+async def _stream_results(results, output) -> tuple[int, int]:
+    """逐条写出结果，返回 (成功数, 失败数)。"""
+    downloaded = failed = 0
+    async for result in results:
+        output.write(json.dumps(result_record(result), ensure_ascii=False) + "\n")
+        output.flush()
+        if result["filepath"]:
+            downloaded += 1
+        else:
+            failed += 1
+    return downloaded, failed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m papercrawler", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("inputs", nargs="*", help="输入文件，'-' 表示标准输入；不指定时读取标准输入（--queue 时只处理队列）")
+    parser.add_argument("-f", "--format", choices=INPUT_FORMATS,
+                        help="输入格式；默认按扩展名判断（.csv/.jsonl/.bib），标准输入为 jsonl")
+    parser.add_argument("-o", "--output", help="结果 JSONL 文件（追加写入），默认写到标准输出")
+    parser.add_argument("-d", "--save-dir", default="downloaded_papers", help="PDF 保存目录")
+    parser.add_argument("-j", "--concurrency", type=int, default=8, help="同时处理的论文数量")
+    parser.add_argument("--core-api-key", default=os.environ.get("CORE_API_KEY", CORE_API_KEY), help="CORE API 密钥")
+    parser.add_argument("--selenium", action="store_true", help="启动浏览器池以使用 ACM/IEEE 策略")
+    parser.add_argument("--num-drivers", type=int, default=1, help="浏览器数量（需要 --selenium）")
+    parser.add_argument("--parallel-lookup", action="store_true", help="相邻的 httpx 策略并行查找")
+    parser.add_argument("--parse-workers", type=int, default=0, help="解析进程数")
+    parser.add_argument("--metrics-path", help="批次结束时写入的指标 JSON 文件（相对保存目录）")
+    parser.add_argument("--queue", action="store_true",
+                        help="通过保存目录下的持久化任务队列处理，中断后重新运行从中断处继续")
+    parser.add_argument("--max-attempts", type=int, default=3, help="任务队列中每篇论文最多尝试的次数")
+    parser.add_argument("--wait-retries", action="store_true", help="等待退避中的失败任务重试后再退出（需要 --queue）")
+    parser.add_argument("--queue-url",
+                        help="多个工作进程共享的任务队列（隐含 --queue）：redis://host:port/db?prefix=name，"
+                             "或 sqlite:///path/to/jobs.sqlite3（网络文件系统上加 ?journal_mode=DELETE）；"
+                             "工作进程会等待其他进程的租约过期和失败任务的重试，直到队列处理完毕")
+    parser.add_argument("--worker-id", help="工作进程标识，默认为 主机名:进程号（需要 --queue-url）")
+    parser.add_argument("--lease-seconds", type=float, default=300.0,
+                        help="任务租约时长（秒），工作进程失联超过该时间后其论文由其他工作进程接手")
+    parser.add_argument("--enqueue-only", action="store_true", help="只把输入加入任务队列，不处理")
+    parser.add_argument("--status", action="store_true", help="输出任务队列各状态的数量（JSON）后退出")
+    parser.add_argument("--export", action="store_true", help="输出任务队列中所有已结束任务的 JSONL 记录后退出")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出爬虫的进度日志")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.queue = args.queue or bool(args.queue_url)
+    inputs = args.inputs or ([] if args.queue else ["-"])
+    papers = read_papers(inputs, args.format)
+    job_store = None
+    if args.queue_url:
+        job_store = open_job_store(args.queue_url, max_attempts=args.max_attempts)
+        args.worker_id = args.worker_id or default_worker_id()
+        args.wait_retries = True
+    if args.status or args.export:
+        return _report(args, job_store)
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    # 标准输出只保留 JSONL 结果，爬虫的 print 日志改写到标准错误（--quiet 时丢弃）
+    log = open(os.devnull, "w") if args.quiet else sys.stderr
+    downloaded = failed = 0
+    try:
+        with contextlib.redirect_stdout(log):
+            crawler = PaperCrawler(
+                save_dir=args.save_dir,
+                core_api_key=args.core_api_key,
+                num_drivers=args.num_drivers,
+                parallel_lookup=args.parallel_lookup,
+                parse_workers=args.parse_workers,
+                metrics_path=args.metrics_path,
+                job_max_attempts=args.max_attempts,
+                job_store=job_store,
+                worker_id=args.worker_id,
+                lease_seconds=args.lease_seconds,
+            )
+            try:
+                if args.selenium:
+                    crawler.setup_driver()
+                if args.queue:
+                    crawler.enqueue(papers)
+                    if args.enqueue_only:
+                        return 0
+                    results = crawler.aiter_jobs(max_concurrency=args.concurrency, wait_for_retries=args.wait_retries)
+                else:
+                    results = crawler.aiter_downloads(papers, max_concurrency=args.concurrency)
+                downloaded, failed = crawler.run_coroutine(_stream_results(results, output))
+            except KeyboardInterrupt:
+                print("⚠️ Interrupted, shutting down.")
+                return 130
+            finally:
+                crawler.close()
+    finally:
+        if job_store is not None:
+            job_store.close()
+        if output is not sys.stdout:
+            output.close()
+        if log is not sys.stderr:
+            log.close()
+    print(f"Done: {downloaded} downloaded, {failed} failed.", file=sys.stderr)
+    return 0
+
+
+def _report(args, job_store) -> int:
+    """
+    --status / --export：只读取任务队列，不启动爬虫。未指定 --queue-url 时读取保存目录下的本地队列；
+    本地队列不存在时报错退出，不会为只读查询创建空的队列文件。
+    """
+    if job_store is None:
+        path = os.path.join(args.save_dir, ".jobs.sqlite3")
+        if not os.path.exists(path):
+            print(f"No job queue in {args.save_dir} (run with --queue first).", file=sys.stderr)
+            return 1
+        job_store = open_job_store(path, max_attempts=args.max_attempts)
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.status:
+            output.write(json.dumps(job_store.counts()) + "\n")
+        if args.export:
+            for job in job_store.finished():
+                output.write(json.dumps(job_record(job), ensure_ascii=False) + "\n")
+    finally:
+        job_store.close()
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
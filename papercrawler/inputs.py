@@ -0,0 +1,206 @@
+# papercrawler/inputs.py
+"""
+逐条读取论文列表的输入格式：CSV、JSONL 和 BibTeX。
+各读取函数都是生成器，每次只在内存中保留一行（BibTeX 为一个条目），可以处理任意大小的文件或标准输入。
+"""
+import csv
+import json
+import os
+import re
+import sys
+from typing import Iterator, TextIO
+
+INPUT_FORMATS = ('csv', 'jsonl', 'bibtex')
+
+_EXTENSION_FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.bib': 'bibtex',
+    '.bibtex': 'bibtex',
+}
+
+# BibTeX 的 booktitle/journal 多为会议全称：(正则, 会议键)，会议键与 CONFERENCE_TO_SOURCE_MAP 一致
+_VENUE_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), conference) for pattern, conference in (
+        (r'\bneurips\b|\bnips\b|neural information processing systems', 'neurips'),
+        (r'\bcvpr\b|computer vision and pattern recognition', 'cvpr'),
+        (r'\biccv\b|international conference on computer vision', 'iccv'),
+        (r'\bwacv\b|winter conference on applications of computer vision', 'wacv'),
+        (r'\baaai\b', 'aaai'),
+        (r'\bccs\b|computer and communications security', 'ccs'),
+        (r'\bs\s*&\s*p\b|symposium on security and privacy', 's&p'),
+        (r'\bwww\b|world wide web|the web conference', 'www'),
+    )
+]
+
+_FIELD_NAME = re.compile(r'\s*([\w\-:.]+)\s*=\s*')
+
+
+def _warn(message: str):
+    # 标准输出可能是结果流，警告写到标准错误
+    print(f"   [Warning] {message}", file=sys.stderr)
+
+
+def guess_conference(venue: str | None) -> str | None:
+    """从会议名称（缩写或全称）推断会议键，无法识别时返回 None。"""
+    if not venue:
+        return None
+    for pattern, conference in _VENUE_PATTERNS:
+        if pattern.search(venue):
+            return conference
+    return None
+
+
+def detect_format(path: str) -> str:
+    """按扩展名判断输入格式，无法判断时视为 JSONL。"""
+    return _EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower(), 'jsonl')
+
+
+def read_csv(stream: TextIO) -> Iterator[dict]:
+    """
+    读取带表头的 CSV。标题列名为 title，会议列名为 conference、venue 或 booktitle，可选的 DOI 列名为 doi（不区分大小写）。
+    """
+    reader = csv.reader(stream)
+    header = [name.strip().lower() for name in next(reader, [])]
+    if 'title' not in header:
+        _warn("CSV input has no 'title' column, skipping it.")
+        return
+    title_column = header.index('title')
+    conference_column = next((header.index(name) for name in ('conference', 'venue', 'booktitle') if name in header),
+                             None)
+    doi_column = header.index('doi') if 'doi' in header else None
+    for row in reader:
+        if len(row) <= title_column or not row[title_column].strip():
+            continue
+        venue = ''
+        if conference_column is not None and conference_column < len(row):
+            venue = row[conference_column].strip()
+        doi = row[doi_column].strip() if doi_column is not None and doi_column < len(row) else ''
+        yield {'title': row[title_column], 'conference': venue or None, 'doi': doi or None}
+
+
+def read_jsonl(stream: TextIO) -> Iterator[dict]:
+    """读取 JSONL：每行一个包含 title 和可选 conference、doi 的对象，或者一个标题字符串。"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            _warn(f"Skipping invalid JSON on line {line_number}: {e}")
+            continue
+        if isinstance(record, str):
+            record = {'title': record}
+        if not isinstance(record, dict) or not record.get('title'):
+            _warn(f"Skipping line {line_number} without a title.")
+            continue
+        yield {'title': record['title'], 'conference': record.get('conference') or record.get('venue'),
+               'doi': record.get('doi') or None}
+
+
+def _bibtex_fields(body: str) -> dict[str, str]:
+    """解析一个条目中 'key,' 之后的 name = value 字段，值可以是 {...}、"..." 或数字/宏名。"""
+    fields = {}
+    position = body.find(',') + 1
+    length = len(body)
+    while position < length:
+        match = _FIELD_NAME.match(body, position)
+        if match is None:
+            break
+        name, position = match.group(1).lower(), match.end()
+        if position < length and body[position] in '{"':
+            # 值一直延续到与开头配对的 '}'，或大括号之外的下一个 '"'
+            closing = '}' if body[position] == '{' else '"'
+            position += 1
+            start, depth = position, 0
+            while position < length:
+                char = body[position]
+                if char == closing and depth == 0:
+                    break
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                position += 1
+            value = body[start:position]
+            position += 1
+        else:
+            end = body.find(',', position)
+            end = length if end == -1 else end
+            value, position = body[position:end].strip(), end
+        fields[name] = value
+        comma = body.find(',', position)
+        if comma == -1:
+            break
+        position = comma + 1
+    return fields
+
+
+def _clean_bibtex(value: str) -> str:
+    """去掉 LaTeX 的保护大括号和常见转义。"""
+    value = re.sub(r'\\([&%$#_])', r'\1', value)
+    value = re.sub(r'\\[a-zA-Z]+\s*', '', value)
+    return ' '.join(value.replace('{', '').replace('}', '').split())
+
+
+def read_bibtex(stream: TextIO) -> Iterator[dict]:
+    """
+    逐条读取 BibTeX。条目可以跨多行，按大括号配对确定条目结束；@string/@comment/@preamble 被忽略。
+    会议由 booktitle 或 journal 推断，无法识别时为 None（使用后备策略）；doi 字段原样传给爬虫。
+    """
+    entry_type, lines, depth = None, [], 0
+    opening = closing = '{'
+    for line in stream:
+        if entry_type is None:
+            match = re.match(r'\s*@\s*(\w+)\s*([{(])', line)
+            if match is None:
+                continue
+            entry_type, lines, depth = match.group(1).lower(), [], 0
+            # 条目可以用 {...} 或 (...) 包围，只统计与开头相同的括号
+            opening = match.group(2)
+            closing = '}' if opening == '{' else ')'
+            line = line[match.end() - 1:]
+        lines.append(line)
+        depth += line.count(opening) - line.count(closing)
+        if depth > 0:
+            continue
+        text = ''.join(lines)
+        body = text[text.find(opening) + 1:text.rfind(closing)]
+        current_type, entry_type = entry_type, None
+        if current_type in ('string', 'comment', 'preamble'):
+            continue
+        fields = _bibtex_fields(body)
+        title = _clean_bibtex(fields.get('title', ''))
+        if not title:
+            _warn(f"Skipping BibTeX entry without a title: {body.split(',', 1)[0].strip()}")
+            continue
+        venue = _clean_bibtex(fields.get('booktitle') or fields.get('journal') or '')
+        doi = _clean_bibtex(fields.get('doi', ''))
+        yield {'title': title, 'conference': guess_conference(venue), 'doi': doi or None}
+
+
+READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+    'bibtex': read_bibtex,
+}
+
+
+def read_papers(paths: list[str], input_format: str | None = None) -> Iterator[dict]:
+    """
+    依次读取多个输入文件中的论文，'-' 表示标准输入。
+
+    Args:
+        paths (list[str]): 输入文件路径。
+        input_format (str): 强制使用的格式；为 None 时按扩展名判断，标准输入默认为 JSONL。
+    """
+    for path in paths:
+        fmt = input_format or ('jsonl' if path == '-' else detect_format(path))
+        if path == '-':
+            yield from READERS[fmt](sys.stdin)
+            continue
+        # newline='' 让 csv 模块正确处理字段中的换行
+        with open(path, encoding='utf-8', newline='') as stream:
+            yield from READERS[fmt](stream)
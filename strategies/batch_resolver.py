@@ -0,0 +1,64 @@
+# strategies/batch_resolver.py
+import asyncio
+
+# 批量查询中没能确定结果的标题（例如结果被分页上限截断），需要回退到单条查询
+UNDETERMINED = object()
+
+
+class BatchResolver:
+    """
+    合并并发论文对同一来源的查询。
+    各篇论文的策略实例把标题放入队列，后台任务每次取出一批，
+    用 downloader.resolve_many 发出一个组合查询，再把结果分发给各个等待者。
+    由于来源的限速，上一批查询等待期间新到的标题会自然地积累成下一批。
+    """
+
+    def __init__(self, downloader, batch_window: float = 0.5):
+        """
+        Args:
+            downloader (DownloadStrategy): 用于发出批量查询的下载器实例，需实现 resolve_many。
+            batch_window (float): 首个标题到达后等待更多标题加入同一批次的时间（秒）。
+        """
+        self.downloader = downloader
+        self.batch_window = batch_window
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._worker: asyncio.Task | None = None
+
+    async def resolve(self, normalized_title: str):
+        """
+        等待该标题所在批次的查询结果。
+
+        Returns:
+            PDF链接、None（确认未收录）或 UNDETERMINED（需要回退到单条查询）。
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(normalized_title, []).append(future)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+        return await future
+
+    async def _run(self):
+        name = self.downloader.name
+        while self._pending:
+            await asyncio.sleep(self.batch_window)
+            titles = self.downloader.split_batches(list(self._pending))[0]
+            waiters = {title: self._pending.pop(title) for title in titles}
+            print(f"   -> [Strategy: {name}] Batch lookup for {len(titles)} title(s)...")
+            try:
+                results = await self.downloader.resolve_many(titles)
+            except Exception as e:
+                print(f"   -> [Strategy: {name}] ❌ Batch lookup failed: {e}")
+                results = {}
+            for title, futures in waiters.items():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(results.get(title, UNDETERMINED))
+
+    async def aclose(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+        for futures in self._pending.values():
+            for future in futures:
+                future.cancel()
+        self._pending.clear()
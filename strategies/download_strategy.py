@@ -1,17 +1,73 @@
 # strategies/download_strategy.py
+import asyncio
 import httpx
 import aiofiles
+import json
 import os
+import re
+import time
 from abc import ABC, abstractmethod
+from urllib.parse import unquote
+
+from strategies.batch_resolver import UNDETERMINED
+from strategies.html_parsing import ParserBackend, get_parser
+from strategies.metrics import (
+    DOWNLOAD_BYTES_TOTAL, DOWNLOAD_SECONDS, DOWNLOADS_TOTAL, LOOKUP_SECONDS, LOOKUPS_TOTAL
+)
+from strategies.resilience import NO_RETRY_EXTENSION, CircuitOpenError
+from strategies.title_matching import DEFAULT_MATCH_THRESHOLD, BatchTitleMatcher, TitleMatcher, normalize_title
+
+PDF_MAGIC = b'%PDF-'
+PDF_TRAILER = b'%%EOF'
+# PDF 规范允许 %PDF- 之前有少量前导字节，因此在开头的这一段内查找魔数
+PDF_HEADER_WINDOW = 1024
+# 在文件末尾的这一段内查找 %%EOF（增量更新的PDF末尾可能有少量换行等字节）
+PDF_TRAILER_WINDOW = 2048
+# 默认的单个PDF大小上限（字节）
+DEFAULT_MAX_PDF_SIZE = 200 * 1024 * 1024
+# 没有实际访问来源就得到结果的查找（策略不可用、负缓存命中、主机熔断中），耗时不反映策略的成本
+OFFLINE_LOOKUP_OUTCOMES = frozenset({"unavailable", "cached_not_found", "circuit_open"})
+# DOI 的通用形式 10.<注册者编号>/<后缀>，例如 ACM 的 /doi/pdf/10.1145/... 或 doi.org 链接
+DOI_PATTERN = re.compile(r'\b10\.\d{4,9}/[^\s?#&"\'<>]+')
+
+
+def extract_doi(text: str | None) -> str | None:
+    """从URL或文本中提取 DOI，没有时返回 None。"""
+    match = DOI_PATTERN.search(unquote(text or ''))
+    if match is None:
+        return None
+    return match.group(0).rstrip('.,;)')
+
+
+class PdfValidationError(Exception):
+    """下载的内容不是有效的PDF：缺少 %PDF- 魔数或 %%EOF 结束标记，或超出大小上限。"""
 
 
 class DownloadStrategy(ABC):
     """
     下载策略的抽象基类 (Abstract Base Class)。
     所有具体的下载策略（如arXiv, CORE, AAAI, CVF）都应继承此类，
-    并实现 download 方法。
+    并实现 resolve_pdf_url 方法。下载过程分为两个阶段：
+    查找阶段（lookup）解析出PDF链接，下载阶段（_download_pdf_from_url）传输文件，
+    调度器可以并行执行多个策略的查找阶段。
     """
 
+    # 日志、缓存和下载清单中使用的来源名称
+    name = "Generic"
+    # 批量查询的限制：每次查询合并的标题数和查询串长度（仅对实现了 resolve_many 的策略有效）
+    batch_size = 20
+    max_query_length = 2000
+    # 搜索结果与目标标题的最低相似度，低于此值的候选在下载前即被拒绝
+    match_threshold = DEFAULT_MATCH_THRESHOLD
+    # 本地论文集索引 (ProceedingsIndex) 中对应的 venue，None 表示该来源没有索引
+    index_venue = None
+    # 查找阶段访问的主机；其中有主机的熔断器打开时，调度器直接跳过本策略
+    hosts: tuple[str, ...] = ()
+    # 单个PDF的大小上限（字节），调度器可以按实例覆盖
+    max_pdf_size = DEFAULT_MAX_PDF_SIZE
+    # HTML 解析后端（见 html_parsing.PARSER_BACKENDS），'auto' 使用已安装的最快后端，调度器可以按实例覆盖
+    parser_backend = "auto"
+
     def __init__(self, session: httpx.AsyncClient, save_dir: str):
         """
         初始化策略。
@@ -22,14 +78,186 @@ class DownloadStrategy(ABC):
         """
         self.session = session
         self.save_directory = save_dir
+        # 可选的持久化解析缓存 (ResolutionCache)，由调度器在构建策略后注入
+        self.resolution_cache = None
+        # 可选的 BatchResolver，批量模式下由调度器注入，用于合并并发论文的查询
+        self.batch_resolver = None
+        # 可选的本地论文集索引 (ProceedingsIndex)，由调度器注入，命中时无需任何网络请求
+        self.proceedings_index = None
+        # 可选的解析进程池 (ParsePool)，由调度器注入，用于把大页面的解析和大量候选的打分移出事件循环
+        self.parse_pool = None
+        # 可选的指标注册表 (MetricsRegistry)，由调度器注入，记录查找/下载的耗时与结果
+        self.metrics = None
+        # 最近一次下载的传输统计，由 _download_pdf_from_url 写入
+        self.last_transfer = None
+        # 最近一次查找的结果来源（见 _lookup），策略不可用时为 unavailable，由 lookup 写入
+        self.last_lookup = None
+        # 最近一次成功下载的论文的 DOI（能确定时），由 download_resolved 写入，调度器记入下载清单
+        self.last_doi = None
+        # 查找过程中从来源元数据得到的 DOI：PDF链接 -> DOI
+        self.resolved_dois: dict[str, str] = {}
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
 
+    @property
+    def parser(self) -> ParserBackend:
+        """本策略使用的 HTML 解析后端。"""
+        return get_parser(self.parser_backend)
+
+    async def _select_links(self, markup: bytes, selector: str, parse_only=None) -> list[tuple[str, str | None]]:
+        """用本策略的解析后端提取链接，配置了进程池时可能在工作进程中执行。"""
+        if self.parse_pool is not None:
+            return await self.parse_pool.select_links(self.parser_backend, markup, selector, parse_only)
+        return self.parser.select_links(markup, selector, parse_only=parse_only)
+
+    async def _best_match(self, normalized_title: str, candidates: list[tuple[str, str]]) -> str | None:
+        """从 (候选标题, 附带数据) 中选出与标题最相似且达到 match_threshold 的一个。"""
+        if self.parse_pool is not None:
+            return await self.parse_pool.best_match(normalized_title, candidates, self.match_threshold)
+        return TitleMatcher(normalized_title, self.match_threshold).best(candidates)
+
+    async def _batch_match(self, normalized_titles: list[str], candidates: list[tuple[str, str]],
+                           best: dict[str, tuple[float, str]]):
+        """把一页候选匹配到多个目标标题，原地更新各标题目前得分最高的 (得分, 附带数据)。"""
+        if self.parse_pool is None:
+            BatchTitleMatcher(normalized_titles, self.match_threshold).match(candidates, best)
+            return
+        matches = await self.parse_pool.batch_match(normalized_titles, candidates, self.match_threshold)
+        for title, match in matches.items():
+            if match[0] > best.get(title, (0.0, None))[0]:
+                best[title] = match
+
+    def doi_for(self, pdf_url: str) -> str | None:
+        """
+        PDF链接对应论文的 DOI：优先使用查找时从来源元数据得到的（批量模式下由 BatchResolver 的实例记录），
+        否则尝试从链接本身提取。
+        """
+        doi = self.resolved_dois.get(pdf_url)
+        if doi is None and self.batch_resolver is not None:
+            doi = self.batch_resolver.downloader.resolved_dois.get(pdf_url)
+        return doi or extract_doi(pdf_url)
+
+    def is_available(self) -> bool:
+        """
+        本策略当前是否可用（例如是否配置了所需的API Key）。
+        """
+        return True
+
     @abstractmethod
+    async def resolve_pdf_url(self, normalized_title: str) -> str | None:
+        """
+        查找阶段：在来源站点上搜索论文并解析出PDF链接。
+
+        Args:
+            normalized_title (str): 标准化后的论文标题。
+
+        Returns:
+            str | None: 找到的PDF链接；未找到时返回 None。网络等错误直接抛出，由 lookup 统一处理。
+        """
+        pass
+
+    def _query_clause(self, normalized_title: str) -> str:
+        """批量查询中单个标题对应的查询子句，由支持批量查询的策略覆盖。"""
+        return f'"{normalized_title}"'
+
+    def split_batches(self, normalized_titles: list[str]) -> list[list[str]]:
+        """按标题数和查询串长度把标题切分为多个批次。"""
+        batches, current, length = [], [], 0
+        for title in normalized_titles:
+            clause_length = len(self._query_clause(title)) + len(' OR ')
+            if current and (len(current) >= self.batch_size or length + clause_length > self.max_query_length):
+                batches.append(current)
+                current, length = [], 0
+            current.append(title)
+            length += clause_length
+        if current:
+            batches.append(current)
+        return batches
+
+    async def resolve_many(self, normalized_titles: list[str]) -> dict[str, str | None]:
+        """
+        批量查找：用一个组合查询解析多个标题。支持批量查询的策略需覆盖此方法。
+
+        Returns:
+            dict: 标准化标题 -> PDF链接（确认未找到时为 None）。无法确定结果的标题不在返回值中。
+        """
+        raise NotImplementedError
+
+    async def lookup(self, normalized_title: str) -> str | None:
+        """
+        查找阶段的统一入口：依次查询本地论文集索引和解析缓存，都未命中时执行 resolve_pdf_url 并写回缓存。
+        索引只收录已建立索引的会议年份，未命中不代表论文不存在，因此会继续在线查找。
+        捕获所有异常并记录日志，出错的查找不会写入负缓存。每次查找的耗时和结果来源记录到 metrics。
+        索引和缓存的 SQLite 读写在线程池中执行，不阻塞事件循环上的其他查找。
+        """
+        if not self.is_available():
+            self.last_lookup = "unavailable"
+            return None
+        start = time.perf_counter()
+        pdf_url, outcome = await self._lookup(normalized_title)
+        self.last_lookup = outcome
+        if self.metrics is not None:
+            self.metrics.observe(LOOKUP_SECONDS, time.perf_counter() - start, strategy=self.name)
+            self.metrics.inc(LOOKUPS_TOTAL, strategy=self.name, outcome=outcome)
+        return pdf_url
+
+    async def _lookup(self, normalized_title: str) -> tuple[str | None, str]:
+        """返回 (PDF链接, 结果来源)，来源为 index、cached、cached_not_found、found、not_found、circuit_open 或 error。"""
+        if self.proceedings_index is not None and self.index_venue:
+            pdf_url = await asyncio.to_thread(self.proceedings_index.lookup, self.index_venue, normalized_title)
+            if pdf_url:
+                print(f"   -> [Strategy: {self.name}] ✅ Resolved from proceedings index: {pdf_url}")
+                return pdf_url, "index"
+        if self.resolution_cache is not None:
+            hit, pdf_url = await asyncio.to_thread(self.resolution_cache.get, normalized_title, self.name)
+            if hit:
+                if pdf_url:
+                    print(f"   -> [Strategy: {self.name}] ✅ Resolved from cache: {pdf_url}")
+                    return pdf_url, "cached"
+                print(f"   -> [Strategy: {self.name}] 🟡 Paper not found (cached).")
+                return None, "cached_not_found"
+        print(f"   -> [Strategy: {self.name}] Trying to find and download...")
+        try:
+            pdf_url = UNDETERMINED
+            if self.batch_resolver is not None:
+                pdf_url = await self.batch_resolver.resolve(normalized_title)
+                if pdf_url is None:
+                    print(f"   -> [Strategy: {self.name}] 🟡 Paper not found (batch lookup).")
+            if pdf_url is UNDETERMINED:
+                pdf_url = await self.resolve_pdf_url(normalized_title)
+        except CircuitOpenError as e:
+            print(f"   -> [Strategy: {self.name}] 🟡 Skipped: {e}")
+            return None, "circuit_open"
+        except Exception as e:
+            print(f"   -> [Strategy: {self.name}] ❌ An error occurred: {e}")
+            return None, "error"
+        if self.resolution_cache is not None:
+            await asyncio.to_thread(self.resolution_cache.put, normalized_title, self.name, pdf_url)
+        return pdf_url, "found" if pdf_url else "not_found"
+
+    async def download_resolved(self, normalized_title: str, pdf_url: str, filepath: str) -> bool:
+        """
+        下载阶段：下载查找阶段得到的PDF链接。下载失败时使缓存的链接失效，下次重新查找。
+        """
+        start = time.perf_counter()
+        self.last_doi = None
+        success = await self._download_pdf_from_url(pdf_url, filepath)
+        if self.metrics is not None:
+            transfer = self.last_transfer or {}
+            self.metrics.observe(DOWNLOAD_SECONDS, time.perf_counter() - start, strategy=self.name)
+            self.metrics.inc(DOWNLOADS_TOTAL, strategy=self.name, outcome=transfer.get('outcome', 'error'))
+            self.metrics.inc(DOWNLOAD_BYTES_TOTAL, transfer.get('bytes', 0), strategy=self.name)
+        if success:
+            self.last_doi = self.doi_for(pdf_url)
+            return True
+        if self.resolution_cache is not None:
+            await asyncio.to_thread(self.resolution_cache.invalidate, normalized_title, self.name)
+        return False
+
     async def download(self, normalized_title: str, filepath: str) -> bool:
         """
-        尝试使用本策略下载论文。
+        尝试使用本策略下载论文：先解析PDF链接，再下载文件。
 
         Args:
             normalized_title (str): 标准化后的论文标题。
@@ -38,30 +266,191 @@ class DownloadStrategy(ABC):
         Returns:
             bool: 如果下载成功则返回 True，否则返回 False。
         """
-        pass
+        pdf_url = await self.lookup(normalized_title)
+        if not pdf_url:
+            return False
+        return await self.download_resolved(normalized_title, pdf_url, filepath)
+
+    def _discard_partial(self, part_path: str):
+        """删除未完成的 .part 文件及其续传元数据。"""
+        for path in (part_path, part_path + '.json'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _part_has_pdf_header(self, part_path: str) -> bool:
+        """续传前检查已有的 .part 文件是否以PDF头开始，避免在错误的数据后面继续追加。"""
+        try:
+            with open(part_path, 'rb') as f:
+                return PDF_MAGIC in f.read(PDF_HEADER_WINDOW)
+        except OSError:
+            return False
 
-    async def _download_pdf_from_url(self, pdf_url: str, filepath: str) -> bool:
+    def _part_has_pdf_trailer(self, part_path: str) -> bool:
+        """检查 .part 文件末尾附近是否有 %%EOF 结束标记，缺失说明文件被截断。"""
+        try:
+            with open(part_path, 'rb') as f:
+                f.seek(max(0, os.path.getsize(part_path) - PDF_TRAILER_WINDOW))
+                return PDF_TRAILER in f.read()
+        except OSError:
+            return False
+
+    async def _stream_to_part(self, pdf_url: str, part_path: str, transfer: dict, retry: bool = True):
+        """
+        把PDF流式写入 .part 文件。如果已有同一URL的部分数据，且服务器提供了 ETag/Last-Modified，
+        则使用 Range + If-Range 请求从断点续传；资源已变化时服务器返回完整内容，从头写入。
+        retry 为 False 时传输层不重试该请求（续传循环自己计数）。收到响应头后 transfer['status'] 记录状态码。
+
+        不依赖 Content-Type 判断内容：开头的数据在写入前先检查 %PDF- 魔数，不是PDF时读取约 1KB 后即中止；
+        Content-Length 或已接收的数据超过 max_pdf_size 时中止；传输结束后检查 %%EOF 结束标记。
+        已接收的字节数累加到 transfer['bytes']。
+
+        Raises:
+            PdfValidationError: 内容不是PDF、超出大小上限或缺少结束标记。
+            httpx.TransportError: 网络错误或连接提前关闭，.part 文件保留以便续传。
+        """
+        meta_path = part_path + '.json'
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if offset and not self._part_has_pdf_header(part_path):
+            print("      [Downloader] 🟡 Existing partial file is not a PDF, restarting download.")
+            self._discard_partial(part_path)
+            offset = 0
+        meta = {}
+        if offset and os.path.exists(meta_path):
+            try:
+                async with aiofiles.open(meta_path, 'r') as f:
+                    meta = json.loads(await f.read())
+            except (OSError, ValueError):
+                meta = {}
+        validator = meta.get('etag') or meta.get('last_modified')
+
+        headers = dict(self.headers)
+        if offset and meta.get('url') == pdf_url and validator:
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = validator
+        else:
+            offset = 0
+
+        transfer['status'] = None
+        extensions = None if retry else {NO_RETRY_EXTENSION: True}
+        async with self.session.stream('GET', pdf_url, headers=headers, follow_redirects=True,
+                                       extensions=extensions) as response:
+            transfer['status'] = response.status_code
+            if response.status_code == 416:
+                # 断点超出了资源范围，说明 .part 已失效，从头下载
+                self._discard_partial(part_path)
+                raise httpx.TransportError("Range not satisfiable, restarting download")
+            response.raise_for_status()
+
+            content_type = response.headers.get('content-type', '').lower()
+            resumed = response.status_code == 206 and offset > 0
+            if resumed:
+                print(f"      [Downloader] Resuming download at byte {offset}.")
+            else:
+                offset = 0
+            transfer['resumed_from'] = offset
+
+            expected = response.headers.get('content-length')
+            if expected is not None and 'content-encoding' not in response.headers \
+                    and offset + int(expected) > self.max_pdf_size:
+                raise PdfValidationError(f"File too large ({offset + int(expected)} bytes, limit {self.max_pdf_size})")
+
+            # 仅在服务器支持范围请求且提供了强校验器时记录续传元数据
+            etag = response.headers.get('etag')
+            if etag and etag.startswith('W/'):
+                etag = None
+            last_modified = response.headers.get('last-modified')
+            supports_range = resumed or response.headers.get('accept-ranges', '').lower() == 'bytes'
+            if supports_range and (etag or last_modified):
+                async with aiofiles.open(meta_path, 'w') as f:
+                    await f.write(json.dumps({'url': pdf_url, 'etag': etag, 'last_modified': last_modified}))
+            elif os.path.exists(meta_path):
+                os.remove(meta_path)
+
+            written = 0
+            # 从头下载时先缓存开头的数据，确认 %PDF- 魔数后才写入文件；续传时文件头已在上面检查过
+            head = None if resumed else b''
+            async with aiofiles.open(part_path, 'ab' if resumed else 'wb') as f:
+                async for chunk in response.aiter_bytes():
+                    transfer['bytes'] += len(chunk)
+                    if head is not None:
+                        head += chunk
+                        if PDF_MAGIC not in head:
+                            if len(head) < PDF_HEADER_WINDOW:
+                                continue
+                            raise PdfValidationError(
+                                f"Response is not a PDF (Content-Type: {content_type or 'missing'}, starts with {head[:16]!r})")
+                        chunk, head = head, None
+                    written += len(chunk)
+                    if offset + written > self.max_pdf_size:
+                        raise PdfValidationError(f"File exceeds size limit of {self.max_pdf_size} bytes")
+                    await f.write(chunk)
+            if head is not None:
+                # 响应在 1KB 之内就结束了，且其中没有 %PDF- 魔数
+                raise PdfValidationError(
+                    f"Response is not a PDF (Content-Type: {content_type or 'missing'}, starts with {head[:16]!r})")
+            if expected is not None and 'content-encoding' not in response.headers and written < int(expected):
+                raise httpx.TransportError(f"Connection closed after {offset + written} bytes")
+        if not self._part_has_pdf_trailer(part_path):
+            raise PdfValidationError("Missing %%EOF trailer, file is truncated or corrupt")
+
+    async def _download_pdf_from_url(self, pdf_url: str, filepath: str, max_resume_attempts: int = 3) -> bool:
         """
         一个通用的辅助函数，用于从给定的URL异步下载PDF文件。
         所有子类都可以复用这个函数。
+
+        数据先写入 filepath + '.part'，完整接收并通过PDF校验后才原子地重命名为 filepath，
+        因此中途失败或崩溃不会留下被误认为已完成的文件。传输中途中断时保留 .part 并尝试断点续传，
+        最多重试 max_resume_attempts 次；本次调用仍失败时，之后对同一URL的下载会从断点继续。
+        收到响应头之前的失败已由传输层（ResilientTransport）重试过，不再续传；续传请求也不经传输层重试，
+        因此一次下载最多发出 1 + 传输层重试次数 + max_resume_attempts 个请求。
+        每次调用的传输统计（接收字节数、耗时、尝试次数等）保存在 self.last_transfer 中。
         """
+        part_path = filepath + '.part'
+        # outcome: success、invalid_pdf（内容校验失败）、interrupted（网络中断，.part 保留）、
+        # circuit_open（主机熔断中，.part 保留）或 error
+        transfer = {'url': pdf_url, 'status': None, 'bytes': 0, 'size': 0, 'resumed_from': 0,
+                    'elapsed': 0.0, 'attempts': 0, 'outcome': 'error', 'error': None}
+        self.last_transfer = transfer
+        start = time.perf_counter()
+        print(f"      [Downloader] Attempting to download from: {pdf_url}")
         try:
-            print(f"      [Downloader] Attempting to download from: {pdf_url}")
-            async with self.session.stream('GET', pdf_url, headers=self.headers, follow_redirects=True) as response:
-                response.raise_for_status()
-
-                content_type = response.headers.get('content-type', '').lower()
-                if 'application/pdf' not in content_type:
-                    print(f"      [Downloader] ❌ Failed: URL did not point to a PDF. Content-Type: {content_type}")
+            for attempt in range(max_resume_attempts + 1):
+                transfer['attempts'] = attempt + 1
+                try:
+                    await self._stream_to_part(pdf_url, part_path, transfer, retry=attempt == 0)
+                    os.replace(part_path, filepath)
+                    if os.path.exists(part_path + '.json'):
+                        os.remove(part_path + '.json')
+                    transfer['size'] = os.path.getsize(filepath)
+                    transfer['outcome'] = 'success'
+                    elapsed = time.perf_counter() - start
+                    print(f"      [Downloader] ✅ Successfully saved to: {filepath} "
+                          f"({transfer['size'] / 1024:.0f} KB, {transfer['bytes'] / 1024:.0f} KB received in {elapsed:.1f}s)")
+                    return True
+                except PdfValidationError as e:
+                    print(f"      [Downloader] ❌ Rejected download from {pdf_url}: {e} "
+                          f"(aborted after {transfer['bytes']} bytes)")
+                    transfer['outcome'], transfer['error'] = 'invalid_pdf', str(e)
+                    self._discard_partial(part_path)
                     return False
-
-                async with aiofiles.open(filepath, 'wb') as f:
-                    async for chunk in response.aiter_bytes():
-                        await f.write(chunk)
-                print(f"      [Downloader] ✅ Successfully saved to: {filepath}")
-                return True
-        except Exception as e:
-            print(f"      [Downloader] ❌ Download failed from {pdf_url}: {repr(e)}")
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            return False
\ No newline at end of file
+                except CircuitOpenError as e:
+                    print(f"      [Downloader] 🟡 Download skipped from {pdf_url}: {e} (partial data kept for resume)")
+                    transfer['outcome'], transfer['error'] = 'circuit_open', str(e)
+                    return False
+                except httpx.TransportError as e:
+                    transfer['outcome'], transfer['error'] = 'interrupted', repr(e)
+                    # 第一次请求在收到响应头之前失败：传输层已经重试过，不再续传
+                    mid_body = transfer['status'] is not None or attempt > 0
+                    if mid_body and attempt < max_resume_attempts:
+                        print(f"      [Downloader] 🟡 Transfer interrupted ({repr(e)}), retrying ({attempt + 1}/{max_resume_attempts})...")
+                        continue
+                    print(f"      [Downloader] ❌ Download failed from {pdf_url}: {repr(e)} (partial data kept for resume)")
+                    return False
+                except Exception as e:
+                    transfer['outcome'], transfer['error'] = 'error', repr(e)
+                    print(f"      [Downloader] ❌ Download failed from {pdf_url}: {repr(e)}")
+                    self._discard_partial(part_path)
+                    return False
+            return False
+        finally:
+            transfer['elapsed'] = time.perf_counter() - start
@@ -0,0 +1,85 @@
+# strategies/download_watcher.py
+import os
+import threading
+import time
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog 已列入 requirements.txt；未按 requirements.txt 安装时退回到轮询
+    FileSystemEventHandler = object
+    Observer = None
+
+# 浏览器下载过程中使用的临时文件后缀
+TEMP_SUFFIXES = ('.crdownload', '.tmp', '.part')
+
+
+class _WakeUpHandler(FileSystemEventHandler):
+    """目录中发生任何文件事件时唤醒等待者。"""
+
+    def __init__(self, event: threading.Event):
+        super().__init__()
+        self._event = event
+
+    def on_any_event(self, event):
+        self._event.set()
+
+
+class DownloadWatcher:
+    """
+    监视单次下载专用的暂存目录，等待浏览器完成下载。
+
+    暂存目录中只会出现本次下载的文件，因此检测结果一定属于这次下载，并发下载不会互相误认；
+    每次检查也只需要列出这个几乎为空的目录。Chrome 在下载完成时才把 .crdownload 重命名为最终文件名，
+    所以出现非临时文件即表示下载完成，不需要再额外等待。
+    requirements.txt 包含 watchdog，安装后使用 inotify 等文件系统事件即时唤醒；
+    未安装 watchdog 时退回到每 poll_interval（默认 0.25）秒轮询一次。
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 0.25):
+        self.directory = directory
+        self.poll_interval = poll_interval
+
+    def completed_file(self) -> str | None:
+        """返回已完成下载的文件路径；仍在下载或尚未开始时返回 None。"""
+        entries = [name for name in os.listdir(self.directory) if not name.startswith('.')]
+        if not entries or any(name.endswith(TEMP_SUFFIXES) for name in entries):
+            return None
+        return os.path.join(self.directory, entries[0])
+
+    def wait(self, timeout: float, check_cancelled=None) -> str | None:
+        """
+        等待下载完成。
+
+        Args:
+            timeout (float): 最长等待时间（秒）。
+            check_cancelled (Callable): 可选的取消检查函数，需要取消时抛出异常。
+
+        Returns:
+            str | None: 下载完成的文件路径，超时返回 None。
+        """
+        wake_up = threading.Event()
+        observer = None
+        if Observer is not None:
+            observer = Observer()
+            observer.schedule(_WakeUpHandler(wake_up), self.directory, recursive=False)
+            observer.start()
+        # 有文件系统事件时只需偶尔醒来检查取消标记
+        interval = 1.0 if observer is not None else self.poll_interval
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                path = self.completed_file()
+                if path:
+                    return path
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                if check_cancelled is not None:
+                    check_cancelled()
+                wake_up.wait(min(interval, remaining))
+                wake_up.clear()
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
@@ -0,0 +1,132 @@
+# strategies/driver_pool.py
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from selenium.common.exceptions import WebDriverException
+
+
+@dataclass
+class DriverLease:
+    """从驱动池借出的一个浏览器实例及其专属下载目录。"""
+    driver: Any
+    download_directory: str
+    index: int
+    broken: bool = False
+
+
+class DriverPool:
+    """
+    Selenium 浏览器池。
+    池中有 size 个 Chrome 实例，每个实例使用独立的下载目录，因此并发下载不会互相混淆。
+    Selenium 策略通过 lease() 借出一个实例，用完后归还；归还时发现浏览器已崩溃则关闭并重建。
+    """
+
+    def __init__(self, factory: Callable[[str], Any], size: int, download_root: str):
+        """
+        Args:
+            factory (Callable[[str], Chrome]): 根据下载目录创建并配置浏览器的函数，失败时抛出异常。
+            size (int): 浏览器实例数量。
+            download_root (str): 各实例下载目录的父目录。
+        """
+        self.factory = factory
+        self.size = max(1, size)
+        self.download_root = download_root
+        self._idle: queue.Queue[DriverLease] = queue.Queue()
+        self._leases: list[DriverLease] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> int:
+        """创建所有浏览器实例，返回成功启动的数量。"""
+        for index in range(self.size):
+            download_directory = os.path.join(self.download_root, f"driver-{index}")
+            os.makedirs(download_directory, exist_ok=True)
+            try:
+                lease = DriverLease(self.factory(download_directory), download_directory, index)
+            except Exception as e:
+                print(f"❌ Failed to start browser #{index}: {e}")
+                continue
+            self._leases.append(lease)
+            self._idle.put(lease)
+        return len(self._leases)
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def _is_alive(self, lease: DriverLease) -> bool:
+        try:
+            lease.driver.current_window_handle
+            return True
+        except WebDriverException:
+            return False
+
+    def _replace(self, lease: DriverLease) -> DriverLease | None:
+        """关闭已崩溃的浏览器，并在同一下载目录上创建新的实例。"""
+        print(f"   [DriverPool] Browser #{lease.index} is unresponsive, restarting it...")
+        try:
+            lease.driver.quit()
+        except Exception:
+            pass
+        try:
+            replacement = DriverLease(self.factory(lease.download_directory), lease.download_directory, lease.index)
+        except Exception as e:
+            print(f"   [DriverPool] ❌ Failed to restart browser #{lease.index}: {e}")
+            with self._lock:
+                if lease in self._leases:
+                    self._leases.remove(lease)
+            return None
+        with self._lock:
+            if lease in self._leases:
+                self._leases[self._leases.index(lease)] = replacement
+        return replacement
+
+    def checkout(self, timeout: float | None = None) -> DriverLease:
+        """借出一个空闲的浏览器，没有空闲实例时阻塞等待；超时抛出 queue.Empty。"""
+        if not self._leases:
+            raise RuntimeError("Driver pool has no running browsers")
+        return self._idle.get(timeout=timeout)
+
+    def checkin(self, lease: DriverLease):
+        """归还浏览器；已崩溃的实例会被重建后再放回池中。"""
+        if self._closed:
+            # 池已关闭，借出期间的浏览器在归还时直接退出
+            try:
+                lease.driver.quit()
+            except Exception:
+                pass
+            return
+        if lease.broken or not self._is_alive(lease):
+            lease = self._replace(lease)
+            if lease is None:
+                return
+        lease.broken = False
+        self._idle.put(lease)
+
+    @contextmanager
+    def lease(self, timeout: float | None = None):
+        """借出一个浏览器的上下文管理器，退出时自动归还。"""
+        lease = self.checkout(timeout)
+        try:
+            yield lease
+        except WebDriverException:
+            lease.broken = True
+            raise
+        finally:
+            self.checkin(lease)
+
+    def close(self):
+        """关闭池中所有浏览器。"""
+        with self._lock:
+            self._closed = True
+            leases, self._leases = self._leases, []
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for lease in leases:
+            try:
+                lease.driver.quit()
+            except Exception:
+                pass
@@ -0,0 +1,120 @@
+# strategies/html_parsing.py
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:  # selectolax 是可选依赖
+    SelectolaxHTMLParser = None
+
+try:
+    import lxml.html
+    import cssselect  # noqa: F401  lxml 的 CSS 选择器需要 cssselect
+except ImportError:  # lxml 是可选依赖
+    lxml = None
+
+
+class ParserBackend:
+    """
+    从HTML页面中提取链接的解析后端。策略只需要页面中的少量链接，
+    因此接口只有一个 select_links：按 CSS 选择器返回匹配元素的 (文本, href)。
+    """
+
+    name = "base"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    def select_links(self, markup: str | bytes, selector: str,
+                     parse_only: str | list[str] | None = None) -> list[tuple[str, str | None]]:
+        """
+        Args:
+            markup (str | bytes): HTML 页面内容。
+            selector (str): CSS 选择器，只能引用 parse_only 指定的标签及其内部的元素。
+            parse_only (str | list[str]): 提示解析器只需保留的标签，SoupStrainer 后端据此跳过页面的其余部分。
+
+        Returns:
+            list[tuple[str, str | None]]: 按文档顺序排列的 (元素文本, href 属性)。
+        """
+        raise NotImplementedError
+
+
+class SoupBackend(ParserBackend):
+    """完整解析整个页面的 BeautifulSoup ('html.parser')，兼容性最好，也最慢。"""
+
+    name = "bs4"
+
+    def select_links(self, markup, selector, parse_only=None):
+        soup = BeautifulSoup(markup, 'html.parser')
+        return [(node.get_text(" ", strip=True), node.get('href')) for node in soup.select(selector)]
+
+
+class SoupStrainerBackend(ParserBackend):
+    """用 SoupStrainer 只构建 parse_only 指定标签的子树，跳过页面其余部分的建树开销。"""
+
+    name = "strainer"
+
+    def select_links(self, markup, selector, parse_only=None):
+        strainer = SoupStrainer(parse_only) if parse_only else None
+        soup = BeautifulSoup(markup, 'lxml' if lxml is not None else 'html.parser', parse_only=strainer)
+        return [(node.get_text(" ", strip=True), node.get('href')) for node in soup.select(selector)]
+
+
+class LxmlBackend(ParserBackend):
+    """基于 libxml2 的 lxml.html 解析，配合 cssselect 执行选择器。"""
+
+    name = "lxml"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return lxml is not None
+
+    def select_links(self, markup, selector, parse_only=None):
+        if not markup:
+            return []
+        root = lxml.html.fromstring(markup)
+        return [(" ".join(node.text_content().split()), node.get('href')) for node in root.cssselect(selector)]
+
+
+class SelectolaxBackend(ParserBackend):
+    """基于 lexbor 的 selectolax 解析，通常是最快的后端。"""
+
+    name = "selectolax"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return SelectolaxHTMLParser is not None
+
+    def select_links(self, markup, selector, parse_only=None):
+        tree = SelectolaxHTMLParser(markup)
+        return [(node.text(separator=" ", strip=True), node.attributes.get('href')) for node in tree.css(selector)]
+
+
+# 按优先级排列：'auto' 选择第一个可用的后端
+PARSER_BACKENDS = {
+    backend.name: backend for backend in (SelectolaxBackend, LxmlBackend, SoupStrainerBackend, SoupBackend)
+}
+
+_instances: dict[str, ParserBackend] = {}
+
+
+def get_parser(name: str = "auto") -> ParserBackend:
+    """
+    返回指定名称的解析后端实例（各后端无状态，全局共享一个实例）。
+    'auto' 选择已安装的最快后端；指定的后端未安装时退回到 'auto'。
+    """
+    if name in _instances:
+        return _instances[name]
+    key = name
+    if name != "auto":
+        backend = PARSER_BACKENDS.get(name)
+        if backend is None:
+            raise ValueError(f"Unknown parser backend: {name}")
+        if not backend.is_available():
+            print(f"   [Warning] Parser backend '{name}' is not installed, falling back to the fastest available one.")
+            key = "auto"
+    if key == "auto":
+        key = next(backend_name for backend_name, backend in PARSER_BACKENDS.items() if backend.is_available())
+    instance = _instances.get(key) or PARSER_BACKENDS[key]()
+    _instances[key] = _instances[name] = instance
+    return instance
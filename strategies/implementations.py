@@ -3,11 +3,55 @@ import httpx
 import xml.etree.ElementTree as ET
 import json
 import re
-from bs4 import BeautifulSoup
-from urllib.parse import quote_plus, urljoin
+from urllib.parse import urljoin
 
 # 导入我们之前定义的抽象基类
 from strategies.download_strategy import DownloadStrategy
+from strategies.proceedings_index import neurips_pdf_url
+
+
+ARXIV_NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'opensearch': 'http://a9.com/-/spec/opensearch/1.1/',
+}
+_ATOM = '{%s}' % ARXIV_NAMESPACES['atom']
+_OPENSEARCH = '{%s}' % ARXIV_NAMESPACES['opensearch']
+
+
+class ArxivFeedParser:
+    """
+    增量解析 arXiv 的 Atom 响应：数据边接收边送入 XMLPullParser，每个 entry 解析完成后
+    立即提取标题和PDF链接并释放该元素，不需要先拼接完整响应再构建整棵树。
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=('end',))
+        self.total_results = None
+        self.entry_count = 0
+        # 带PDF链接的 (标题, PDF链接) 候选
+        self.candidates: list[tuple[str, str]] = []
+
+    def feed(self, data: bytes):
+        self._parser.feed(data)
+        self._drain()
+
+    def close(self) -> "ArxivFeedParser":
+        self._parser.close()
+        self._drain()
+        return self
+
+    def _drain(self):
+        for _, element in self._parser.read_events():
+            if element.tag == _ATOM + 'entry':
+                self.entry_count += 1
+                title = element.findtext(_ATOM + 'title', '')
+                for link in element.iterfind(_ATOM + 'link'):
+                    if link.get('title') == 'pdf' and link.get('href'):
+                        self.candidates.append((title, link.get('href')))
+                        break
+                element.clear()
+            elif element.tag == _OPENSEARCH + 'totalResults':
+                self.total_results = int(element.text) if element.text else 0
 
 
 # --- 保留的下载器 ---
@@ -15,29 +59,74 @@ from strategies.download_strategy import DownloadStrategy
 class ArxivDownloader(DownloadStrategy):
     """从arXiv下载论文的策略。"""
 
+    name = "arXiv"
+    hosts = ("export.arxiv.org",)
+
+    # 批量查询的限制：每次查询合并的标题数、查询串长度、每页结果数和最多翻页数
+    batch_size = 20
+    max_query_length = 2000
+    page_size = 100
+    max_pages = 5
+    # 单条查询时读取的候选数，从中选出与标题最相似的一篇
+    candidate_limit = 5
+
     def __init__(self, session: httpx.AsyncClient, save_dir: str):
         super().__init__(session, save_dir)
         self.api_url = "https://export.arxiv.org/api/query?"
 
-    async def download(self, normalized_title: str, filepath: str) -> bool:
-        print("   -> [Strategy: arXiv] Trying to find and download...")
-        try:
-            params = {"search_query": f'ti:"{normalized_title}"', "start": 0, "max_results": 1}
-            response = await self.session.get(self.api_url, params=params)
+    def _query_clause(self, normalized_title: str) -> str:
+        return f'ti:"{normalized_title}"'
+
+    def doi_for(self, pdf_url: str) -> str | None:
+        """arXiv 为每篇预印本注册了 10.48550/arXiv.<编号> 形式的 DOI，可直接由PDF链接得到。"""
+        match = re.search(r'arxiv\.org/(?:pdf|abs)/(.+?)(?:v\d+)?(?:\.pdf)?$', pdf_url)
+        if match is None:
+            return super().doi_for(pdf_url)
+        return f"10.48550/arXiv.{match.group(1)}"
+
+    async def _fetch_feed(self, params: dict) -> ArxivFeedParser:
+        """流式读取一页查询结果，并在接收过程中增量解析。"""
+        parser = ArxivFeedParser()
+        async with self.session.stream('GET', self.api_url, params=params) as response:
             response.raise_for_status()
-            root = ET.fromstring(response.content)
-            namespace = {'atom': 'http://www.w3.org/2005/Atom'}
-            entry = root.find('atom:entry', namespace)
-            if entry:
-                pdf_link_element = entry.find("atom:link[@title='pdf']", namespace)
-                if pdf_link_element is not None and pdf_link_element.get('href'):
-                    pdf_url = pdf_link_element.get('href')
-                    return await self._download_pdf_from_url(pdf_url, filepath)
-            print("   -> [Strategy: arXiv] 🟡 Paper not found.")
-            return False
-        except Exception as e:
-            print(f"   -> [Strategy: arXiv] ❌ An error occurred: {e}")
-            return False
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+        return parser.close()
+
+    async def resolve_many(self, normalized_titles: list[str]) -> dict[str, str | None]:
+        """
+        用一个 OR 组合的查询解析一批标题，并分页读取结果。
+
+        Returns:
+            dict: 标准化标题 -> PDF链接（确认未收录时为 None）。由于翻页上限没能确定结果的标题不在返回值中。
+        """
+        best: dict[str, tuple[float, str]] = {}
+        results: dict[str, str | None] = {}
+        query = ' OR '.join(self._query_clause(title) for title in normalized_titles)
+        start, total = 0, None
+        for _ in range(self.max_pages):
+            params = {"search_query": query, "start": start, "max_results": self.page_size}
+            feed = await self._fetch_feed(params)
+            if total is None:
+                total = feed.total_results or 0
+            await self._batch_match(normalized_titles, feed.candidates, best)
+            start += feed.entry_count
+            exact = all(best.get(title, (0.0,))[0] >= 1.0 for title in normalized_titles)
+            if not feed.entry_count or start >= total or exact:
+                # 已读完全部结果，剩下的标题可以确认未收录
+                results = {title: None for title in normalized_titles}
+                break
+        results.update({title: url for title, (_, url) in best.items()})
+        return results
+
+    async def resolve_pdf_url(self, normalized_title: str) -> str | None:
+        params = {"search_query": f'ti:"{normalized_title}"', "start": 0, "max_results": self.candidate_limit}
+        feed = await self._fetch_feed(params)
+        pdf_url = await self._best_match(normalized_title, feed.candidates)
+        if pdf_url:
+            return pdf_url
+        print("   -> [Strategy: arXiv] 🟡 Paper not found.")
+        return None
 
 
 class CoreDownloader(DownloadStrategy):
@@ -46,62 +135,109 @@ class CoreDownloader(DownloadStrategy):
     [修正] 已更新为使用POST请求和JSON负载，以提高稳定性。
     """
 
+    name = "CORE"
+    hosts = ("api.core.ac.uk",)
+
+    # 批量查询的限制：每次查询合并的标题数、每页结果数和最多翻页数
+    batch_size = 10
+    page_size = 50
+    max_pages = 4
+
     def __init__(self, session: httpx.AsyncClient, save_dir: str, api_key: str):
         super().__init__(session, save_dir)
         self.api_url = "https://api.core.ac.uk/v3/search/works"
         self.api_key = api_key
         if self.api_key: self.headers["Authorization"] = f"Bearer {self.api_key}"
 
-    async def download(self, normalized_title: str, filepath: str) -> bool:
-        if not self.api_key: return False
-        print("   -> [Strategy: CORE] Trying to find and download...")
-        try:
-            # 使用POST请求发送JSON数据，避免URL编码问题
-            data = {"q": f'title:("{normalized_title}")'}
-            response = await self.session.post(self.api_url, json=data, headers=self.headers)
-            response.raise_for_status()
-            results = response.json()
-            if results.get("results"):
-                download_url = results["results"][0].get("downloadUrl")
-                if download_url: return await self._download_pdf_from_url(download_url, filepath)
-            print("   -> [Strategy: CORE] 🟡 Paper not found or no download link.")
-            return False
-        except Exception as e:
-            print(f"   -> [Strategy: CORE] ❌ An error occurred: {e}")
-            return False
+    def is_available(self) -> bool:
+        return bool(self.api_key)
+
+    def _query_clause(self, normalized_title: str) -> str:
+        return f'title:("{normalized_title}")'
+
+    async def _search(self, query: str, offset: int = 0, limit: int = 10) -> dict:
+        """
+        发出一次搜索请求。CORE 返回 429 时，共享传输层已根据 X-RateLimit-Retry-After / Retry-After
+        暂停了该主机的令牌桶，并由 ResilientTransport 在配额恢复后重试。
+        """
+        # 使用POST请求发送JSON数据，避免URL编码问题
+        data = {"q": query, "offset": offset, "limit": limit}
+        response = await self.session.post(self.api_url, json=data, headers=self.headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def _score_works(self, normalized_titles: list[str], works: list[dict],
+                           best: dict[str, tuple[float, str]]):
+        """
+        为每个带 downloadUrl 的作品与每个目标标题打分，保留每个标题得分最高的下载链接，
+        并记录被选中作品的 DOI。
+        """
+        candidates = [(work.get("title") or "", work["downloadUrl"]) for work in works if work.get("downloadUrl")]
+        await self._batch_match(normalized_titles, candidates, best)
+        dois = {work["downloadUrl"]: work["doi"] for work in works if work.get("downloadUrl") and work.get("doi")}
+        for _, url in best.values():
+            if url in dois:
+                self.resolved_dois[url] = dois[url]
+
+    async def resolve_many(self, normalized_titles: list[str]) -> dict[str, str | None]:
+        query = ' OR '.join(self._query_clause(title) for title in normalized_titles)
+        best: dict[str, tuple[float, str]] = {}
+        offset, complete = 0, False
+        for _ in range(self.max_pages):
+            results = await self._search(query, offset=offset, limit=self.page_size)
+            works = results.get("results") or []
+            await self._score_works(normalized_titles, works, best)
+            offset += len(works)
+            exact = all(best.get(title, (0.0,))[0] >= 1.0 for title in normalized_titles)
+            if not works or offset >= results.get("totalHits", 0) or exact:
+                complete = True
+                break
+        resolved: dict[str, str | None] = {title: url for title, (_, url) in best.items()}
+        if complete:
+            # 已读完全部结果，剩下的标题可以确认 CORE 中没有可下载的匹配作品
+            for title in normalized_titles:
+                resolved.setdefault(title, None)
+        return resolved
+
+    async def resolve_pdf_url(self, normalized_title: str) -> str | None:
+        results = await self._search(self._query_clause(normalized_title), limit=10)
+        best: dict[str, tuple[float, str]] = {}
+        await self._score_works([normalized_title], results.get("results") or [], best)
+        if normalized_title in best:
+            return best[normalized_title][1]
+        print("   -> [Strategy: CORE] 🟡 Paper not found or no download link.")
+        return None
 
 
 class AaaiOjsDownloader(DownloadStrategy):
     """从 ojs.aaai.org 下载AAAI会议论文的策略。"""
 
+    name = "AAAI OJS"
+    hosts = ("ojs.aaai.org",)
+    index_venue = "aaai"
+
     def __init__(self, session: httpx.AsyncClient, save_dir: str):
         super().__init__(session, save_dir)
         self.search_url = "https://ojs.aaai.org/index.php/AAAI/search/search"
 
-    async def download(self, normalized_title: str, filepath: str) -> bool:
-        print("   -> [Strategy: AAAI OJS] Trying to find and download...")
-        try:
-            # 使用未标准化的标题进行搜索，以获得更好的匹配效果
-            search_response = await self.session.get(self.search_url, params={'query': normalized_title})
-            search_response.raise_for_status()
-            soup = BeautifulSoup(search_response.text, 'html.parser')
-            article_link = soup.select_one('h3.title a, h4.title a')
-            if not article_link or not article_link.get('href'):
-                print("   -> [Strategy: AAAI OJS] 🟡 Paper not found.")
-                return False
-            article_page_url = article_link.get('href')
-            article_response = await self.session.get(article_page_url)
-            article_response.raise_for_status()
-            article_soup = BeautifulSoup(article_response.text, 'html.parser')
-            pdf_link = article_soup.select_one('a.obj_galley_link.pdf')
-            if not pdf_link or not pdf_link.get('href'):
-                print(f"   -> [Strategy: AAAI OJS] 🟡 Found article page but no PDF link: {article_page_url}")
-                return False
-            pdf_url = pdf_link.get('href').replace('/view/', '/download/')
-            return await self._download_pdf_from_url(pdf_url, filepath)
-        except Exception as e:
-            print(f"   -> [Strategy: AAAI OJS] ❌ An error occurred: {e}")
-            return False
+    async def resolve_pdf_url(self, normalized_title: str) -> str | None:
+        # 使用未标准化的标题进行搜索，以获得更好的匹配效果
+        search_response = await self.session.get(self.search_url, params={'query': normalized_title})
+        search_response.raise_for_status()
+        candidates = [(text, href) for text, href in await self._select_links(
+            search_response.content, 'h3.title a, h4.title a', parse_only=['h3', 'h4']) if href]
+        article_page_url = await self._best_match(normalized_title, candidates)
+        if not article_page_url:
+            print("   -> [Strategy: AAAI OJS] 🟡 Paper not found.")
+            return None
+        article_response = await self.session.get(article_page_url)
+        article_response.raise_for_status()
+        pdf_links = [href for _, href in await self._select_links(
+            article_response.content, 'a.obj_galley_link.pdf', parse_only='a') if href]
+        if not pdf_links:
+            print(f"   -> [Strategy: AAAI OJS] 🟡 Found article page but no PDF link: {article_page_url}")
+            return None
+        return pdf_links[0].replace('/view/', '/download/')
 
 
 class NeuripsDownloader(DownloadStrategy):
@@ -110,42 +246,33 @@ class NeuripsDownloader(DownloadStrategy):
     [修正] 改进了链接查找逻辑，避免跳转到admin登录页。
     """
 
+    name = "NeurIPS Search"
+    hosts = ("proceedings.neurips.cc",)
+    index_venue = "neurips"
+
     def __init__(self, session: httpx.AsyncClient, save_dir: str):
         super().__init__(session, save_dir)
         self.base_url = "https://proceedings.neurips.cc"
         self.search_url = f"{self.base_url}/papers/search"
 
-    async def download(self, normalized_title: str, filepath: str) -> bool:
-        print(f"   -> [Strategy: NeurIPS Search] Trying to find and download...")
-        try:
-            params = {'q': normalized_title}
-            search_response = await self.session.get(self.search_url, params=params)
-            search_response.raise_for_status()
-            soup = BeautifulSoup(search_response.text, 'html.parser')
-
-            # 查找所有论文链接，并与标题进行匹配
-            paper_links = soup.select('div.container-fluid ul li a')
-            found_link = None
-            for link in paper_links:
-                # 进行不区分大小写和空格的模糊匹配
-                if normalized_title.lower().replace(" ", "") in link.get_text(strip=True).lower().replace(" ", ""):
-                    found_link = link
-                    break
-
-            if not found_link or not found_link.get('href'):
-                print("   -> [Strategy: NeurIPS Search] 🟡 Paper not found in search results.")
-                return False
+    async def resolve_pdf_url(self, normalized_title: str) -> str | None:
+        params = {'q': normalized_title}
+        search_response = await self.session.get(self.search_url, params=params)
+        search_response.raise_for_status()
+        # 查找所有论文链接，选出与标题最相似的一篇
+        candidates = [(text, href) for text, href in await self._select_links(
+            search_response.content, 'ul li a', parse_only='ul') if href]
+        href = await self._best_match(normalized_title, candidates)
+        if not href:
+            print("   -> [Strategy: NeurIPS Search] 🟡 Paper not found in search results.")
+            return None
 
-            abstract_url = urljoin(self.base_url, found_link.get('href'))
+        abstract_url = urljoin(self.base_url, href)
 
-            # 从摘要页面链接构建PDF链接
-            pdf_url = abstract_url.replace("Abstract.html", "Paper.pdf").replace("/hash/", "/file/")
-            print(f"   -> [Strategy: NeurIPS Search] ✅ Found potential PDF link: {pdf_url}")
-            return await self._download_pdf_from_url(pdf_url, filepath)
-
-        except Exception as e:
-            print(f"   -> [Strategy: NeurIPS Search] ❌ An error occurred: {e}")
-            return False
+        # 从摘要页面链接构建PDF链接（兼容 2022 年之后的 -Abstract-Conference.html 格式）
+        pdf_url = neurips_pdf_url(abstract_url)
+        print(f"   -> [Strategy: NeurIPS Search] ✅ Found potential PDF link: {pdf_url}")
+        return pdf_url
 
 
 # 注意：ACM和IEEE的httpx版本已被移除，因为它们不可靠。
@@ -153,6 +280,10 @@ class NeuripsDownloader(DownloadStrategy):
 class CvfDownloader(DownloadStrategy):
     """从 CVF (openaccess.thecvf.com) 下载论文，例如 CVPR, ICCV。"""
 
+    name = "CVF Open Access"
+    hosts = ("openaccess.thecvf.com",)
+    index_venue = "cvf"
+
     def __init__(self, session: httpx.AsyncClient, save_dir: str):
         super().__init__(session, save_dir)
         self.base_url = "https://openaccess.thecvf.com"
@@ -160,38 +291,66 @@ class CvfDownloader(DownloadStrategy):
         # self.search_url = f"{self.base_url}/search_result"
         # 此处保留原有逻辑，但可以考虑后续优化为直接爬取会议页面
 
-    async def download(self, normalized_title: str, filepath: str) -> bool:
-        print("   -> [Strategy: CVF Open Access] Trying to find and download...")
-        try:
-            # 1. 在CVF网站上搜索
-            params = {"q": normalized_title}
-            search_response = await self.session.get(f"{self.base_url}/search_result", params=params)
-            search_response.raise_for_status()
-            soup = BeautifulSoup(search_response.text, 'html.parser')
-
-            # 2. 查找第一个搜索结果
-            result_link = soup.select_one('div.content div dl dt a')
-            if not result_link or not result_link.get('href'):
-                print("   -> [Strategy: CVF Open Access] 🟡 Paper not found in search results.")
-                return False
-
-            # 3. 从摘要页面链接构建PDF链接
-            abstract_url = urljoin(self.base_url, result_link.get('href'))
-
-            # 访问摘要页以找到PDF链接
-            abstract_page_resp = await self.session.get(abstract_url)
-            abstract_page_resp.raise_for_status()
-            abstract_soup = BeautifulSoup(abstract_page_resp.text, 'html.parser')
-
-            # 寻找包含 "pdf" 文本的链接
-            pdf_link = abstract_soup.find('a', href=re.compile(r'\.pdf$'))
-            if not pdf_link:
-                print(f"   -> [Strategy: CVF Open Access] 🟡 Found abstract page but no PDF link: {abstract_url}")
-                return False
-
-            pdf_url = urljoin(abstract_url, pdf_link['href'])
-            print(f"   -> [Strategy: CVF Open Access] ✅ Found PDF link: {pdf_url}")
-            return await self._download_pdf_from_url(pdf_url, filepath)
-        except Exception as e:
-            print(f"   -> [Strategy: CVF Open Access] ❌ An error occurred: {e}")
-            return False
+    async def resolve_pdf_url(self, normalized_title: str) -> str | None:
+        # 1. 在CVF网站上搜索
+        params = {"q": normalized_title}
+        search_response = await self.session.get(f"{self.base_url}/search_result", params=params)
+        search_response.raise_for_status()
+        # 2. 在搜索结果中选出与标题最相似的一篇
+        candidates = [(text, href) for text, href in await self._select_links(
+            search_response.content, 'dl dt a', parse_only='dl') if href]
+        href = await self._best_match(normalized_title, candidates)
+        if not href:
+            print("   -> [Strategy: CVF Open Access] 🟡 Paper not found in search results.")
+            return None
+
+        # 3. 从摘要页面链接构建PDF链接
+        abstract_url = urljoin(self.base_url, href)
+
+        # 访问摘要页以找到PDF链接
+        abstract_page_resp = await self.session.get(abstract_url)
+        abstract_page_resp.raise_for_status()
+        # 寻找指向 .pdf 的链接
+        pdf_links = [href for _, href in await self._select_links(
+            abstract_page_resp.content, 'a[href$=".pdf"]', parse_only='a') if href]
+        if not pdf_links:
+            print(f"   -> [Strategy: CVF Open Access] 🟡 Found abstract page but no PDF link: {abstract_url}")
+            return None
+
+        pdf_url = urljoin(abstract_url, pdf_links[0])
+        print(f"   -> [Strategy: CVF Open Access] ✅ Found PDF link: {pdf_url}")
+        return pdf_url
+
+
+def browser_cookie_jar(cookies: list[dict]) -> httpx.Cookies:
+    """
+    把 Selenium 的 cookies 转成保留 domain/path 的 httpx cookie 罐。
+    交给客户端的 cookie 罐在每一跳重定向时都会按域名重新匹配，静态的 Cookie 请求头则会在重定向时被丢弃。
+    """
+    jar = httpx.Cookies()
+    for cookie in cookies:
+        if cookie.get('name') and cookie.get('value') is not None:
+            jar.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path') or '/')
+    return jar
+
+
+class BrowserSessionDownloader(DownloadStrategy):
+    """
+    用浏览器会话下载PDF的 httpx 策略。
+    Selenium 策略负责通过登录/Cloudflare 验证并找到PDF链接，之后把 cookies 和 User-Agent 交给本策略，
+    复用断点续传和内容校验逻辑，浏览器可以立即处理下一篇论文。
+    session 应当是带有 browser_cookie_jar 的专用客户端（见 PaperCrawler._handoff_session）：
+    cookies 在出版商的重定向链上持续有效，出版商返回的 Set-Cookie 也不会进入共享客户端。
+    """
+
+    def __init__(self, session: httpx.AsyncClient, save_dir: str, name: str,
+                 pdf_url: str, user_agent: str, referer: str | None = None):
+        super().__init__(session, save_dir)
+        self.name = name
+        self.pdf_url = pdf_url
+        self.headers['User-Agent'] = user_agent
+        if referer:
+            self.headers['Referer'] = referer
+
+    async def resolve_pdf_url(self, normalized_title: str) -> str | None:
+        return self.pdf_url
@@ -0,0 +1,305 @@
+# strategies/metrics.py
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+# 延迟直方图的桶上界（秒），与 Prometheus 的 le 标签对应
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, math.inf)
+
+# 指标名称
+PAPERS_TOTAL = "papercrawler_papers_total"                          # outcome
+PAPERS_SKIPPED_TOTAL = "papercrawler_papers_skipped_total"
+PAPER_SECONDS = "papercrawler_paper_seconds"
+STRATEGY_SUCCESSES_TOTAL = "papercrawler_strategy_successes_total"  # conference, strategy
+LOOKUPS_TOTAL = "papercrawler_lookups_total"                        # strategy, outcome
+LOOKUP_SECONDS = "papercrawler_lookup_seconds"                      # strategy
+DOWNLOADS_TOTAL = "papercrawler_downloads_total"                    # strategy, outcome
+DOWNLOAD_SECONDS = "papercrawler_download_seconds"                  # strategy
+DOWNLOAD_BYTES_TOTAL = "papercrawler_download_bytes_total"          # strategy
+SELENIUM_CALLS_TOTAL = "papercrawler_selenium_calls_total"          # strategy, outcome
+SELENIUM_SECONDS = "papercrawler_selenium_seconds"                  # strategy
+HTTP_RESPONSES_TOTAL = "papercrawler_http_responses_total"          # host, status
+HTTP_ERRORS_TOTAL = "papercrawler_http_errors_total"                # host, error
+HTTP_TIMEOUTS_TOTAL = "papercrawler_http_timeouts_total"            # host
+HTTP_REQUEST_SECONDS = "papercrawler_http_request_seconds"          # host
+HTTP_BYTES_TOTAL = "papercrawler_http_bytes_total"                  # host
+HTTP_RETRIES_TOTAL = "papercrawler_http_retries_total"              # host, reason
+CIRCUIT_OPENED_TOTAL = "papercrawler_circuit_opened_total"          # host
+
+HELP = {
+    PAPERS_TOTAL: "Papers processed, by outcome.",
+    PAPERS_SKIPPED_TOTAL: "Papers skipped because the manifest already had them.",
+    PAPER_SECONDS: "End-to-end time per paper.",
+    STRATEGY_SUCCESSES_TOTAL: "Successful downloads by conference and strategy.",
+    LOOKUPS_TOTAL: "Lookup phase results by strategy and outcome.",
+    LOOKUP_SECONDS: "Lookup phase latency by strategy.",
+    DOWNLOADS_TOTAL: "Download phase results by strategy and outcome.",
+    DOWNLOAD_SECONDS: "Download phase latency by strategy.",
+    DOWNLOAD_BYTES_TOTAL: "PDF bytes received by strategy.",
+    SELENIUM_CALLS_TOTAL: "Selenium calls by strategy and outcome.",
+    SELENIUM_SECONDS: "Selenium call latency by strategy.",
+    HTTP_RESPONSES_TOTAL: "HTTP responses by host and status code.",
+    HTTP_ERRORS_TOTAL: "HTTP transport errors by host and exception type.",
+    HTTP_TIMEOUTS_TOTAL: "HTTP timeouts by host.",
+    HTTP_REQUEST_SECONDS: "Time until response headers by host (excluding rate-limit waits).",
+    HTTP_BYTES_TOTAL: "Response body bytes received by host (as sent on the wire).",
+    HTTP_RETRIES_TOTAL: "HTTP retries after transient errors by host and reason.",
+    CIRCUIT_OPENED_TOTAL: "Times a host's circuit breaker opened.",
+}
+
+
+class Histogram:
+    """固定桶的延迟直方图，记录次数、总和与最大值，并按桶估算分位数。"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """分位数的估计值：返回第一个累计次数达到 q 的桶的上界（最后一个桶返回实际最大值）。"""
+        if not self.count:
+            return 0.0
+        target, cumulative = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+        }
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsRegistry:
+    """
+    爬虫的指标注册表：计数器和延迟直方图，以指标名和标签区分。
+    事件循环和 Selenium 线程都会记录指标，因此所有操作都加锁。
+    可以导出为便于阅读的 JSON 摘要（按策略、主机、会议分组），或 Prometheus 文本格式。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], Histogram] = {}
+        self.started_at = time.time()
+
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def _grouped(self, store: dict, name: str, *group_by: str) -> dict:
+        """把指定指标按标签分组为嵌套字典，例如 group_by=('strategy', 'outcome')。"""
+        grouped = {}
+        for (metric, labels), value in store.items():
+            if metric != name:
+                continue
+            labels = dict(labels)
+            node = grouped
+            for label in group_by[:-1]:
+                node = node.setdefault(labels.get(label, ""), {})
+            node[labels.get(group_by[-1], "")] = value.to_dict() if isinstance(value, Histogram) else value
+        return grouped
+
+    def summary(self) -> dict:
+        """面向人阅读的摘要：整体吞吐量，以及按策略、主机、会议分组的统计。"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: value for key, value in self._histograms.items()}
+            elapsed = time.time() - self.started_at
+            papers = self._grouped(counters, PAPERS_TOTAL, "outcome")
+            paper_latency = histograms.get((PAPER_SECONDS, ()))
+            total_bytes = sum(value for (name, _), value in counters.items() if name == DOWNLOAD_BYTES_TOTAL)
+
+            strategies = {}
+            for metric, field, group in (
+                (LOOKUPS_TOTAL, "lookups", ("strategy", "outcome")),
+                (LOOKUP_SECONDS, "lookup_seconds", ("strategy",)),
+                (DOWNLOADS_TOTAL, "downloads", ("strategy", "outcome")),
+                (DOWNLOAD_SECONDS, "download_seconds", ("strategy",)),
+                (DOWNLOAD_BYTES_TOTAL, "bytes", ("strategy",)),
+                (SELENIUM_CALLS_TOTAL, "selenium_calls", ("strategy", "outcome")),
+                (SELENIUM_SECONDS, "selenium_seconds", ("strategy",)),
+            ):
+                store = histograms if metric.endswith("_seconds") else counters
+                for strategy, value in self._grouped(store, metric, *group).items():
+                    strategies.setdefault(strategy, {})[field] = value
+
+            hosts = {}
+            for metric, field, group in (
+                (HTTP_RESPONSES_TOTAL, "status_codes", ("host", "status")),
+                (HTTP_ERRORS_TOTAL, "errors", ("host", "error")),
+                (HTTP_TIMEOUTS_TOTAL, "timeouts", ("host",)),
+                (HTTP_REQUEST_SECONDS, "latency", ("host",)),
+                (HTTP_BYTES_TOTAL, "bytes", ("host",)),
+                (HTTP_RETRIES_TOTAL, "retries", ("host", "reason")),
+                (CIRCUIT_OPENED_TOTAL, "circuit_opened", ("host",)),
+            ):
+                store = histograms if metric.endswith("_seconds") else counters
+                for host, value in self._grouped(store, metric, *group).items():
+                    hosts.setdefault(host, {})[field] = value
+
+            return {
+                "elapsed_seconds": elapsed,
+                "papers": papers,
+                "papers_skipped": counters.get((PAPERS_SKIPPED_TOTAL, ()), 0.0),
+                "papers_per_second": sum(papers.values()) / elapsed if elapsed > 0 else 0.0,
+                "bytes_per_second": total_bytes / elapsed if elapsed > 0 else 0.0,
+                "paper_seconds": paper_latency.to_dict() if paper_latency else None,
+                "strategies": strategies,
+                "hosts": hosts,
+                "conferences": self._grouped(counters, STRATEGY_SUCCESSES_TOTAL, "conference", "strategy"),
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus 文本格式 (text/plain; version=0.0.4)。"""
+        def render_labels(labels: tuple, extra: tuple = ()) -> str:
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+            return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+        with self._lock:
+            lines, seen = [], set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in seen:
+                    seen.add(name)
+                    lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+                lines.append(f"{name}{render_labels(labels)} {value:g}")
+            for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                if name not in seen:
+                    seen.add(name)
+                    lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} histogram"]
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+                    lines.append(f"{name}_bucket{render_labels(labels, (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{render_labels(labels)} {histogram.sum:g}")
+                lines.append(f"{name}_count{render_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _write_atomic(self, path: str, content: str):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def write_json(self, path: str):
+        self._write_atomic(path, json.dumps(self.summary(), ensure_ascii=False, indent=2))
+
+    def write_prometheus(self, path: str):
+        """写入 Prometheus 文本文件，可供 node_exporter 的 textfile collector 读取。"""
+        self._write_atomic(path, self.to_prometheus())
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """在后台线程中提供 /metrics 端点，返回服务器对象（调用 shutdown() 停止）。"""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"   [Metrics] Serving Prometheus metrics on http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+def _record_transport_error(metrics: MetricsRegistry, host: str, error: Exception):
+    if isinstance(error, httpx.TimeoutException):
+        metrics.inc(HTTP_TIMEOUTS_TOTAL, host=host)
+    metrics.inc(HTTP_ERRORS_TOTAL, host=host, error=type(error).__name__)
+
+
+class _CountingStream(httpx.AsyncByteStream):
+    """统计响应体字节数的流包装，读取响应体期间的超时和网络错误同样计入该主机。"""
+
+    def __init__(self, stream, metrics: MetricsRegistry, host: str):
+        self._stream = stream
+        self._metrics = metrics
+        self._host = host
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                self._metrics.inc(HTTP_BYTES_TOTAL, len(chunk), host=self._host)
+                yield chunk
+        except httpx.TransportError as e:
+            _record_transport_error(self._metrics, self._host, e)
+            raise
+
+    async def aclose(self):
+        await self._stream.aclose()
+
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """
+    包装底层 httpx 传输层，按主机记录请求延迟（到收到响应头为止）、状态码、超时、错误和响应字节数。
+    放在限速传输层之内，因此延迟不包含令牌桶的排队时间。
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, metrics: MetricsRegistry):
+        self._transport = transport
+        self.metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError as e:
+            _record_transport_error(self.metrics, host, e)
+            raise
+        self.metrics.observe(HTTP_REQUEST_SECONDS, time.perf_counter() - start, host=host)
+        self.metrics.inc(HTTP_RESPONSES_TOTAL, host=host, status=response.status_code)
+        response.stream = _CountingStream(response.stream, self.metrics, host)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
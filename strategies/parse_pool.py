@@ -0,0 +1,75 @@
+# strategies/parse_pool.py
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from strategies.html_parsing import get_parser
+from strategies.title_matching import BatchTitleMatcher, TitleMatcher
+
+
+# --- 在工作进程中执行的函数（必须定义在模块顶层才能被 pickle） ---
+
+def _select_links(backend_name: str, markup: bytes, selector: str, parse_only) -> list[tuple[str, str | None]]:
+    return get_parser(backend_name).select_links(markup, selector, parse_only=parse_only)
+
+
+def _best_match(title: str, candidates: list[tuple[str, Any]], threshold: float) -> Any | None:
+    return TitleMatcher(title, threshold).best(candidates)
+
+
+def _batch_match(titles: list[str], candidates: list[tuple[str, Any]], threshold: float) -> dict[str, tuple[float, Any]]:
+    return BatchTitleMatcher(titles, threshold).match(candidates)
+
+
+class ParsePool:
+    """
+    解析与标题匹配的进程池。
+    大量论文并发时，HTML 解析和候选打分都是纯 CPU 计算，在事件循环线程中执行会拖慢所有网络 I/O；
+    交给工作进程执行后事件循环保持响应，解析也能利用多个 CPU 核心。
+    小页面和少量候选的进程间传输开销大于收益，仍在当前线程中直接处理。
+    """
+
+    def __init__(self, workers: int, min_offload_bytes: int = 32 * 1024, min_offload_pairs: int = 5000):
+        """
+        Args:
+            workers (int): 工作进程数量。
+            min_offload_bytes (int): 页面达到此大小（字节）才交给工作进程解析。
+            min_offload_pairs (int): 目标标题数 × 候选数达到此值才交给工作进程打分。
+        """
+        self.workers = max(1, workers)
+        self.min_offload_bytes = min_offload_bytes
+        self.min_offload_pairs = min_offload_pairs
+        # ProcessPoolExecutor 在第一次提交任务时才启动工作进程
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._broken = False
+
+    async def _submit(self, func, *args):
+        if not self._broken:
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+            except BrokenProcessPool:
+                # 工作进程异常退出（例如被系统杀死）时不再使用进程池，改为在当前线程中处理
+                print("   [ParsePool] ❌ Worker process died, parsing in the event loop from now on.")
+                self._broken = True
+        return func(*args)
+
+    async def select_links(self, backend_name: str, markup: bytes, selector: str,
+                           parse_only=None) -> list[tuple[str, str | None]]:
+        if len(markup) < self.min_offload_bytes:
+            return _select_links(backend_name, markup, selector, parse_only)
+        return await self._submit(_select_links, backend_name, markup, selector, parse_only)
+
+    async def best_match(self, title: str, candidates: list[tuple[str, Any]], threshold: float) -> Any | None:
+        if len(candidates) < self.min_offload_pairs:
+            return _best_match(title, candidates, threshold)
+        return await self._submit(_best_match, title, candidates, threshold)
+
+    async def batch_match(self, titles: list[str], candidates: list[tuple[str, Any]],
+                          threshold: float) -> dict[str, tuple[float, Any]]:
+        if len(titles) * len(candidates) < self.min_offload_pairs:
+            return _batch_match(titles, candidates, threshold)
+        return await self._submit(_batch_match, titles, candidates, threshold)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
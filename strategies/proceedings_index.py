@@ -0,0 +1,159 @@
+# strategies/proceedings_index.py
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urljoin
+
+import httpx
+from bs4 import BeautifulSoup
+
+from strategies.download_strategy import normalize_title
+
+
+def neurips_pdf_url(abstract_url: str) -> str:
+    """
+    由 NeurIPS 摘要页链接推导PDF链接，兼容旧格式 (.../hash/xxx-Abstract.html)
+    和 2022 年之后的格式 (.../hash/xxx-Abstract-Conference.html)。
+    """
+    pdf_url = abstract_url.replace("/hash/", "/file/")
+    return re.sub(r'-Abstract(-[A-Za-z_]+)?\.html$', r'-Paper\1.pdf', pdf_url)
+
+
+class ProceedingsIndex:
+    """
+    会议论文集的本地索引（SQLite）：venue -> 标准化标题 -> PDF链接。
+    会议论文集是静态列表，每个 会议/年份 的列表页只需下载一次，之后解析标题只是一次本地查询。
+    venue 使用来源站点区分：'cvf'（CVPR/ICCV/WACV 等）、'neurips'、'aaai'。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS papers (
+                    venue TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    pdf_url TEXT NOT NULL,
+                    listing TEXT NOT NULL,
+                    PRIMARY KEY (venue, title)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS listings (
+                    listing TEXT PRIMARY KEY,
+                    paper_count INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                )
+                """
+            )
+
+    def is_indexed(self, listing: str) -> bool:
+        """某个 会议/年份 列表（例如 'CVPR2023'）是否已经建立索引。"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM listings WHERE listing = ?", (listing,)
+            ).fetchone() is not None
+
+    def add_listing(self, venue: str, listing: str, entries: list[tuple[str, str]]):
+        """写入一个列表页解析出的 (标题, PDF链接)，标题在写入前标准化。"""
+        rows = [(venue, normalize_title(title), pdf_url, listing) for title, pdf_url in entries if title and pdf_url]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO papers (venue, title, pdf_url, listing) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO listings (listing, paper_count, indexed_at) VALUES (?, ?, ?)",
+                (listing, len(rows), time.time()),
+            )
+
+    def lookup(self, venue: str, normalized_title: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pdf_url FROM papers WHERE venue = ? AND title = ?", (venue, normalized_title)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --- 各站点的列表页索引器 ---
+
+async def _get_soup(session: httpx.AsyncClient, url: str) -> BeautifulSoup:
+    response = await session.get(url)
+    response.raise_for_status()
+    return BeautifulSoup(response.text, 'html.parser')
+
+
+def _cvf_entries(soup: BeautifulSoup, page_url: str) -> list[tuple[str, str]]:
+    entries = []
+    for link in soup.select('dt.ptitle a'):
+        href = link.get('href', '')
+        if '/html/' not in href:
+            continue
+        # 摘要页 /content/CVPR2023/html/X_paper.html 对应PDF /content/CVPR2023/papers/X_paper.pdf
+        pdf_url = urljoin(page_url, href.replace('/html/', '/papers/').replace('.html', '.pdf'))
+        entries.append((link.get_text(strip=True), pdf_url))
+    return entries
+
+
+async def index_cvf(session: httpx.AsyncClient, conference: str, year: int) -> list[tuple[str, str]]:
+    """索引 openaccess.thecvf.com 上某个会议某一年的全部论文，例如 CVPR 2023。"""
+    base_url = f"https://openaccess.thecvf.com/{conference.upper()}{year}"
+    page_url = f"{base_url}?day=all"
+    entries = _cvf_entries(await _get_soup(session, page_url), page_url)
+    if entries:
+        return entries
+    # 较早的年份没有 ?day=all 汇总页，需要逐个访问各天的列表页
+    soup = await _get_soup(session, base_url)
+    for link in soup.select('a[href*="?day="]'):
+        day_url = urljoin(base_url, link['href'])
+        entries.extend(_cvf_entries(await _get_soup(session, day_url), day_url))
+    return entries
+
+
+async def index_neurips(session: httpx.AsyncClient, year: int) -> list[tuple[str, str]]:
+    """索引 proceedings.neurips.cc 上某一年的全部论文。"""
+    page_url = f"https://proceedings.neurips.cc/paper_files/paper/{year}"
+    soup = await _get_soup(session, page_url)
+    entries = []
+    for link in soup.select('ul li a[href*="Abstract"]'):
+        entries.append((link.get_text(strip=True), neurips_pdf_url(urljoin(page_url, link['href']))))
+    return entries
+
+
+async def index_aaai(session: httpx.AsyncClient, year: int, max_archive_pages: int = 20) -> list[tuple[str, str]]:
+    """
+    索引 ojs.aaai.org 上某一年 AAAI 会议的全部论文。
+    先翻阅期刊归档页找到标题中包含 AAAI-YY 的各期，再从每一期的目录页读取论文标题和PDF链接。
+    """
+    tag = f"AAAI-{year % 100:02d}"
+    archive_url = "https://ojs.aaai.org/index.php/AAAI/issue/archive"
+    issue_urls = []
+    for _ in range(max_archive_pages):
+        soup = await _get_soup(session, archive_url)
+        for link in soup.select('.obj_issue_summary a.title'):
+            if tag in link.get_text(" ", strip=True) and link.get('href'):
+                issue_urls.append(urljoin(archive_url, link['href']))
+        next_link = soup.select_one('a.next')
+        if not next_link or not next_link.get('href'):
+            break
+        archive_url = urljoin(archive_url, next_link['href'])
+
+    entries = []
+    for issue_url in issue_urls:
+        soup = await _get_soup(session, issue_url)
+        for article in soup.select('.obj_article_summary'):
+            title_link = article.select_one('.title a')
+            pdf_link = article.select_one('a.obj_galley_link.pdf')
+            if title_link and pdf_link and pdf_link.get('href'):
+                pdf_url = urljoin(issue_url, pdf_link['href']).replace('/view/', '/download/')
+                entries.append((title_link.get_text(" ", strip=True), pdf_url))
+    return entries
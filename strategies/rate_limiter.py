@@ -0,0 +1,162 @@
+# strategies/rate_limiter.py
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    解析 Retry-After 类响应头，支持秒数、HTTP 日期和 ISO 8601 时间，返回需要等待的秒数。
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    for parse in (parsedate_to_datetime, datetime.fromisoformat):
+        try:
+            moment = parse(value)
+        except (TypeError, ValueError):
+            continue
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+    return None
+
+
+class TokenBucket:
+    """
+    单个主机的令牌桶。
+    令牌以 rate 个/秒的速度补充，最多累积 burst 个；桶中有令牌时请求立即放行，
+    否则预约下一个令牌并等待，保证并发请求按到达顺序排队而不会超出配额。
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate (float): 每秒补充的令牌数，即长期允许的请求速率。
+            burst (int): 桶容量，即空闲后允许连续发出的请求数。
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _reserve(self) -> float:
+        """取出一个令牌（可能为预约），返回调用方需要等待的秒数。"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    def pause(self, seconds: float):
+        """在接下来的 seconds 秒内不再放行请求（例如服务器报告配额耗尽时）。"""
+        resume_at = time.monotonic() + seconds
+        # 令牌桶在 resume_at 时刻恰好有 1 个令牌，之后按正常速率补充
+        if resume_at > self._updated:
+            self._tokens = min(self._tokens, 0.0) + 1
+            self._updated = resume_at
+
+    async def acquire(self):
+        """等待直到可以发出下一个请求。"""
+        # _reserve 中没有 await，因此在单个事件循环内是原子的，无需加锁
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HostRateLimiter:
+    """
+    按主机划分的限速器。
+    每个主机拥有独立的令牌桶，因此访问某个来源的等待不会拖慢其他来源。
+    """
+
+    def __init__(self, limits: dict[str, tuple[float, int]] | None = None,
+                 default_rate: float = 1.0, default_burst: int = 2):
+        """
+        Args:
+            limits (dict): 主机名 -> (每秒请求数, 突发容量)。键也匹配其子域名，
+                例如 'arxiv.org' 同样作用于 'export.arxiv.org'，更具体的键优先。
+            default_rate (float): 未配置主机的默认速率。
+            default_burst (int): 未配置主机的默认突发容量。
+        """
+        self.limits = dict(limits or {})
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        # 服务器返回 429 但没有给出 Retry-After 时的暂停时间（秒）
+        self.default_backoff = 10.0
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _limit_for(self, host: str) -> tuple[float, int]:
+        best_key = None
+        for key in self.limits:
+            if host == key or host.endswith('.' + key):
+                if best_key is None or len(key) > len(best_key):
+                    best_key = key
+        if best_key is not None:
+            return self.limits[best_key]
+        return self.default_rate, self.default_burst
+
+    def bucket_for(self, host: str) -> TokenBucket:
+        host = host.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self._limit_for(host)
+            bucket = self._buckets[host] = TokenBucket(rate, burst)
+        return bucket
+
+    async def acquire(self, host: str):
+        """等待直到可以向指定主机发出下一个请求。"""
+        await self.bucket_for(host).acquire()
+
+    def pause(self, host: str, seconds: float):
+        """暂停向指定主机发出请求 seconds 秒。"""
+        print(f"   [RateLimit] Pausing requests to {host} for {seconds:.1f}s.")
+        self.bucket_for(host).pause(seconds)
+
+    def observe(self, host: str, response: httpx.Response):
+        """
+        根据服务器返回的限速信息调整令牌桶：
+        429/503 时遵循 Retry-After（CORE 使用 X-RateLimit-Retry-After）；没有 Retry-After 的 503 通常是暂时的故障而非配额问题，
+        不暂停整个主机，由 ResilientTransport 的退避重试和熔断器处理。
+        X-RateLimit-Remaining 为 0 时暂停到配额重置为止，从而用满配额而不触发 429。
+        """
+        headers = response.headers
+        retry_after = parse_retry_after(headers.get('retry-after')) \
+            or parse_retry_after(headers.get('x-ratelimit-retry-after'))
+        if response.status_code == 429 or (response.status_code == 503 and retry_after is not None):
+            self.pause(host, retry_after if retry_after is not None else self.default_backoff)
+        elif headers.get('x-ratelimit-remaining', '').strip() == '0':
+            reset = retry_after if retry_after is not None else parse_retry_after(headers.get('x-ratelimit-reset'))
+            if reset:
+                self.pause(host, reset)
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    包装底层 httpx 传输层，在每个请求（包括重定向后的请求）发出前向对应主机的令牌桶取令牌，
+    并根据响应中的限速头调整令牌桶。共享客户端使用该传输层后，所有 DownloadStrategy 的请求都会经过限速。
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: HostRateLimiter):
+        self._transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire(request.url.host)
+        response = await self._transport.handle_async_request(request)
+        self.limiter.observe(request.url.host, response)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
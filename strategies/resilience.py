@@ -0,0 +1,228 @@
+# strategies/resilience.py
+import asyncio
+import random
+import time
+
+import httpx
+
+from strategies.metrics import CIRCUIT_OPENED_TOTAL, HTTP_RETRIES_TOTAL
+from strategies.rate_limiter import parse_retry_after
+
+# 暂时性的 HTTP 状态码：稍后重试可能成功（超时、限流、服务端过载或网关错误）
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# 说明主机本身不可用的状态码，计入熔断器；429 只是配额耗尽，由限速器处理
+HOST_FAILURE_STATUS_CODES = frozenset({500, 502, 503, 504})
+# 策略发出的请求都是只读查询（CORE 的搜索也用 POST），重试不会产生副作用
+RETRYABLE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'POST'})
+# 请求扩展：为 True 时 ResilientTransport 不重试该请求（断点续传的请求由下载器自己的续传循环计数）
+NO_RETRY_EXTENSION = 'papercrawler.no_retry'
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(httpx.RequestError):
+    """目标主机的熔断器处于打开状态，请求未发出。"""
+
+
+def is_transient_status(status_code: int) -> bool:
+    return status_code in TRANSIENT_STATUS_CODES
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    网络层错误是否为暂时性的：超时、连接失败、连接被重置或协议错误可以重试；
+    不支持的协议、无效 URL 等配置错误以及熔断拒绝不重试。
+    等待连接池空位超时（PoolTimeout）说明本地并发过高，与目标主机无关，既不重试也不计入熔断器。
+    """
+    if isinstance(error, (CircuitOpenError, httpx.PoolTimeout)):
+        return False
+    if isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+        return True
+    return False
+
+
+class RetryPolicy:
+    """
+    带抖动的指数退避：第 n 次重试前等待 [0, min(max_delay, base_delay * 2^(n-1))] 之间的随机时间（full jitter），
+    避免大量并发请求在同一时刻重试。服务器给出 Retry-After 时按其等待，超过 max_retry_after 则不再重试。
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 max_retry_after: float = 120.0):
+        """
+        Args:
+            max_retries (int): 每个请求最多的重试次数（不含第一次请求）。
+            base_delay (float): 第一次重试的退避上限（秒），之后每次翻倍。
+            max_delay (float): 退避时间的上限（秒）。
+            max_retry_after (float): 可接受的 Retry-After 上限（秒），服务器要求等待更久时直接返回该响应。
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def backoff(self, retry: int) -> float:
+        """第 retry 次重试（从 1 开始）前的随机等待时间。"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+    @staticmethod
+    def retry_after(response: httpx.Response) -> float | None:
+        headers = response.headers
+        return parse_retry_after(headers.get('retry-after')) \
+            or parse_retry_after(headers.get('x-ratelimit-retry-after'))
+
+
+class CircuitBreaker:
+    """
+    单个主机的熔断器。
+    连续 failure_threshold 次请求失败（暂时性错误且重试前的每一次都计入）后打开，cooldown 秒内的请求直接拒绝；
+    冷却结束后进入半开状态，只放行一个探测请求：成功则关闭，失败则重新打开并开始新的冷却。
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def remaining(self) -> float:
+        """打开状态下距冷却结束的秒数，其余状态为 0。"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def is_open(self) -> bool:
+        """当前是否会拒绝请求（打开且仍在冷却中，或半开且探测请求尚未返回）。"""
+        if self.state == OPEN:
+            return self.remaining() > 0
+        return self.state == HALF_OPEN and self._probing
+
+    def allow(self) -> bool:
+        """是否放行一个请求；冷却结束后的第一个请求作为探测请求放行。"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.remaining() > 0:
+            return False
+        if self._probing:
+            return False
+        self.state, self._probing = HALF_OPEN, True
+        return True
+
+    def release(self):
+        """探测请求没有得到结果（被取消或配置错误）时释放探测名额，下一个请求重新探测。"""
+        self._probing = False
+
+    def record_success(self):
+        self.state, self.failures, self._probing = CLOSED, 0, False
+
+    def record_failure(self) -> bool:
+        """记录一次失败，返回熔断器是否因此打开。"""
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state, self.opened_at, self._probing = OPEN, time.monotonic(), False
+            return True
+        return False
+
+
+class HostCircuitBreakers:
+    """
+    按主机划分的熔断器集合，与 HostRateLimiter 一样每个主机独立，调度器也据此跳过熔断中的来源。
+    单个事件循环内的操作都没有 await，因此无需加锁。
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker_for(self, host: str) -> CircuitBreaker:
+        host = host.lower()
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.cooldown)
+        return breaker
+
+    def is_open(self, host: str) -> bool:
+        breaker = self._breakers.get(host.lower())
+        return breaker is not None and breaker.is_open()
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    包装限速传输层，为所有 DownloadStrategy 的请求统一提供容错：
+    - 熔断器打开的主机直接抛出 CircuitOpenError，不再为每篇论文等待完整的超时；
+    - 暂时性错误（超时、连接失败、408/429/5xx）按 RetryPolicy 重试，遵循 Retry-After；
+    - 永久性错误（其他 4xx、无效 URL 等）立即返回或抛出，由策略按“未找到”或错误处理。
+    位于限速层之外，因此每次重试都会重新向令牌桶取令牌。流式响应只在收到响应头之前重试，
+    传输中断由下载器的断点续传处理；续传请求带有 NO_RETRY_EXTENSION，不在这里重复重试。
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, policy: RetryPolicy | None = None,
+                 breakers: HostCircuitBreakers | None = None, metrics=None):
+        self._transport = transport
+        self.policy = policy or RetryPolicy()
+        self.breakers = breakers or HostCircuitBreakers()
+        # 可选的 MetricsRegistry，记录重试次数和熔断次数
+        self.metrics = metrics
+
+    def _failed(self, host: str, breaker: CircuitBreaker):
+        if breaker.record_failure():
+            print(f"   [Circuit] ❌ {host} failed {breaker.failures} time(s) in a row, "
+                  f"skipping it for {breaker.cooldown:.0f}s.")
+            if self.metrics is not None:
+                self.metrics.inc(CIRCUIT_OPENED_TOTAL, host=host)
+
+    async def _wait_before_retry(self, host: str, retry: int, reason: str, delay: float):
+        print(f"   [Retry] 🟡 {reason} from {host}, retrying in {delay:.1f}s ({retry}/{self.policy.max_retries}).")
+        if self.metrics is not None:
+            self.metrics.inc(HTTP_RETRIES_TOTAL, host=host, reason=reason)
+        await asyncio.sleep(delay)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host.lower()
+        breaker = self.breakers.breaker_for(host)
+        retries = self.policy.max_retries if request.method in RETRYABLE_METHODS else 0
+        if request.extensions.get(NO_RETRY_EXTENSION):
+            retries = 0
+        retry = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit open for {host}, retrying after {breaker.remaining():.0f}s", request=request)
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                if not is_transient_error(e):
+                    breaker.release()
+                    raise
+                self._failed(host, breaker)
+                if retry >= retries or breaker.state == OPEN:
+                    raise
+                retry += 1
+                await self._wait_before_retry(host, retry, type(e).__name__, self.policy.backoff(retry))
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+
+            status = response.status_code
+            if status in HOST_FAILURE_STATUS_CODES:
+                self._failed(host, breaker)
+            else:
+                breaker.record_success()
+            if not is_transient_status(status) or retry >= retries or breaker.state == OPEN:
+                return response
+            retry_after = self.policy.retry_after(response)
+            if retry_after is not None and retry_after > self.policy.max_retry_after:
+                return response
+            await response.aclose()
+            retry += 1
+            delay = retry_after if retry_after is not None else self.policy.backoff(retry)
+            await self._wait_before_retry(host, retry, str(status), delay)
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -0,0 +1,89 @@
+# strategies/resolution_cache.py
+import sqlite3
+import threading
+import time
+
+# 默认有效期：找到的链接较稳定，未找到的结果可能随来源收录而变化，因此保留时间更短
+DEFAULT_POSITIVE_TTL = 30 * 24 * 3600
+DEFAULT_NEGATIVE_TTL = 3 * 24 * 3600
+
+
+class ResolutionCache:
+    """
+    持久化的 “标题 -> PDF链接” 解析缓存（SQLite）。
+    以 (标准化标题, 策略名称) 为键，记录该策略解析出的PDF链接；
+    pdf_url 为 NULL 的记录表示该策略未找到这篇论文（负缓存），两类记录使用不同的有效期。
+    """
+
+    def __init__(self, path: str, positive_ttl: float = DEFAULT_POSITIVE_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL):
+        """
+        Args:
+            path (str): SQLite 数据库文件路径，传入 ':memory:' 时仅在本进程内缓存。
+            positive_ttl (float): 成功解析记录的有效期（秒）。
+            negative_ttl (float): 未找到记录的有效期（秒）。
+        """
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS resolutions (
+                    title TEXT NOT NULL,
+                    strategy TEXT NOT NULL,
+                    pdf_url TEXT,
+                    resolved_at REAL NOT NULL,
+                    PRIMARY KEY (title, strategy)
+                )
+                """
+            )
+
+    def _is_fresh(self, pdf_url: str | None, resolved_at: float) -> bool:
+        ttl = self.positive_ttl if pdf_url else self.negative_ttl
+        return time.time() - resolved_at < ttl
+
+    def get(self, normalized_title: str, strategy: str) -> tuple[bool, str | None]:
+        """
+        查询某个策略对该标题的解析结果。
+
+        Returns:
+            tuple[bool, str | None]: (是否命中有效记录, PDF链接)。命中负缓存时返回 (True, None)。
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pdf_url, resolved_at FROM resolutions WHERE title = ? AND strategy = ?",
+                (normalized_title, strategy),
+            ).fetchone()
+        if row is None or not self._is_fresh(*row):
+            return False, None
+        return True, row[0]
+
+    def put(self, normalized_title: str, strategy: str, pdf_url: str | None):
+        """记录解析结果；pdf_url 为 None 时写入负缓存。"""
+        self.put_many([(normalized_title, strategy, pdf_url)])
+
+    def put_many(self, entries: list[tuple[str, str, str | None]]):
+        """批量记录 (标准化标题, 策略名称, PDF链接) 解析结果。"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO resolutions (title, strategy, pdf_url, resolved_at) VALUES (?, ?, ?, ?)",
+                [(title, strategy, pdf_url, now) for title, strategy, pdf_url in entries],
+            )
+
+    def invalidate(self, normalized_title: str, strategy: str):
+        """删除某条记录，例如缓存的链接已失效时。"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM resolutions WHERE title = ? AND strategy = ?",
+                (normalized_title, strategy),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
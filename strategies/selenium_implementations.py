@@ -1,77 +1,249 @@
 # strategies/selenium_implementations.py (XPath Precision)
 import os
+import queue
+import shutil
+import tempfile
+import threading
 import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 # from selenium import webdriver
 import undetected_chromedriver as webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-import re, difflib
+import re
+
+from strategies.download_strategy import extract_doi
+from strategies.download_watcher import DownloadWatcher
+from strategies.driver_pool import DriverPool
+from strategies.title_matching import DEFAULT_MATCH_THRESHOLD, TitleMatcher
+
+
+class DownloadCancelled(BaseException):
+    """
+    Selenium 下载被调度器取消或超过截止时间。
+    继承 BaseException，使选择器循环和各步骤中的 except Exception 不会吞掉取消信号，取消后不再继续操作浏览器。
+    """
+
+
+@dataclass
+class BrowserHandoff:
+    """浏览器查找阶段的结果：PDF链接以及访问它所需的浏览器会话信息。"""
+    pdf_url: str
+    user_agent: str
+    cookies: list[dict] = field(default_factory=list)
+    referer: str | None = None
+    doi: str | None = None
+
+
+class CancellableWait(WebDriverWait):
+    """
+    每次轮询前检查取消标记的 WebDriverWait，使被取消的下载不必等满每个元素的超时时间。
+    """
+
+    def __init__(self, driver, timeout: float, check_cancelled):
+        super().__init__(driver, timeout)
+        self._check_cancelled = check_cancelled
+
+    def until(self, method, message: str = ""):
+        def checked(driver):
+            self._check_cancelled()
+            return method(driver)
+        return super().until(checked, message)
 
 
 class SeleniumDownloadStrategy(ABC):
     """
     使用 Selenium 进行下载的策略抽象基类。
+    download 是阻塞调用，调度器在专用线程池中执行它；调度器可以通过 cancel() 或 deadline
+    让正在进行的下载在下一个等待点提前结束。
     """
 
-    def __init__(self, driver: webdriver.Chrome, save_dir: str):
-        self.driver = driver
+    # 日志与下载清单中使用的来源名称
+    name = "Selenium"
+    # 搜索结果与目标标题的最低相似度，低于此值的结果不会被打开
+    match_threshold = DEFAULT_MATCH_THRESHOLD
+
+    def __init__(self, driver_pool: DriverPool, save_dir: str):
+        """
+        Args:
+            driver_pool (DriverPool): 浏览器池，每次下载时借出一个浏览器。
+            save_dir (str): PDF文件的保存目录。
+        """
+        self.driver_pool = driver_pool
         self.save_directory = save_dir
-        self.wait = WebDriverWait(self.driver, 25)  # 增加等待时间以应对慢速网络
+        # 以下属性只在借出浏览器期间有效
+        self.driver = None
+        self.wait = None
+        self.download_directory = None
+        # 当前这次浏览器下载专用的暂存目录，由 _begin_download 创建
+        self.staging_directory = None
+        # 取消标记与截止时间 (time.monotonic())，由调度器设置
+        self.deadline = None
+        self._cancel_event = threading.Event()
+        # 最近一次解析出PDF链接的论文的 DOI（能确定时），调度器记入下载清单
+        self.last_doi = None
+
+    def cancel(self):
+        """请求取消正在进行的下载（可在其他线程中调用）。"""
+        self._cancel_event.set()
+
+    def _remaining(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def _check_cancelled(self):
+        if self._cancel_event.is_set() or (self.deadline is not None and time.monotonic() >= self.deadline):
+            raise DownloadCancelled()
+
+    def _sleep(self, seconds: float):
+        """可被取消的 sleep。"""
+        if self._cancel_event.wait(seconds):
+            raise DownloadCancelled()
+        self._check_cancelled()
+
+    def _with_driver(self, action, *args):
+        """
+        从浏览器池借出一个浏览器执行 action，结束后立即归还；被取消或借不到浏览器时返回 None。
+        """
+        try:
+            self._check_cancelled()
+            with self.driver_pool.lease(timeout=self._remaining()) as lease:
+                self.driver = lease.driver
+                self.download_directory = lease.download_directory
+                self.wait = CancellableWait(self.driver, 25, self._check_cancelled)  # 增加等待时间以应对慢速网络
+                try:
+                    return action(*args)
+                finally:
+                    self._discard_staging()
+                    self.driver = self.wait = self.download_directory = None
+        except queue.Empty:
+            print(f"   -> [Strategy: {self.name}] 🟡 No browser became available before the deadline.")
+            return None
+        except DownloadCancelled:
+            print(f"   -> [Strategy: {self.name}] 🟡 Download cancelled.")
+            return None
 
-        # 设置页面加载策略，忽略SSL错误
-        self.driver.set_page_load_timeout(30)
-        # 添加忽略SSL错误的参数
-        self.driver.execute_cdp_cmd('Security.setIgnoreCertificateErrors', {'ignore': True})
+    def download(self, original_title: str, filepath: str) -> bool:
+        """
+        从浏览器池借出一个浏览器，尝试使用本策略在浏览器中下载论文，结束后归还浏览器。
+        """
+        return bool(self._with_driver(self._download, original_title, filepath))
+
+    def resolve(self, original_title: str) -> BrowserHandoff | None:
+        """
+        混合模式的查找阶段：只用浏览器完成搜索以及登录/Cloudflare 验证，解析出PDF链接后
+        导出浏览器的 cookies 和 User-Agent 并立即归还浏览器，实际传输交给共享的 httpx 客户端。
+        """
+        return self._with_driver(self._resolve_handoff, original_title)
+
+    def _resolve_handoff(self, original_title: str) -> BrowserHandoff | None:
+        pdf_url = self._resolve(original_title)
+        if not pdf_url:
+            return None
+        return BrowserHandoff(
+            pdf_url=pdf_url,
+            user_agent=self.driver.execute_script("return navigator.userAgent"),
+            cookies=self.driver.get_cookies(),
+            referer=self.driver.current_url,
+            doi=self.last_doi,
+        )
+
+    def _resolve(self, original_title: str) -> str | None:
+        """执行 _resolve_pdf_url，并记录所找到论文的 DOI。"""
+        self.last_doi = None
+        pdf_url = self._resolve_pdf_url(original_title)
+        if pdf_url:
+            self.last_doi = self._page_doi(pdf_url)
+        return pdf_url
+
+    def _page_doi(self, pdf_url: str) -> str | None:
+        """从PDF链接、当前页面的URL或页面元数据（citation_doi 等 meta 标签）中取得 DOI。"""
+        doi = extract_doi(pdf_url) or extract_doi(self.driver.current_url)
+        if doi:
+            return doi
+        try:
+            return extract_doi(self.driver.execute_script("""
+                var meta = document.querySelector('meta[name="citation_doi"], meta[name="dc.Identifier"], meta[name="DC.identifier"]');
+                if (meta) return meta.content;
+                var doc = window.xplGlobal && window.xplGlobal.document && window.xplGlobal.document.metadata;
+                return doc && doc.doi || null;
+            """))
+        except WebDriverException:
+            return None
 
     @abstractmethod
-    def download(self, original_title: str, filepath: str) -> bool:
+    def _resolve_pdf_url(self, original_title: str) -> str | None:
+        """
+        使用已借出的浏览器 (self.driver) 找到论文的PDF链接，未找到时返回 None。
+        """
+        pass
+
+    @abstractmethod
+    def _download(self, original_title: str, filepath: str) -> bool:
         """
-        尝试使用本策略下载论文。
+        使用已借出的浏览器 (self.driver) 尝试下载论文。
         """
         pass
 
+    def _begin_download(self):
+        """
+        在触发浏览器下载之前调用：为这次下载创建一个空的暂存目录，并让浏览器把文件下载到这里。
+        """
+        self._discard_staging()
+        self.staging_directory = tempfile.mkdtemp(prefix="download-", dir=self.download_directory)
+        self.driver.execute_cdp_cmd('Page.setDownloadBehavior', {
+            'behavior': 'allow',
+            'downloadPath': self.staging_directory
+        })
+
+    def _discard_staging(self):
+        if self.staging_directory:
+            shutil.rmtree(self.staging_directory, ignore_errors=True)
+            self.staging_directory = None
+
     def _wait_for_download_and_rename(self, filepath: str, timeout: int = 120) -> bool:
         """
-        一个更健壮的函数，用于等待文件下载完成并重命名。
+        等待 _begin_download 之后触发的下载完成，并把文件移动到 filepath。
+        暂存目录只属于这一次下载，因此检测结果不会与并发的其他下载混淆。
         """
-        initial_files = set(os.listdir(self.save_directory))
-        end_time = time.time() + timeout
+        if not self.staging_directory:
+            self._begin_download()
         print("      [Selenium] Waiting for download to start and complete...")
-        while time.time() < end_time:
-            # 检查是否有临时下载文件
-            is_downloading = any(
-                f.endswith('.crdownload') or f.endswith('.tmp') for f in os.listdir(self.save_directory))
-
-            if not is_downloading:
-                current_files = set(os.listdir(self.save_directory))
-                new_files = current_files - initial_files
-                if new_files:
-                    downloaded_filename = new_files.pop()
-                    # 确保文件已完全写入磁盘
-                    time.sleep(2)
-                    try:
-                        os.rename(os.path.join(self.save_directory, downloaded_filename), filepath)
-                        print(f"      [Selenium] ✅ Download complete and renamed to: {os.path.basename(filepath)}")
-                        return True
-                    except OSError as e:
-                        print(f"      [Selenium] ❌ Error renaming file: {e}")
-                        return False
-            time.sleep(1)
-        print("      [Selenium] 🟡 Timed out waiting for download to complete.")
-        return False
+        remaining = self._remaining()
+        if remaining is not None:
+            timeout = min(timeout, remaining)
+        downloaded = DownloadWatcher(self.staging_directory).wait(timeout, check_cancelled=self._check_cancelled)
+        if not downloaded:
+            print("      [Selenium] 🟡 Timed out waiting for download to complete.")
+            return False
+        # 已被取消的下载不能再覆盖目标文件（其他策略可能已经成功）
+        self._check_cancelled()
+        try:
+            os.replace(downloaded, filepath)
+            print(f"      [Selenium] ✅ Download complete and renamed to: {os.path.basename(filepath)}")
+            return True
+        except OSError as e:
+            print(f"      [Selenium] ❌ Error renaming file: {e}")
+            return False
+        finally:
+            self._discard_staging()
 
 class AcmDlSeleniumDownloader(SeleniumDownloadStrategy):
     """
     [XPath 精确版] 通过 Selenium 从 ACM Digital Library 下载论文。
     """
 
-    def download(self, original_title: str, filepath: str) -> bool:
+    name = "ACM DL"
+
+    def _resolve_pdf_url(self, original_title: str) -> str | None:
         print("   -> [Strategy: ACM DL] Trying to find and download...")
+        matcher = TitleMatcher(original_title, self.match_threshold)
 
         # 1. 访问主页（带重试机制）
         try:
@@ -107,7 +279,7 @@ class AcmDlSeleniumDownloader(SeleniumDownloadStrategy):
                         if search_input:
                             print(f"      [ACM] ✅ 找到搜索框: {selector}")
                             break
-                    except:
+                    except WebDriverException:
                         continue
                 if not search_input:
                     print(
@@ -122,11 +294,11 @@ class AcmDlSeleniumDownloader(SeleniumDownloadStrategy):
                                 if search_input:
                                     print(f"      [ACM] ✅ 找到搜索框: {selector}")
                                     break
-                            except:
+                            except WebDriverException:
                                 continue
                     except TimeoutException:
                         print("      [Selenium-ACM] ❌ Still no search input after waiting. Aborting.")
-                        return False
+                        return None
 
                 search_input.clear()
                 original_title = f'"{original_title}"'
@@ -135,15 +307,15 @@ class AcmDlSeleniumDownloader(SeleniumDownloadStrategy):
                 try:
                     search_input.send_keys(Keys.RETURN)
                     print("      [ACM] ✅ 已提交搜索请求")
-                except:
+                except WebDriverException:
                     try:
                         # 尝试查找并点击搜索按钮
                         search_button = self.driver.find_element(By.CSS_SELECTOR, 'button[type="submit"]')
                         search_button.click()
                         print("      [ACM] ✅ 已点击搜索按钮")
-                    except:
+                    except WebDriverException:
                         print("      [ACM] ❌ 搜索提交失败")
-                        return False
+                        return None
                 # 等待搜索结果加载
                 self.driver.implicitly_wait(5)
 
@@ -152,7 +324,7 @@ class AcmDlSeleniumDownloader(SeleniumDownloadStrategy):
                 try:
                     self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.no-results")))
                     no_results = True
-                except:
+                except WebDriverException:
                     pass
                 if no_results:
                     print("      [ACM] ⚠️ 精确搜索没有结果，尝试普通搜索...")
@@ -166,7 +338,7 @@ class AcmDlSeleniumDownloader(SeleniumDownloadStrategy):
                             search_input = self.wait.until(EC.presence_of_element_located((selector_type, selector)))
                             if search_input:
                                 break
-                        except:
+                        except WebDriverException:
                             continue
 
                     if search_input:
@@ -176,7 +348,7 @@ class AcmDlSeleniumDownloader(SeleniumDownloadStrategy):
                         self.driver.implicitly_wait(3)
                     else:
                         print("      [ACM] ❌ 无法找到搜索框进行普通搜索")
-                        return False
+                        return None
                 # 查找搜索结果
                 result_selectors = [
                     (By.CSS_SELECTOR, ".issue-item__title a"),
@@ -191,35 +363,44 @@ class AcmDlSeleniumDownloader(SeleniumDownloadStrategy):
                         if result_link:
                             result_found = True
                             break
-                    except:
+                    except WebDriverException:
                         continue
                 if not result_found or not result_link:
                     print("      [ACM] ❌ 未找到搜索结果")
-                    return False
-                # 等待并点击第一个结果中的PDF链接
+                    return None
+                # 在搜索结果中选出与标题最相似的一条，相似度不足时不打开任何结果
+                result_items = self.driver.find_elements(By.CSS_SELECTOR, ".issue-item")
+                candidates = []
+                for item in result_items:
+                    titles = item.find_elements(By.CSS_SELECTOR, ".issue-item__title")
+                    if titles:
+                        candidates.append((titles[0].text, item))
+                matched_item = matcher.best(candidates)
+                if matched_item is None:
+                    print("      [ACM] ❌ 搜索结果中没有与标题匹配的论文")
+                    return None
+                # 只在匹配的结果条目内查找PDF链接
                 # 使用更通用的选择器，不依赖于li的位置，只依赖于aria-label属性
                 pdf_button = None
                 pdf_selectors = [
                     (By.CSS_SELECTOR, "a[aria-label='PDF']"),
                     (By.CSS_SELECTOR, "a[aria-label='View PDF']"),
                     (By.CSS_SELECTOR, "a.btn.red[href*='pdf']"),
-                    (By.XPATH, "//a[contains(text(), 'PDF')]")
+                    (By.XPATH, ".//a[contains(text(), 'PDF')]")
                 ]
                 for selector_type, selector in pdf_selectors:
-                    try:
-                        pdf_button = self.wait.until(EC.element_to_be_clickable((selector_type, selector)))
-                        if pdf_button:
-                            print(f"      [ACM] ✅ 找到PDF下载链接: {selector}")
-                            break
-                    except:
-                        continue
+                    buttons = matched_item.find_elements(selector_type, selector)
+                    if buttons:
+                        pdf_button = buttons[0]
+                        print(f"      [ACM] ✅ 找到PDF下载链接: {selector}")
+                        break
                 if not pdf_button:
                     print("      [ACM] ❌ 未找到PDF下载链接，可能需要付费访问")
-                    return False
+                    return None
                 pdf_viewer_url = pdf_button.get_attribute('href')
                 if not pdf_viewer_url:
                     print("      [ACM] ❌ 无法获取PDF链接")
-                    return False
+                    return None
                 self.driver.get(pdf_viewer_url)
                 # --- 核心修正: 处理浏览器内置的PDF阅读器 ---
                 # 3. 等待浏览器加载完PDF阅读器
@@ -228,61 +409,68 @@ class AcmDlSeleniumDownloader(SeleniumDownloadStrategy):
                 print("      [Selenium-ACM] ✅ PDF viewer page loaded.")
                 # 4. 获取当前页面的URL，这就是PDF的直接链接
                 final_pdf_url = self.driver.current_url
-                # 5. 使用高级JS方法强制浏览器下载PDF
-                print("      [Selenium-ACM] 使用增强的JavaScript方法下载PDF...")
-                try:
-                    # 使用强化版的JavaScript注入，阻止浏览器的默认行为
-                    print("      [Selenium-ACM] 使用强化版JavaScript注入...")
-                    script = f"""
-                        // 创建隐藏的iframe来处理下载
-                        var iframe = document.createElement('iframe');
-                        iframe.style.display = 'none';
-                        document.body.appendChild(iframe);
-                        // 在iframe内创建Blob对象
-                        var xhr = new XMLHttpRequest();
-                        xhr.open('GET', '{final_pdf_url}', true);
-                        xhr.responseType = 'blob';
-                        xhr.onload = function() {{
-                            if (xhr.status === 200) {{
-                                // 创建Blob URL
-                                var blob = xhr.response;
-                                var blobUrl = URL.createObjectURL(blob);
-
-                                // 在iframe中创建下载链接
-                                var link = iframe.contentDocument.createElement('a');
-                                link.href = blobUrl;
-                                link.download = '{os.path.basename(filepath)}';
-                                iframe.contentDocument.body.appendChild(link);
-                                link.click();
-
-                                // 清理资源
-                                setTimeout(function() {{
-                                    URL.revokeObjectURL(blobUrl);
-                                    document.body.removeChild(iframe);
-                                }}, 5000);
-                            }}
-                        }};
-                        xhr.send();
-                    """
-                    self.driver.execute_script(script)
-                    # 等待文件下载完成
-                    if self._wait_for_download_and_rename(filepath, timeout=120):
-                        return True
-                except Exception as e2:
-                    print(f"      [Selenium-ACM] ❌ 备用下载方法也失败: {e2}")
-                    return False
+                return final_pdf_url
 
             except (TimeoutException, NoSuchElementException) as e:
                 # 捕获所有查找失败的情况
                 print(
                     f"   -> [Strategy: ACM DL (Selector)] 🟡 Could not find required elements. It might be behind a 'Get Access' wall or page structure changed. Error: {e}")
-                return False
+                return None
             except Exception as e:
                 print(f"   -> [Strategy: ACM DL (Selector)] ❌ An unexpected error occurred: {e}")
-                return False
+                return None
         except Exception as e:
             print(f"   -> [Strategy: ACM DL (Selector)] ❌ An error occurred while trying to access ACM DL: {e}")
+            return None
+
+    def _download(self, original_title: str, filepath: str) -> bool:
+        final_pdf_url = self._resolve(original_title)
+        if not final_pdf_url:
             return False
+        # 5. 使用高级JS方法强制浏览器下载PDF
+        print("      [Selenium-ACM] 使用增强的JavaScript方法下载PDF...")
+        try:
+            # 使用强化版的JavaScript注入，阻止浏览器的默认行为
+            print("      [Selenium-ACM] 使用强化版JavaScript注入...")
+            script = f"""
+                // 创建隐藏的iframe来处理下载
+                var iframe = document.createElement('iframe');
+                iframe.style.display = 'none';
+                document.body.appendChild(iframe);
+                // 在iframe内创建Blob对象
+                var xhr = new XMLHttpRequest();
+                xhr.open('GET', '{final_pdf_url}', true);
+                xhr.responseType = 'blob';
+                xhr.onload = function() {{
+                    if (xhr.status === 200) {{
+                        // 创建Blob URL
+                        var blob = xhr.response;
+                        var blobUrl = URL.createObjectURL(blob);
+
+                        // 在iframe中创建下载链接
+                        var link = iframe.contentDocument.createElement('a');
+                        link.href = blobUrl;
+                        link.download = '{os.path.basename(filepath)}';
+                        iframe.contentDocument.body.appendChild(link);
+                        link.click();
+
+                        // 清理资源
+                        setTimeout(function() {{
+                            URL.revokeObjectURL(blobUrl);
+                            document.body.removeChild(iframe);
+                        }}, 5000);
+                    }}
+                }};
+                xhr.send();
+            """
+            self._begin_download()
+            self.driver.execute_script(script)
+            # 等待文件下载完成
+            if self._wait_for_download_and_rename(filepath, timeout=120):
+                return True
+        except Exception as e2:
+            print(f"      [Selenium-ACM] ❌ 备用下载方法也失败: {e2}")
+        return False
 
 
 class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
@@ -290,7 +478,9 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
     [XPath 精确版] 通过 Selenium 从 IEEE Xplore 下载论文。
     """
 
-    def download(self, original_title: str, filepath: str) -> bool:
+    name = "IEEE Xplore"
+
+    def _resolve_pdf_url(self, original_title: str) -> str | None:
         print("   -> [Strategy: IEEE Xplore (Selector)] Trying to find and download...")
         try:
             self.driver.get("https://ieeexplore.ieee.org")
@@ -310,7 +500,7 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
                     if search_box:
                         print(f"      [IEEE] ✅ 找到搜索框: {selector}")
                         break
-                except:
+                except WebDriverException:
                     continue
             if not search_box:
                 print("      [IEEE] ❌ 无法找到搜索框，尝试刷新页面")
@@ -323,11 +513,11 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
                         if search_box:
                             print(f"      [IEEE] ✅ 刷新后找到搜索框: {selector}")
                             break
-                    except:
+                    except WebDriverException:
                         continue
             if not search_box:
                 print("      [IEEE] ❌ 多次尝试后仍无法找到搜索框，可能是页面结构变化")
-                return False
+                return None
 
             try:
                 search_box.clear()
@@ -336,7 +526,7 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
                 print("      [IEEE] ✅ 已输入搜索内容")
             except Exception as e:
                 print(f"      [IEEE] ❌ 无法输入搜索内容: {e}")
-                return False
+                return None
 
             # 查找搜索按钮
             search_button = None
@@ -352,7 +542,7 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
                     if search_button:
                         print(f"      [IEEE] ✅ 找到搜索按钮: {selector}")
                         break
-                except:
+                except WebDriverException:
                     continue
             if search_button:
                 try:
@@ -364,47 +554,57 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
                     try:
                         search_box.send_keys(Keys.RETURN)
                         print("      [IEEE] ✅ 使用回车键提交搜索")
-                    except:
+                    except WebDriverException:
                         print("      [IEEE] ❌ 搜索提交失败")
-                        return False
+                        return None
             else:
                 # 如果找不到按钮，使用回车键
                 try:
                     search_box.send_keys(Keys.RETURN)
                     print("      [IEEE] ✅ 使用回车键提交搜索")
-                except:
+                except WebDriverException:
                     print("      [IEEE] ❌ 无法提交搜索")
-                    return False
+                    return None
 
             self.driver.implicitly_wait(5)  # 等待搜索结果加载
             print("      [IEEE] 等待搜索结果加载完成...")
-            # 通用 XPath，用于定位第一个结果中的PDF链接
-            # 查找PDF下载链接
+            # 在搜索结果中选出与标题最相似的一条，只在该条目内查找PDF下载链接
+            try:
+                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, 'xpl-results-item')))
+            except TimeoutException:
+                print("      [IEEE] ❌ 未找到搜索结果")
+                return None
+            candidates = []
+            for item in self.driver.find_elements(By.TAG_NAME, 'xpl-results-item'):
+                titles = item.find_elements(By.CSS_SELECTOR, 'h3')
+                if titles:
+                    candidates.append((titles[0].text, item))
+            matched_item = TitleMatcher(original_title, self.match_threshold).best(candidates)
+            if matched_item is None:
+                print("      [IEEE] ❌ 搜索结果中没有与标题匹配的论文")
+                return None
             pdf_button = None
             pdf_selectors = [
-                (By.XPATH, '(//xpl-results-item//a[contains(@href, "stamp.jsp")])[1]'),
                 (By.CSS_SELECTOR, 'a[href*="stamp.jsp"]'),
                 (By.CSS_SELECTOR, '.pdf-btn-container a')
             ]
             for selector_type, selector in pdf_selectors:
-                try:
-                    pdf_button = self.wait.until(EC.element_to_be_clickable((selector_type, selector)))
-                    if pdf_button:
-                        print(f"      [IEEE] ✅ 找到PDF下载链接: {selector}")
-                        break
-                except:
-                    continue
+                buttons = matched_item.find_elements(selector_type, selector)
+                if buttons:
+                    pdf_button = buttons[0]
+                    print(f"      [IEEE] ✅ 找到PDF下载链接: {selector}")
+                    break
             print("      [Selenium-IEEE] ✅ Found PDF button via generic XPath, clicking to download...")
 
             if not pdf_button:
                 print("      [IEEE] ❌ 未找到PDF下载链接，可能没有搜索结果或需要付费访问")
-                return False
+                return None
             # 获取PDF链接但先不点击
             # 获取PDF链接
             pdf_viewer_url = pdf_button.get_attribute('href')
             if not pdf_viewer_url:
                 print("      [IEEE] ❌ PDF链接获取失败")
-                return False
+                return None
 
             print(f"      [IEEE] 获取到PDF链接: {pdf_viewer_url}")
 
@@ -421,37 +621,48 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
             # 检查是否遇到了登录页面或错误页面
             if any(keyword in page_title for keyword in ['login', 'sign in', 'access denied', 'error']):
                 print(f"      [IEEE] ❌ 检测到登录或错误页面，页面标题: {self.driver.title}")
-                return False
+                return None
 
             if any(keyword in page_source_snippet for keyword in
                    ['login', 'sign in', 'access denied', 'subscription required']):
                 print("      [IEEE] ❌ 检测到访问限制页面")
-                return False
-
-            # 尝试使用键盘快捷键下载PDF
-            print("      [IEEE] 尝试使用键盘快捷键下载PDF...")
-            success = self._try_keyboard_download(filepath)
-            if success:
-                return True
+                return None
 
-            # 最后尝试右键菜单下载
-            success = self._try_context_menu_download(filepath)
-            if success:
-                return True
-
-            print("      [IEEE] ❌ 所有下载方法都失败")
-            return False
+            # 浏览器停留在 stamp.jsp 阅读器页面；真正的PDF由 getPDF.jsp 按 arnumber 提供
+            arnumber = re.search(r'arnumber=(\d+)', pdf_viewer_url)
+            if arnumber:
+                return f"https://ieeexplore.ieee.org/stampPDF/getPDF.jsp?tp=&arnumber={arnumber.group(1)}&ref="
+            return pdf_viewer_url
 
         except TimeoutException:
             print(
                 "   -> [Strategy: IEEE Xplore (Selector)] 🟡 Timed out waiting for elements. Check for CAPTCHA or login.")
-            return False
+            return None
         except Exception as e:
             print(f"   -> [Strategy: IEEE Xplore (Selector)] ❌ An error occurred: {e}")
+            return None
+
+    def _download(self, original_title: str, filepath: str) -> bool:
+        if not self._resolve(original_title):
             return False
 
+        # 尝试使用键盘快捷键下载PDF
+        print("      [IEEE] 尝试使用键盘快捷键下载PDF...")
+        success = self._try_keyboard_download(filepath)
+        if success:
+            return True
+
+        # 最后尝试右键菜单下载
+        success = self._try_context_menu_download(filepath)
+        if success:
+            return True
+
+        print("      [IEEE] ❌ 所有下载方法都失败")
+        return False
+
     def _try_keyboard_download(self, filepath: str) -> bool:
         """尝试使用键盘快捷键下载PDF"""
+        self._check_cancelled()
         print("      [IEEE] 尝试键盘快捷键下载方法...")
 
         try:
@@ -462,6 +673,7 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
             self.driver.implicitly_wait(3)
 
             # 方法1: 使用ActionChains发送Ctrl+S
+            self._begin_download()
             actions = ActionChains(self.driver)
             actions.key_down(Keys.CONTROL).send_keys('s').key_up(Keys.CONTROL).perform()
             print("      [IEEE] 已发送Ctrl+S快捷键")
@@ -479,6 +691,7 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
 
             # 方法2: 如果Ctrl+S不行，尝试使用JavaScript触发下载
             print("      [IEEE] 尝试JavaScript触发保存...")
+            self._begin_download()
             self.driver.execute_script("""
                 // 尝试触发浏览器的保存功能
                 if (window.print) {
@@ -508,10 +721,12 @@ class IeeeSeleniumDownloader(SeleniumDownloadStrategy):
 
     def _try_context_menu_download(self, filepath: str) -> bool:
         """尝试使用右键菜单下载"""
+        self._check_cancelled()
         print("      [IEEE] 尝试右键菜单下载方法...")
 
         try:
             # 在页面中央右键点击
+            self._begin_download()
             actions = ActionChains(self.driver)
 
             # 获取页面中心位置
@@ -0,0 +1,124 @@
+# strategies/strategy_stats.py
+import sqlite3
+import threading
+import time
+
+# 没有任何记录时，对单次尝试的耗时（秒）和成功率的先验估计
+DEFAULT_PRIOR_SECONDS = {'httpx': 5.0, 'selenium': 60.0}
+DEFAULT_PRIOR_SUCCESS = 0.5
+# 先验相当于多少次观测：观测次数越多，先验的影响越小
+DEFAULT_PRIOR_WEIGHT = 2.0
+# 会议映射指定的主要来源在先验中假定的成功率
+PRIMARY_PRIOR_SUCCESS = 0.9
+
+
+class StrategyStats:
+    """
+    持久化的策略统计（SQLite）。
+    以 (会议, 策略名称) 为键，记录尝试次数、成功次数和尝试的总耗时，
+    并据此按“期望找到论文的成本”对策略队列重新排序。
+    """
+
+    def __init__(self, path: str, min_samples: int = 20, prior_weight: float = DEFAULT_PRIOR_WEIGHT):
+        """
+        Args:
+            path (str): SQLite 数据库文件路径，传入 ':memory:' 时仅在本进程内统计。
+            min_samples (int): 某个会议累计的尝试次数达到此值后才调整策略顺序，此前保持默认顺序。
+            prior_weight (float): 先验估计相当于的观测次数。
+        """
+        self.path = path
+        self.min_samples = min_samples
+        self.prior_weight = prior_weight
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS strategy_stats (
+                    conference TEXT NOT NULL,
+                    strategy TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    successes INTEGER NOT NULL,
+                    seconds REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (conference, strategy)
+                )
+                """
+            )
+
+    def record(self, conference: str, strategy: str, success: bool, seconds: float):
+        """记录一次策略尝试（查找 + 下载）的结果和耗时。"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO strategy_stats (conference, strategy, attempts, successes, seconds, updated_at)
+                VALUES (?, ?, 1, ?, ?, ?)
+                ON CONFLICT (conference, strategy) DO UPDATE SET
+                    attempts = attempts + 1,
+                    successes = successes + excluded.successes,
+                    seconds = seconds + excluded.seconds,
+                    updated_at = excluded.updated_at
+                """,
+                (conference, strategy, int(success), seconds, time.time()),
+            )
+
+    def get(self, conference: str) -> dict[str, tuple[int, int, float]]:
+        """返回某个会议下各策略的 (尝试次数, 成功次数, 总耗时)。"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT strategy, attempts, successes, seconds FROM strategy_stats WHERE conference = ?",
+                (conference,),
+            ).fetchall()
+        return {strategy: (attempts, successes, seconds) for strategy, attempts, successes, seconds in rows}
+
+    def mean_seconds(self) -> dict[str, float]:
+        """返回各策略在所有会议上单次尝试的平均耗时，作为新会议的耗时先验。"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT strategy, SUM(seconds) / SUM(attempts) FROM strategy_stats GROUP BY strategy"
+            ).fetchall()
+        return dict(rows)
+
+    def expected_cost(self, stats: tuple[int, int, float] | None, prior_seconds: float,
+                      prior_success: float) -> float:
+        """
+        期望成本 = 单次尝试的平均耗时 / 成功率。
+        按此值从小到大依次尝试各策略，可以使找到论文的期望总耗时最小；
+        两者都用先验平滑，观测较少的策略不会因为一两次失败就被排到最后。
+        """
+        attempts, successes, seconds = stats or (0, 0, 0.0)
+        weight = self.prior_weight
+        mean_seconds = (seconds + weight * prior_seconds) / (attempts + weight)
+        success_rate = (successes + weight * prior_success) / (attempts + weight)
+        return mean_seconds / max(success_rate, 1e-6)
+
+    def rank(self, conference: str, strategies: list[tuple[str, str]], primary: str | None = None) -> list[str]:
+        """
+        按期望成本对策略重新排序。
+
+        Args:
+            conference (str): 会议键。
+            strategies (list[tuple[str, str]]): 按默认顺序排列的 (策略名称, 类型)，类型为 'httpx' 或 'selenium'。
+            primary (str): 会议映射指定的主要策略名称，先验成功率更高。
+
+        Returns:
+            list[str]: 排序后的策略名称；统计数据不足时保持默认顺序。
+        """
+        names = [name for name, _ in strategies]
+        stats = self.get(conference)
+        if sum(attempts for attempts, _, _ in stats.values()) < self.min_samples:
+            return names
+        global_seconds = self.mean_seconds()
+        costs = {}
+        for name, kind in strategies:
+            prior_seconds = global_seconds.get(name, DEFAULT_PRIOR_SECONDS.get(kind, DEFAULT_PRIOR_SECONDS['httpx']))
+            prior_success = PRIMARY_PRIOR_SUCCESS if name == primary else DEFAULT_PRIOR_SUCCESS
+            costs[name] = self.expected_cost(stats.get(name), prior_seconds, prior_success)
+        # sorted 是稳定排序，成本相同的策略保持默认顺序
+        return sorted(names, key=costs.__getitem__)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,116 @@
+# strategies/title_matching.py
+import re
+from typing import Any, Iterable
+
+# 候选标题与目标标题的默认最低相似度，低于此值的候选不会被下载
+DEFAULT_MATCH_THRESHOLD = 0.85
+
+
+def normalize_title(title: str) -> str:
+    """
+    标题标准化：转小写、去掉标点、合并空白。缓存、清单和批量结果匹配都以它的结果为键。
+    """
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s-]', ' ', title.lower())).strip()
+
+
+def title_tokens(title: str) -> frozenset[str]:
+    """标题的词集合。连字符视为分隔符，使 'pre-training' 与 'pre training' 得到相同的词。"""
+    return frozenset(token for token in re.split(r'[\s\-_]+', normalize_title(title)) if token)
+
+
+def title_similarity(a: str, b: str) -> float:
+    """两个标题的词集合 Jaccard 相似度，取值 0~1。"""
+    tokens_a, tokens_b = title_tokens(a), title_tokens(b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    shared = len(tokens_a & tokens_b)
+    return shared / (len(tokens_a) + len(tokens_b) - shared)
+
+
+class TitleMatcher:
+    """
+    单个目标标题的匹配器。目标标题的词集合只计算一次，之后对每个候选只需一次集合求交。
+    """
+
+    def __init__(self, title: str, threshold: float = DEFAULT_MATCH_THRESHOLD):
+        self.title = normalize_title(title)
+        self.tokens = title_tokens(self.title)
+        self.threshold = threshold
+
+    def score(self, candidate_title: str) -> float:
+        tokens = title_tokens(candidate_title)
+        if not tokens or not self.tokens:
+            return 0.0
+        shared = len(self.tokens & tokens)
+        return shared / (len(self.tokens) + len(tokens) - shared)
+
+    def rank(self, candidates: Iterable[tuple[str, Any]]) -> list[tuple[float, Any]]:
+        """
+        为 (候选标题, 附带数据) 打分，返回达到阈值的 (得分, 附带数据)，按得分从高到低排序；
+        得分相同时保持候选原有的顺序（即来源站点的相关度排序）。
+        """
+        scored = []
+        for candidate_title, payload in candidates:
+            score = self.score(candidate_title)
+            if score >= self.threshold:
+                scored.append((score, payload))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored
+
+    def best(self, candidates: Iterable[tuple[str, Any]]) -> Any | None:
+        """得分最高且达到阈值的候选的附带数据，没有时返回 None。"""
+        ranked = self.rank(candidates)
+        return ranked[0][1] if ranked else None
+
+
+class BatchTitleMatcher:
+    """
+    多个目标标题的匹配器，用于批量查询的结果匹配。
+    以词为键建立目标标题的倒排索引，每个候选只与至少共享一个词的目标比较，
+    一次遍历即可统计出与所有相关目标的共享词数，因此每个标题数百个候选的排序也很快。
+    """
+
+    def __init__(self, titles: Iterable[str], threshold: float = DEFAULT_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._sizes: dict[str, int] = {}
+        self._postings: dict[str, list[str]] = {}
+        for title in titles:
+            tokens = title_tokens(title)
+            if not tokens:
+                continue
+            self._sizes[title] = len(tokens)
+            for token in tokens:
+                self._postings.setdefault(token, []).append(title)
+
+    def scores(self, candidate_title: str) -> dict[str, float]:
+        """候选标题与各目标标题的相似度，只返回达到阈值的目标。"""
+        tokens = title_tokens(candidate_title)
+        shared: dict[str, int] = {}
+        for token in tokens:
+            for title in self._postings.get(token, ()):
+                shared[title] = shared.get(title, 0) + 1
+        result = {}
+        for title, count in shared.items():
+            score = count / (self._sizes[title] + len(tokens) - count)
+            if score >= self.threshold:
+                result[title] = score
+        return result
+
+    def match(self, candidates: Iterable[tuple[str, Any]],
+              best: dict[str, tuple[float, Any]] | None = None) -> dict[str, tuple[float, Any]]:
+        """
+        把 (候选标题, 附带数据) 匹配到目标标题，为每个目标保留得分最高的候选。
+
+        Args:
+            candidates: 候选列表。
+            best (dict): 之前各页结果的匹配，传入时原地更新，便于分页累积。
+
+        Returns:
+            dict: 目标标题 -> (得分, 附带数据)。
+        """
+        best = {} if best is None else best
+        for candidate_title, payload in candidates:
+            for title, score in self.scores(candidate_title).items():
+                if score > best.get(title, (0.0, None))[0]:
+                    best[title] = (score, payload)
+        return best
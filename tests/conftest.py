@@ -0,0 +1,39 @@
+import httpx
+import pytest
+
+from paper_crawler import PaperCrawler
+
+
+def make_pdf(size: int = 4096, seed: bytes = b'') -> bytes:
+    """构造能通过 PDF 校验（%PDF- 魔数和 %%EOF 结束标记）的内容。"""
+    body = b'%PDF-1.4\n' + seed + b'\n'
+    return body + b'0' * max(0, size - len(body) - 6) + b'\n%%EOF'
+
+
+def arxiv_feed(entries: list[tuple[str, str]], total: int | None = None) -> str:
+    """构造 arXiv API 的 Atom 响应，entries 为 (标题, arXiv 编号)。"""
+    items = ''.join(
+        f'<entry><title>{title}</title><id>http://arxiv.org/abs/{arxiv_id}v1</id>'
+        f'<link title="pdf" href="http://arxiv.org/pdf/{arxiv_id}v1" rel="related" type="application/pdf"/></entry>'
+        for title, arxiv_id in entries
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+            f'<opensearch:totalResults>{len(entries) if total is None else total}</opensearch:totalResults>'
+            f'{items}</feed>')
+
+
+@pytest.fixture
+def make_crawler(tmp_path):
+    """用 MockTransport 代替网络创建爬虫，测试结束时统一关闭。"""
+    crawlers = []
+
+    def factory(handler, **kwargs):
+        kwargs.setdefault('request_delay', 0)
+        crawler = PaperCrawler(str(tmp_path / 'papers'), transport=httpx.MockTransport(handler), **kwargs)
+        crawlers.append(crawler)
+        return crawler
+
+    yield factory
+    for crawler in crawlers:
+        crawler.close()
@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+import httpx
+
+from strategies.batch_resolver import BatchResolver, UNDETERMINED
+from strategies.implementations import ArxivDownloader, CoreDownloader
+from strategies.title_matching import normalize_title
+from tests.conftest import arxiv_feed
+
+RESNET = normalize_title('Deep Residual Learning for Image Recognition')
+BERT = normalize_title('BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding')
+
+
+def run_with(handler, make_downloader, coro_for):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+            return await coro_for(make_downloader(session))
+    return asyncio.run(run())
+
+
+def test_arxiv_or_query_maps_results_back_to_titles(tmp_path):
+    queries = []
+
+    def handler(request):
+        queries.append(request.url.params['search_query'])
+        # 结果顺序与查询顺序无关
+        return httpx.Response(200, text=arxiv_feed([
+            ('BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding', '1810.04805'),
+            ('Deep Residual Learning for Image Recognition', '1512.03385'),
+        ]))
+
+    results = run_with(handler, lambda session: ArxivDownloader(session, str(tmp_path)),
+                       lambda downloader: downloader.resolve_many([RESNET, BERT]))
+    assert queries == [f'ti:"{RESNET}" OR ti:"{BERT}"']
+    assert results == {RESNET: 'http://arxiv.org/pdf/1512.03385v1', BERT: 'http://arxiv.org/pdf/1810.04805v1'}
+
+
+def test_arxiv_match_below_threshold_returns_nothing(tmp_path):
+    # 6 个词中共享 5 个：Jaccard 相似度 5/7 ≈ 0.71 < 0.85
+    feed = arxiv_feed([('Deep Residual Learning for Video Recognition', '9999.00001')])
+    results = run_with(lambda request: httpx.Response(200, text=feed),
+                       lambda session: ArxivDownloader(session, str(tmp_path)),
+                       lambda downloader: downloader.resolve_many([RESNET]))
+    assert results == {RESNET: None}
+    pdf_url = run_with(lambda request: httpx.Response(200, text=feed),
+                       lambda session: ArxivDownloader(session, str(tmp_path)),
+                       lambda downloader: downloader.resolve_pdf_url(RESNET))
+    assert pdf_url is None
+
+
+def test_arxiv_truncated_results_leave_titles_undetermined(tmp_path):
+    def handler(request):
+        return httpx.Response(200, text=arxiv_feed([('Unrelated paper', '0000.00001')], total=10_000))
+
+    def make(session):
+        downloader = ArxivDownloader(session, str(tmp_path))
+        downloader.max_pages = 1
+        return downloader
+
+    # 分页上限截断了结果，没找到的标题不能确认为未收录
+    assert run_with(handler, make, lambda downloader: downloader.resolve_many([RESNET])) == {}
+
+
+def test_core_or_query_maps_results_and_dois(tmp_path):
+    queries = []
+
+    def handler(request):
+        queries.append(json.loads(request.content)['q'])
+        return httpx.Response(200, json={'totalHits': 3, 'results': [
+            {'title': 'Deep residual learning for image recognition', 'downloadUrl': 'https://core.ac.uk/1.pdf',
+             'doi': '10.1109/CVPR.2016.90'},
+            {'title': 'Deep Residual Learning for Video Recognition', 'downloadUrl': 'https://core.ac.uk/2.pdf'},
+            {'title': 'BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding',
+             'downloadUrl': 'https://core.ac.uk/3.pdf'},
+        ]})
+
+    def make(session):
+        return CoreDownloader(session, str(tmp_path), 'key')
+
+    async def resolve(downloader):
+        return await downloader.resolve_many([RESNET, BERT]), downloader
+
+    results, downloader = run_with(handler, make, resolve)
+    assert queries == [f'title:("{RESNET}") OR title:("{BERT}")']
+    assert results == {RESNET: 'https://core.ac.uk/1.pdf', BERT: 'https://core.ac.uk/3.pdf'}
+    assert downloader.doi_for('https://core.ac.uk/1.pdf') == '10.1109/CVPR.2016.90'
+
+
+def test_batch_resolver_coalesces_concurrent_lookups(tmp_path):
+    queries = []
+
+    def handler(request):
+        queries.append(request.url.params['search_query'])
+        return httpx.Response(200, text=arxiv_feed([('Deep Residual Learning for Image Recognition', '1512.03385')]))
+
+    async def resolve_concurrently(downloader):
+        resolver = BatchResolver(downloader, batch_window=0.01)
+        try:
+            return await asyncio.gather(resolver.resolve(RESNET), resolver.resolve(BERT), resolver.resolve(RESNET))
+        finally:
+            await resolver.aclose()
+
+    results = run_with(handler, lambda session: ArxivDownloader(session, str(tmp_path)), resolve_concurrently)
+    assert len(queries) == 1 and ' OR ' in queries[0]
+    assert results == ['http://arxiv.org/pdf/1512.03385v1', None, 'http://arxiv.org/pdf/1512.03385v1']
+    assert UNDETERMINED not in results
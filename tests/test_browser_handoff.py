@@ -0,0 +1,57 @@
+import os
+
+import httpx
+
+from strategies.implementations import BrowserSessionDownloader, browser_cookie_jar
+from tests.conftest import make_pdf
+
+BROWSER_COOKIES = [
+    {'name': 'session', 'value': 'abc', 'domain': '.acm.org', 'path': '/'},
+    {'name': 'cf_clearance', 'value': 'xyz', 'domain': 'dl.acm.org', 'path': '/'},
+    {'name': 'tracker', 'value': 'leak', 'domain': '.example.com', 'path': '/'},
+]
+
+
+def test_browser_cookie_jar_keeps_domain_scope():
+    jar = browser_cookie_jar(BROWSER_COOKIES)
+    request = httpx.Request('GET', 'https://cdn.acm.org/file.pdf')
+    jar.set_cookie_header(request)
+    assert request.headers['Cookie'] == 'session=abc'
+
+
+def test_handoff_cookies_survive_redirects(make_crawler):
+    pdf = make_pdf()
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, request.headers.get('Cookie', '')))
+        if request.url.path == '/doi/pdf/10.1145/1':
+            return httpx.Response(302, headers={
+                'Location': 'https://dl.acm.org/doi/pdf/10.1145/1/download',
+                'Set-Cookie': 'publisher=1; Path=/',
+            })
+        return httpx.Response(200, content=pdf)
+
+    crawler = make_crawler(handler)
+    filepath = os.path.join(crawler.save_directory, 'paper.pdf')
+
+    async def run():
+        downloader = BrowserSessionDownloader(
+            crawler._handoff_session(BROWSER_COOKIES), crawler.save_directory, 'ACM',
+            'https://dl.acm.org/doi/pdf/10.1145/1', 'Mozilla/5.0', 'https://dl.acm.org/doi/10.1145/1',
+        )
+        ok = await downloader.download_resolved('paper', downloader.pdf_url, filepath)
+        return ok, crawler._get_session().cookies
+
+    ok, shared_cookies = crawler.run_coroutine(run())
+
+    assert ok
+    with open(filepath, 'rb') as f:
+        assert f.read() == pdf
+    # 重定向后的最后一跳仍然带着浏览器 cookies，其他域名的 cookie 不会发出
+    final_path, final_cookies = seen[-1]
+    assert final_path == '/doi/pdf/10.1145/1/download'
+    assert 'session=abc' in final_cookies and 'cf_clearance=xyz' in final_cookies
+    assert 'tracker' not in final_cookies
+    # 出版商的 Set-Cookie 只留在交接客户端里
+    assert 'publisher' not in shared_cookies
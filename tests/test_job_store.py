@@ -0,0 +1,177 @@
+import os
+import threading
+
+import pytest
+
+import job_store
+from benchmarks.stand_ins import LocalPipeline, LocalRedis
+from job_store import DONE, FAILED, LEASE_EXPIRED_REASON, PENDING, RESOLVING, JobStore, RedisJobStore
+
+PAPERS = [{'title': f'Paper number {i}', 'conference': 'CVPR'} for i in range(5)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(job_store, 'time', clock)
+    return clock
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def store(request, tmp_path):
+    if request.param == 'sqlite':
+        store = JobStore(str(tmp_path / 'jobs.sqlite3'), max_attempts=2, backoff_base=10.0)
+    else:
+        store = RedisJobStore(LocalRedis(), max_attempts=2, backoff_base=10.0)
+    yield store
+    store.close()
+
+
+def test_claim_hands_each_job_out_once(store, clock):
+    assert store.add(PAPERS) == 5
+    assert store.add(PAPERS) == 0
+    first = store.claim(3, worker='a', lease_seconds=60)
+    second = store.claim(3, worker='b', lease_seconds=60)
+    assert len(first) == 3 and len(second) == 2
+    assert {job['id'] for job in first}.isdisjoint(job['id'] for job in second)
+    assert all(job['state'] == RESOLVING and job['attempts'] == 1 for job in first + second)
+    assert store.claim(1, worker='c', lease_seconds=60) == []
+    assert store.counts()[RESOLVING] == 5
+
+
+def test_renewed_lease_does_not_expire(store, clock):
+    store.add(PAPERS[:1])
+    [job] = store.claim(1, worker='a', lease_seconds=60)
+    clock.now += 50
+    assert store.renew([job['id']], 'a', 60) == 1
+    assert store.renew([job['id']], 'b', 60) == 0
+    clock.now += 50
+    assert store.claim(1, worker='b', lease_seconds=60) == []
+
+
+def test_expired_lease_is_reclaimed(store, clock):
+    store.add(PAPERS[:1])
+    [job] = store.claim(1, worker='a', lease_seconds=60)
+    clock.now += 61
+    [reclaimed] = store.claim(1, worker='b', lease_seconds=60)
+    assert reclaimed['id'] == job['id'] and reclaimed['worker'] == 'b' and reclaimed['attempts'] == 2
+    # 原工作进程的迟到结果不再生效
+    assert store.fail(job['id'], 'timeout', worker='a') is False
+    store.complete(reclaimed['id'], '/tmp/paper.pdf', 'CVF', 1024, 'ab' * 32, worker='b')
+    assert store.counts()[DONE] == 1 and store.counts()[RESOLVING] == 0
+    assert [finished['id'] for finished in store.finished()] == [job['id']]
+
+
+def test_expired_lease_at_max_attempts_fails(store, clock):
+    store.add(PAPERS[:1])
+    for worker in ('a', 'b'):
+        assert store.claim(1, worker=worker, lease_seconds=60)
+        clock.now += 61
+    assert store.claim(1, worker='c', lease_seconds=60) == []
+    counts = store.counts()
+    assert counts[FAILED] == 1 and counts[RESOLVING] == 0
+    [job] = store.finished()
+    assert job['reason'] == LEASE_EXPIRED_REASON
+
+
+def test_fail_backs_off_until_max_attempts(store, clock):
+    store.add(PAPERS[:1])
+    [job] = store.claim(1, worker='a', lease_seconds=60)
+    assert store.fail(job['id'], 'not found', worker='a') is True
+    # 退避期间不可领取
+    assert store.claim(1, worker='a', lease_seconds=60) == []
+    assert store.next_retry_at() > clock.now
+    clock.now += 10
+    [job] = store.claim(1, worker='a', lease_seconds=60)
+    assert job['attempts'] == 2
+    assert store.fail(job['id'], 'not found', worker='a') is False
+    clock.now += 3600
+    assert store.claim(1, worker='a', lease_seconds=60) == []
+    assert store.counts()[FAILED] == 1
+    [finished] = store.finished()
+    assert finished['reason'] == 'not found'
+
+
+def test_recover_requeues_only_own_jobs(store, clock):
+    store.add(PAPERS[:2])
+    store.claim(1, worker='a', lease_seconds=60)
+    store.claim(1, worker='b', lease_seconds=60)
+    assert store.recover('a') == 1
+    counts = store.counts()
+    assert counts[PENDING] == 1 and counts[RESOLVING] == 1
+    [job] = store.claim(1, worker='c', lease_seconds=60)
+    assert job['attempts'] == 2
+
+
+class WorkerKilled(BaseException):
+    pass
+
+
+def test_worker_killed_mid_claim_loses_nothing(monkeypatch, clock):
+    store = RedisJobStore(LocalRedis(), max_attempts=2)
+    store.add(PAPERS)
+    execute = LocalPipeline.execute
+
+    def killed_before_exec(pipe):
+        if pipe._watched:
+            raise WorkerKilled()
+        return execute(pipe)
+
+    # 工作进程在读取可领取任务之后、EXEC 之前被杀死
+    monkeypatch.setattr(LocalPipeline, 'execute', killed_before_exec)
+    with pytest.raises(WorkerKilled):
+        store.claim(5, worker='a', lease_seconds=60)
+    monkeypatch.setattr(LocalPipeline, 'execute', execute)
+
+    assert store.counts()[PENDING] == 5
+    jobs = store.claim(5, worker='b', lease_seconds=60)
+    assert len(jobs) == 5 and all(job['attempts'] == 1 for job in jobs)
+    assert store.counts() == {PENDING: 0, RESOLVING: 5, 'downloading': 0, DONE: 0, FAILED: 0}
+
+
+def test_concurrent_claims_keep_counts_consistent():
+    store = RedisJobStore(LocalRedis())
+    store.add({'title': f'Paper {i}'} for i in range(200))
+    claimed = []
+
+    def worker(name):
+        while jobs := store.claim(3, worker=name, lease_seconds=60):
+            claimed.extend(job['id'] for job in jobs)
+            for job in jobs:
+                store.complete(job['id'], f"/tmp/{job['id']}.pdf", worker=name)
+
+    threads = [threading.Thread(target=worker, args=(f'w{i}',)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == sorted(set(claimed)) and len(claimed) == 200
+    assert store.counts()[DONE] == 200 and sum(store.counts().values()) == 200
+
+
+def test_crawler_opens_job_store_on_first_use(make_crawler):
+    crawler = make_crawler(lambda request: None)
+    path = crawler.job_store_path
+    assert crawler.job_store is None and not os.path.exists(path)
+    crawler.enqueue(PAPERS[:1])
+    assert os.path.exists(path) and crawler.job_store.counts()[PENDING] == 1
+
+
+def test_cli_status_without_queue_creates_nothing(tmp_path, capsys):
+    from papercrawler.__main__ import main
+
+    missing = tmp_path / 'missing'
+    assert main(['--status', '-d', str(missing)]) == 1
+    assert not missing.exists()
+    tmp_path.joinpath('papers').mkdir()
+    assert main(['--export', '-d', str(tmp_path / 'papers')]) == 1
+    assert not (tmp_path / 'papers' / '.jobs.sqlite3').exists()
+    assert 'No job queue' in capsys.readouterr().err
@@ -0,0 +1,54 @@
+import io
+import os
+
+import httpx
+
+from papercrawler.inputs import read_bibtex, read_jsonl
+
+from tests.conftest import arxiv_feed, make_pdf
+
+
+def seed_manifest(crawler, title: str, doi: str) -> str:
+    """在清单中放入一篇已下载的论文，返回其文件路径。"""
+    path = os.path.join(crawler.save_directory, 'Original title.pdf')
+    with open(path, 'wb') as f:
+        f.write(make_pdf())
+    crawler.manifest.record(crawler._normalize_title(title), path, 'arXiv', doi)
+    return path
+
+
+def test_input_doi_reuses_paper_downloaded_under_another_title(make_crawler):
+    requests = []
+    crawler = make_crawler(lambda request: requests.append(request) or httpx.Response(404), core_api_key='')
+    path = seed_manifest(crawler, 'Original title', '10.1145/3580305.3599999')
+
+    result = crawler.download_paper('A preprint title', doi='https://doi.org/10.1145/3580305.3599999')
+    assert result == path and requests == []
+    # 新标题也记入清单，之后按标题直接命中
+    assert crawler.manifest.get(crawler._normalize_title('A preprint title'))['path'] == path
+
+
+def test_resolved_doi_skips_the_download(make_crawler):
+    pdf_requests = []
+
+    def handler(request):
+        if request.url.host == 'export.arxiv.org':
+            return httpx.Response(200, text=arxiv_feed([('Attention Is All You Need', '1706.03762')]))
+        pdf_requests.append(request)
+        return httpx.Response(200, content=make_pdf(seed=b'other'))
+
+    crawler = make_crawler(handler, core_api_key='')
+    path = seed_manifest(crawler, 'Transformer paper', '10.48550/arXiv.1706.03762')
+
+    assert crawler.download_paper('Attention Is All You Need') == path
+    assert pdf_requests == []
+    assert [name for name in os.listdir(crawler.save_directory) if name.endswith('.pdf')] == ['Original title.pdf']
+
+
+def test_inputs_carry_doi():
+    bibtex = io.StringIO('@inproceedings{key,\n  title = {A {Paper}},\n  booktitle = {CVPR},\n'
+                         '  doi = {10.1109/CVPR.2023.00001}\n}\n')
+    [paper] = read_bibtex(bibtex)
+    assert paper['doi'] == '10.1109/CVPR.2023.00001'
+    [paper] = read_jsonl(io.StringIO('{"title": "A paper", "doi": "10.1145/1"}\n'))
+    assert paper['doi'] == '10.1145/1'
@@ -0,0 +1,102 @@
+import asyncio
+import os
+
+import httpx
+
+from manifest import is_pdf_file
+from strategies.implementations import BrowserSessionDownloader
+from tests.conftest import make_pdf
+
+PDF_URL = 'https://example.org/paper.pdf'
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """分块发送响应体，并记录实际被读取的块数。"""
+
+    def __init__(self, data: bytes, chunk_size: int = 512):
+        self.chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+        self.sent = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+def download(tmp_path, handler, max_pdf_size=None, max_resume_attempts=3):
+    filepath = str(tmp_path / 'paper.pdf')
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+            downloader = BrowserSessionDownloader(session, str(tmp_path), 'Test', PDF_URL, 'Mozilla/5.0')
+            if max_pdf_size is not None:
+                downloader.max_pdf_size = max_pdf_size
+            ok = await downloader._download_pdf_from_url(PDF_URL, filepath, max_resume_attempts)
+            return ok, downloader.last_transfer
+    ok, transfer = asyncio.run(run())
+    return ok, transfer, filepath
+
+
+def test_valid_pdf_is_saved(tmp_path):
+    pdf = make_pdf()
+    ok, transfer, filepath = download(tmp_path, lambda request: httpx.Response(200, content=pdf))
+    assert ok and transfer['outcome'] == 'success' and is_pdf_file(filepath)
+
+
+def test_html_body_is_rejected_early(tmp_path):
+    html = b'<html><body>' + b'<p>Please log in</p>' * 5000 + b'</body></html>'
+    stream = ChunkedStream(html)
+    ok, transfer, filepath = download(
+        tmp_path, lambda request: httpx.Response(200, headers={'Content-Type': 'application/pdf'}, stream=stream))
+    assert not ok and transfer['outcome'] == 'invalid_pdf'
+    # 读取约 1KB 后即中止，不会下载整个页面
+    assert stream.sent < len(stream.chunks) and transfer['bytes'] <= 2048
+    assert not os.path.exists(filepath) and not os.path.exists(filepath + '.part')
+
+
+def test_pdf_without_trailer_is_rejected_and_discarded(tmp_path):
+    truncated = make_pdf()[:-6]
+    ok, transfer, filepath = download(tmp_path, lambda request: httpx.Response(200, content=truncated))
+    assert not ok and transfer['outcome'] == 'invalid_pdf' and '%%EOF' in transfer['error']
+    assert not os.path.exists(filepath) and not os.path.exists(filepath + '.part')
+
+
+def test_connection_closed_early_keeps_part_file(tmp_path):
+    pdf = make_pdf()
+    ok, transfer, filepath = download(
+        tmp_path,
+        lambda request: httpx.Response(200, headers={'Content-Length': str(len(pdf))}, content=pdf[:1500]),
+        max_resume_attempts=0,
+    )
+    assert not ok and transfer['outcome'] == 'interrupted'
+    # 截断的数据留在 .part 中等待续传，不会出现在最终路径
+    assert not os.path.exists(filepath)
+    assert os.path.getsize(filepath + '.part') == 1500
+
+
+def test_declared_size_over_cap_is_rejected_before_body(tmp_path):
+    stream = ChunkedStream(make_pdf(8192))
+    ok, transfer, filepath = download(
+        tmp_path, lambda request: httpx.Response(200, headers={'Content-Length': '8192'}, stream=stream),
+        max_pdf_size=4096,
+    )
+    assert not ok and transfer['outcome'] == 'invalid_pdf' and stream.sent == 0
+    assert not os.path.exists(filepath + '.part')
+
+
+def test_streamed_size_over_cap_is_rejected(tmp_path):
+    stream = ChunkedStream(make_pdf(8192))
+    ok, transfer, filepath = download(tmp_path, lambda request: httpx.Response(200, stream=stream),
+                                      max_pdf_size=4096)
+    assert not ok and transfer['outcome'] == 'invalid_pdf' and 'size limit' in transfer['error']
+    assert not os.path.exists(filepath) and not os.path.exists(filepath + '.part')
+
+
+def test_is_pdf_file_checks_magic_and_trailer(tmp_path):
+    good, html, cut = tmp_path / 'good.pdf', tmp_path / 'html.pdf', tmp_path / 'cut.pdf'
+    good.write_bytes(make_pdf())
+    html.write_bytes(b'<html>%%EOF</html>')
+    cut.write_bytes(make_pdf()[:-6])
+    assert is_pdf_file(str(good))
+    assert not is_pdf_file(str(html)) and not is_pdf_file(str(cut))
+    assert not is_pdf_file(str(tmp_path / 'missing.pdf'))
@@ -0,0 +1,88 @@
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from strategies.rate_limiter import HostRateLimiter, RateLimitedTransport, TokenBucket, parse_retry_after
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """记录令牌桶要求的等待时间，不真正等待。"""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+    return delays
+
+
+def send_all(handler, urls, limiter):
+    transport = RateLimitedTransport(httpx.MockTransport(handler), limiter)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [(await client.get(url)).status_code for url in urls]
+    return asyncio.run(run())
+
+
+def test_retry_after_on_429_delays_next_request_to_that_host(sleeps):
+    responses = iter([httpx.Response(429, headers={'Retry-After': '5'}), httpx.Response(200), httpx.Response(200)])
+    limiter = HostRateLimiter(default_rate=1000, default_burst=10)
+    statuses = send_all(lambda request: next(responses),
+                        ['https://api.core.ac.uk/a', 'https://export.arxiv.org/b', 'https://api.core.ac.uk/c'],
+                        limiter)
+    assert statuses == [429, 200, 200]
+    # 其他主机不受影响，同一主机的下一个请求等到 Retry-After 结束
+    assert len(sleeps) == 1 and sleeps[0] == pytest.approx(5.0, abs=0.1)
+
+
+def test_429_without_retry_after_uses_default_backoff(sleeps):
+    responses = iter([httpx.Response(429), httpx.Response(200)])
+    limiter = HostRateLimiter(default_rate=1000, default_burst=10)
+    limiter.default_backoff = 3.0
+    send_all(lambda request: next(responses), ['https://example.org/a', 'https://example.org/b'], limiter)
+    assert sleeps == [pytest.approx(3.0, abs=0.1)]
+
+
+def test_503_without_retry_after_does_not_pause_host(sleeps):
+    responses = iter([httpx.Response(503), httpx.Response(200)])
+    limiter = HostRateLimiter(default_rate=1000, default_burst=10)
+    send_all(lambda request: next(responses), ['https://example.org/a', 'https://example.org/b'], limiter)
+    assert sleeps == []
+
+
+def test_exhausted_quota_pauses_until_reset(sleeps):
+    responses = iter([httpx.Response(200, headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '2'}),
+                      httpx.Response(200)])
+    limiter = HostRateLimiter(default_rate=1000, default_burst=10)
+    send_all(lambda request: next(responses), ['https://example.org/a', 'https://example.org/b'], limiter)
+    assert sleeps == [pytest.approx(2.0, abs=0.1)]
+
+
+def test_token_bucket_spaces_requests_after_burst(sleeps):
+    bucket = TokenBucket(rate=2, burst=2)
+
+    async def run():
+        for _ in range(4):
+            await bucket.acquire()
+    asyncio.run(run())
+    # 突发容量内立即放行，之后每个请求多预约 0.5 秒
+    assert sleeps == [pytest.approx(0.5, abs=0.05), pytest.approx(1.0, abs=0.05)]
+
+
+def test_limits_match_subdomains():
+    limiter = HostRateLimiter({'arxiv.org': (0.3, 1), 'export.arxiv.org': (0.5, 2)})
+    assert limiter.bucket_for('export.arxiv.org').rate == 0.5
+    assert limiter.bucket_for('www.arxiv.org').rate == 0.3
+    assert limiter.bucket_for('api.core.ac.uk').rate == limiter.default_rate
+
+
+def test_parse_retry_after_formats():
+    assert parse_retry_after('12') == 12.0
+    assert parse_retry_after(None) is None and parse_retry_after('soon') is None
+    moment = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(moment, usegmt=True)) == pytest.approx(30, abs=2)
+    assert parse_retry_after(moment.isoformat()) == pytest.approx(30, abs=2)
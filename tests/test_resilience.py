@@ -0,0 +1,127 @@
+import asyncio
+
+import httpx
+import pytest
+
+from strategies.resilience import (
+    CLOSED, HALF_OPEN, NO_RETRY_EXTENSION, OPEN, CircuitOpenError, HostCircuitBreakers, ResilientTransport,
+    RetryPolicy,
+)
+
+
+def test_breaker_opens_probes_and_closes():
+    breakers = HostCircuitBreakers(failure_threshold=3, cooldown=60)
+    breaker = breakers.breaker_for('Example.org')
+    for _ in range(2):
+        assert breaker.allow()
+        assert breaker.record_failure() is False
+    assert breaker.allow() and breaker.record_failure() is True
+    assert breaker.state == OPEN and breakers.is_open('example.org')
+    assert not breaker.allow()
+
+    # 冷却结束：只放行一个探测请求
+    breaker.opened_at -= 61
+    assert not breakers.is_open('example.org')
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow() and breakers.is_open('example.org')
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = HostCircuitBreakers(failure_threshold=1, cooldown=60).breaker_for('example.org')
+    breaker.allow()
+    breaker.record_failure()
+    breaker.opened_at -= 61
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert breaker.record_failure() is True
+    assert breaker.state == OPEN and breaker.remaining() > 59
+
+
+def run_transport(handler, policy=None, breakers=None, extensions=None):
+    transport = ResilientTransport(httpx.MockTransport(handler), policy or RetryPolicy(base_delay=0), breakers)
+
+    async def send():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.get('https://example.org/paper', extensions=extensions)
+    return asyncio.run(send())
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """记录重试前的等待时间，不真正等待。"""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+    return delays
+
+
+def test_transient_status_is_retried(sleeps):
+    statuses = iter([503, 502, 200])
+    response = run_transport(lambda request: httpx.Response(next(statuses)))
+    assert response.status_code == 200
+    assert len(sleeps) == 2
+
+
+def test_retry_after_is_honoured(sleeps):
+    responses = iter([httpx.Response(429, headers={'Retry-After': '7'}), httpx.Response(200)])
+    assert run_transport(lambda request: next(responses)).status_code == 200
+    assert sleeps == [7.0]
+
+
+def test_retry_after_beyond_cap_is_returned(sleeps):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503, headers={'Retry-After': '600'})
+    assert run_transport(handler, RetryPolicy(max_retry_after=120)).status_code == 503
+    assert len(requests) == 1 and sleeps == []
+
+
+def test_permanent_status_is_not_retried(sleeps):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(404)
+    assert run_transport(handler).status_code == 404
+    assert len(requests) == 1
+
+
+def test_retries_stop_when_breaker_opens(sleeps):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+    breakers = HostCircuitBreakers(failure_threshold=2, cooldown=60)
+    with pytest.raises(httpx.ConnectError):
+        run_transport(handler, RetryPolicy(max_retries=5, base_delay=0), breakers)
+    assert len(requests) == 2
+    with pytest.raises(CircuitOpenError):
+        run_transport(handler, breakers=breakers)
+    assert len(requests) == 2
+
+
+def test_pool_timeout_is_neither_retried_nor_counted(sleeps):
+    def handler(request):
+        raise httpx.PoolTimeout("no free connection", request=request)
+    breakers = HostCircuitBreakers(failure_threshold=1, cooldown=60)
+    with pytest.raises(httpx.PoolTimeout):
+        run_transport(handler, breakers=breakers)
+    assert sleeps == []
+    assert breakers.breaker_for('example.org').failures == 0
+
+
+def test_no_retry_extension_disables_retries(sleeps):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+    assert run_transport(handler, extensions={NO_RETRY_EXTENSION: True}).status_code == 503
+    assert len(requests) == 1
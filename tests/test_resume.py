@@ -0,0 +1,84 @@
+import asyncio
+import os
+
+import httpx
+
+from strategies.implementations import BrowserSessionDownloader
+from strategies.resilience import ResilientTransport, RetryPolicy
+from tests.conftest import make_pdf
+
+PDF_URL = 'https://example.org/paper.pdf'
+PDF = make_pdf(64 * 1024)
+HEADERS = {'ETag': '"v1"', 'Accept-Ranges': 'bytes'}
+
+
+class InterruptedStream(httpx.AsyncByteStream):
+    """发送 data 的前 cut 个字节后断开连接。"""
+
+    def __init__(self, data: bytes, cut: int):
+        self.data, self.cut = data, cut
+
+    async def __aiter__(self):
+        yield self.data[:self.cut]
+        raise httpx.ReadError("connection reset")
+
+
+def download(tmp_path, handler, max_retries=3):
+    transport = ResilientTransport(httpx.MockTransport(handler), RetryPolicy(max_retries=max_retries, base_delay=0))
+    filepath = str(tmp_path / 'paper.pdf')
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, follow_redirects=True) as session:
+            downloader = BrowserSessionDownloader(session, str(tmp_path), 'Test', PDF_URL, 'Mozilla/5.0')
+            ok = await downloader._download_pdf_from_url(PDF_URL, filepath)
+            return ok, downloader.last_transfer
+    ok, transfer = asyncio.run(run())
+    return ok, transfer, filepath
+
+
+def test_interrupted_download_resumes_from_part_file(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) == 1:
+            return httpx.Response(200, headers={**HEADERS, 'Content-Length': str(len(PDF))},
+                                  stream=InterruptedStream(PDF, 20000))
+        assert request.headers['Range'] == 'bytes=20000-' and request.headers['If-Range'] == '"v1"'
+        return httpx.Response(206, headers=HEADERS, content=PDF[20000:])
+
+    ok, transfer, filepath = download(tmp_path, handler)
+    assert ok and transfer['attempts'] == 2 and transfer['resumed_from'] == 20000
+    with open(filepath, 'rb') as f:
+        assert f.read() == PDF
+    assert not os.path.exists(filepath + '.part') and not os.path.exists(filepath + '.part.json')
+
+
+def test_connect_failure_is_only_retried_by_transport(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    ok, transfer, _ = download(tmp_path, handler, max_retries=3)
+    assert not ok and transfer['outcome'] == 'interrupted'
+    # 传输层的 1 + 3 次请求，续传循环不再叠加重试
+    assert len(requests) == 4 and transfer['attempts'] == 1
+
+
+def test_resume_requests_share_one_budget(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) == 1:
+            return httpx.Response(200, headers={**HEADERS, 'Content-Length': str(len(PDF))},
+                                  stream=InterruptedStream(PDF, 20000))
+        raise httpx.ConnectError("connection refused", request=request)
+
+    ok, transfer, filepath = download(tmp_path, handler, max_retries=3)
+    assert not ok and transfer['outcome'] == 'interrupted'
+    # 第一次请求 + 3 次不经传输层重试的续传请求
+    assert len(requests) == 4 and transfer['attempts'] == 4
+    assert os.path.getsize(filepath + '.part') == 20000
@@ -0,0 +1,26 @@
+import httpx
+
+EMPTY_FEED = '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom"></feed>'
+
+
+def test_offline_failures_are_not_recorded(make_crawler):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=EMPTY_FEED, headers={'Content-Type': 'application/atom+xml'})
+
+    # 没有 CORE API Key：CORE 策略不可用，不发出请求
+    crawler = make_crawler(handler, core_api_key='')
+    assert crawler.download_paper('A paper that does not exist anywhere') is None
+    stats = crawler.strategy_stats.get('')
+    assert list(stats) == ['arXiv'] and stats['arXiv'][:2] == (1, 0)
+    assert requests
+
+    # 再次下载：arXiv 命中负缓存，同样不计入统计
+    sent = len(requests)
+    assert crawler.download_paper('A paper that does not exist anywhere') is None
+    assert len(requests) == sent
+    attempts, successes, _ = crawler.strategy_stats.get('')['arXiv']
+    assert (attempts, successes) == (1, 0)
+    assert 'CORE' not in crawler.strategy_stats.get('')